@@ -0,0 +1,164 @@
+"""Benchmark the backtest engine against the original iterrows loop.
+
+Usage: python benchmarks/bench_backtest.py [n_seasons]
+"""
+
+import contextlib
+import io
+import sys
+
+import numpy as np
+import pandas as pd
+from common import synthetic_games, timeit
+
+from charliehustle.betting.kelly import fractional_kelly
+from charliehustle.betting.odds import (
+    american_to_decimal,
+    implied_prob_to_american,
+)
+from charliehustle.betting.simulate import backtest
+from charliehustle.config import Config
+
+
+def backtest_iterrows(games: pd.DataFrame, config: Config) -> pd.DataFrame:
+    """The original implementation, kept as a baseline (summary omitted)."""
+    bankroll = config.initial_bankroll
+    has_odds = "home_line" in games.columns and "away_line" in games.columns
+
+    bets: list[dict] = []
+
+    for _, game in games.iterrows():
+        model_home_prob = game["model_home_prob"]
+        model_away_prob = 1 - model_home_prob
+
+        # Pick the side with higher model probability
+        if model_home_prob >= 0.5:
+            pick = game["home_team"]
+            pick_prob = model_home_prob
+            is_home_pick = True
+        else:
+            pick = game["away_team"]
+            pick_prob = model_away_prob
+            is_home_pick = False
+
+        # Determine odds
+        if has_odds:
+            pick_line = (
+                game["home_line"] if is_home_pick else game["away_line"]
+            )
+            decimal_odds = american_to_decimal(float(pick_line))
+        else:
+            # Synthesize odds from model probability with ~5% vig
+            fair_line = implied_prob_to_american(1 - pick_prob)
+            decimal_odds = american_to_decimal(fair_line) * 0.95
+
+        # Kelly criterion sizing
+        bet_fraction = fractional_kelly(
+            pick_prob,
+            decimal_odds,
+            fraction=config.kelly_fraction,
+            max_bet=config.max_bet_fraction,
+        )
+
+        # Check minimum edge
+        implied_prob = 1 / decimal_odds
+        edge = pick_prob - implied_prob
+        if edge < config.min_edge:
+            continue
+
+        bet_amount = round(bankroll * bet_fraction, 2)
+        if bet_amount < 1.0:
+            continue
+
+        # Resolve bet
+        actual_winner = (
+            game["home_team"] if game["home_win"] else game["away_team"]
+        )
+        won = pick == actual_winner
+
+        if won:
+            payout = round(bet_amount * (decimal_odds - 1), 2)
+        else:
+            payout = -bet_amount
+
+        bankroll = round(bankroll + payout, 2)
+
+        bets.append(
+            {
+                "date": game["date"],
+                "home_team": game["home_team"],
+                "away_team": game["away_team"],
+                "pick": pick,
+                "pick_prob": round(pick_prob, 4),
+                "edge": round(edge, 4),
+                "decimal_odds": round(decimal_odds, 4),
+                "bet_fraction": round(bet_fraction, 4),
+                "bet_amount": bet_amount,
+                "won": won,
+                "payout": payout,
+                "bankroll": bankroll,
+            }
+        )
+
+    return pd.DataFrame(bets)
+
+
+def predicted_games(n_seasons: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic games with noisy model probabilities and market lines."""
+    rng = np.random.default_rng(seed)
+    games = synthetic_games(n_seasons, seed)
+    true_prob = np.clip(0.54 + rng.normal(0, 0.08, len(games)), 0.2, 0.8)
+    games["model_home_prob"] = np.clip(
+        true_prob + rng.normal(0, 0.05, len(games)), 0.05, 0.95
+    )
+    market = np.clip(true_prob + rng.normal(0, 0.03, len(games)), 0.05, 0.95)
+    games["home_line"] = np.round(
+        np.where(
+            market >= 0.5,
+            -market / (1 - market) * 100,
+            (1 - market) / market * 100,
+        )
+        - 5
+    )
+    games["away_line"] = np.round(
+        np.where(
+            market < 0.5,
+            -(1 - market) / market * 100,
+            market / (1 - market) * 100,
+        )
+        - 5
+    )
+    return games
+
+
+def quiet(fn):
+    """Run ``fn`` with the printed summary suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn()
+
+
+def main() -> None:
+    n_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    games = predicted_games(n_seasons)
+    config = Config()
+    print(f"{len(games)} games over {n_seasons} seasons")
+
+    for label, frame in [
+        ("market lines", games),
+        ("synthetic odds", games.drop(columns=["home_line", "away_line"])),
+    ]:
+        expected = backtest_iterrows(frame, config)
+        result = quiet(lambda: backtest(frame, config))
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+        baseline = timeit(lambda: backtest_iterrows(frame, config), repeat=1)
+        t = timeit(lambda: quiet(lambda: backtest(frame, config)))
+        print(f"  {label} ({len(expected)} bets)")
+        print(f"    iterrows:   {baseline * 1000:9.1f} ms")
+        print(
+            f"    vectorized: {t * 1000:9.1f} ms  ({baseline / t:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
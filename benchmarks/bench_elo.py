@@ -0,0 +1,74 @@
+"""Benchmark compute_elo_ratings against the original iterrows loop.
+
+Usage: python benchmarks/bench_elo.py [n_seasons]
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+from common import synthetic_games, timeit
+
+from charliehustle.config import DEFAULT_CONFIG, Config
+from charliehustle.data import elo
+from charliehustle.data.features import compute_elo_ratings
+
+
+def compute_elo_ratings_iterrows(
+    games: pd.DataFrame, config: Config = DEFAULT_CONFIG
+) -> pd.DataFrame:
+    """The original row-by-row implementation, kept as a baseline."""
+    k = config.elo_k
+    hfa = config.elo_home_advantage
+    teams = set(games["home_team"]) | set(games["away_team"])
+    ratings = {team: config.elo_mean for team in teams}
+    home_elos, away_elos, home_probs = [], [], []
+    for _, game in games.iterrows():
+        home, away = game["home_team"], game["away_team"]
+        h_elo, a_elo = ratings[home], ratings[away]
+        home_elos.append(h_elo)
+        away_elos.append(a_elo)
+        exp_home = 1 / (1 + 10 ** ((a_elo - h_elo - hfa) / 400))
+        home_probs.append(exp_home)
+        actual_home = float(game["home_win"])
+        ratings[home] = h_elo + k * (actual_home - exp_home)
+        ratings[away] = a_elo + k * ((1 - actual_home) - (1 - exp_home))
+    games = games.copy()
+    games["home_elo"] = home_elos
+    games["away_elo"] = away_elos
+    games["elo_home_prob"] = home_probs
+    return games
+
+
+def main() -> None:
+    n_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    games = synthetic_games(n_seasons)
+    print(f"{len(games)} games over {n_seasons} seasons")
+
+    # The baseline has no season reversion, so compare without it
+    config = Config(elo_reversion_factor=0.0)
+    expected = compute_elo_ratings_iterrows(games, config)
+    cols = ["home_elo", "away_elo", "elo_home_prob"]
+
+    baseline = timeit(
+        lambda: compute_elo_ratings_iterrows(games, config), repeat=1
+    )
+    print(f"  iterrows:        {baseline * 1000:9.1f} ms")
+
+    compiled = elo._elo_loop_compiled
+    elo._elo_loop_compiled = None
+    result = compute_elo_ratings(games, config)
+    np.testing.assert_array_equal(result[cols].values, expected[cols].values)
+    t = timeit(lambda: compute_elo_ratings(games, config))
+    print(f"  array (python):  {t * 1000:9.1f} ms  ({baseline / t:5.1f}x)")
+    elo._elo_loop_compiled = compiled
+
+    if compiled is not None:
+        result = compute_elo_ratings(games, config)  # warm up the JIT
+        np.testing.assert_array_equal(result[cols].values, expected[cols].values)
+        t = timeit(lambda: compute_elo_ratings(games, config))
+        print(f"  array (numba):   {t * 1000:9.1f} ms  ({baseline / t:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Benchmark sweep_elo against calling compute_elo_ratings per configuration.
+
+Usage: python benchmarks/bench_elo_sweep.py [n_seasons]
+"""
+
+import sys
+
+import numpy as np
+from common import synthetic_games, timeit
+
+from charliehustle.config import Config
+from charliehustle.data.elo import sweep_elo
+from charliehustle.data.features import compute_elo_ratings
+
+
+def main() -> None:
+    n_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    games = synthetic_games(n_seasons)
+    k_values = np.arange(1.0, 21.0)
+    hfa_values = np.arange(0.0, 60.0, 4.0)
+    reversion_values = [0.0, 1 / 3, 0.5]
+    n_configs = len(k_values) * len(hfa_values) * len(reversion_values)
+    print(f"{n_configs} configurations, {len(games)} games")
+
+    single = timeit(lambda: compute_elo_ratings(games, Config()))
+    print(f"  one compute_elo_ratings call: {single * 1000:8.1f} ms")
+    print(f"  looped over grid (estimated): {single * n_configs:8.1f} s")
+
+    sweep_elo(games.iloc[:100], [4.0], [24.0])  # warm up the JIT
+    t = timeit(
+        lambda: sweep_elo(games, k_values, hfa_values, reversion_values),
+        repeat=1,
+    )
+    print(f"  sweep_elo:                    {t:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark loading multi-season training data.
+
+Compares reading every season's features.parquet in full, concatenating
+them and taking the feature matrix with reading only the training columns
+from the season-partitioned dataset straight into one float32 matrix.
+
+Usage: python benchmarks/bench_feature_load.py [n_seasons]
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+from common import synthetic_games, timeit
+
+from charliehustle.config import Config
+from charliehustle.data.dataset import (
+    features_path,
+    load_feature_arrays,
+    save_features,
+)
+from charliehustle.data.features import (
+    FEATURE_COLUMNS,
+    TARGET_COLUMN,
+    build_feature_matrix,
+)
+from charliehustle.data.storage import load_parquet
+
+
+def concat_seasons(seasons: list[int], config: Config) -> None:
+    """The previous loader: whole files, one DataFrame per season."""
+    features = pd.concat(
+        [load_parquet(features_path(s, config)) for s in seasons],
+        ignore_index=True,
+    )
+    features[FEATURE_COLUMNS].values
+    features[TARGET_COLUMN].values
+
+
+def main() -> None:
+    n_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    features = build_feature_matrix(synthetic_games(n_seasons), Config())
+    with tempfile.TemporaryDirectory() as tmp:
+        config = Config(data_dir=Path(tmp))
+        seasons = []
+        for season, part in features.groupby(features["date"].dt.year):
+            save_features(part, features_path(season, config))
+            seasons.append(season)
+        print(f"{len(features)} games over {len(seasons)} seasons")
+
+        baseline = timeit(lambda: concat_seasons(seasons, config))
+        print(f"  read + concat:     {baseline * 1000:7.1f} ms")
+        t = timeit(
+            lambda: load_feature_arrays(
+                seasons, FEATURE_COLUMNS, TARGET_COLUMN, config
+            )
+        )
+        print(
+            f"  dataset arrays:    {t * 1000:7.1f} ms  ({baseline / t:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
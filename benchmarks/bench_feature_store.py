@@ -0,0 +1,101 @@
+"""Benchmark peak memory and load time of multi-season training input.
+
+Each variant runs in a fresh interpreter that loads the training matrix for
+every season and quantizes it for XGBoost, then reports the growth in
+resident memory and the process's peak RSS (Linux only):
+
+- dataframe: read the features into a DataFrame and take the float64
+  ``features[FEATURE_COLUMNS].values`` copy, as train_model used to.
+- store: memory-map the Arrow feature store and pass its float32 view.
+
+Usage: python benchmarks/bench_feature_store.py [n_seasons] [copies]
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from common import synthetic_games
+
+from charliehustle.config import Config
+from charliehustle.data.dataset import features_path, save_features
+from charliehustle.data.feature_store import save_feature_store
+from charliehustle.data.features import FEATURE_COLUMNS, build_feature_matrix
+from charliehustle.models.train import training_arrays
+
+RUN = """
+import json, resource, sys, time
+from pathlib import Path
+import xgboost as xgb
+from charliehustle.config import Config
+from charliehustle.data.dataset import load_features
+from charliehustle.data.feature_store import load_feature_store
+from charliehustle.data.features import FEATURE_COLUMNS, TARGET_COLUMN
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        line = next(line for line in f if line.startswith("VmRSS"))
+    return int(line.split()[1]) / 1024
+
+variant, data_dir, seasons = sys.argv[1], Path(sys.argv[2]), json.loads(sys.argv[3])
+baseline = rss_mb()
+start = time.perf_counter()
+if variant == "dataframe":
+    features = load_features(seasons, Config(data_dir=data_dir))
+    X = features[FEATURE_COLUMNS].values
+    y = features[TARGET_COLUMN].values
+else:
+    X, y = load_feature_store(data_dir / "features.arrow", FEATURE_COLUMNS)
+loaded = time.perf_counter() - start
+dtrain = xgb.QuantileDMatrix(X, y)
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({"load": loaded, "rss_mb": rss_mb() - baseline, "peak_mb": peak}))
+"""
+
+
+def main() -> None:
+    n_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    # Repeat the synthetic seasons to reach a realistic matrix size
+    copies = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    features = build_feature_matrix(synthetic_games(n_seasons), Config())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        config = Config(data_dir=data_dir)
+        seasons = []
+        for i, (_, part) in enumerate(
+            features.groupby(features["date"].dt.year)
+        ):
+            for c in range(copies):
+                season = 1000 + i * copies + c
+                save_features(part, features_path(season, config))
+                seasons.append(season)
+        X, y = training_arrays(features)
+        save_feature_store(
+            np.tile(X, (copies, 1)),
+            np.tile(y, copies),
+            FEATURE_COLUMNS,
+            data_dir / "features.arrow",
+        )
+        print(f"{len(features) * copies} rows in {len(seasons)} files")
+
+        for variant in ("dataframe", "store"):
+            out = subprocess.run(
+                [sys.executable, "-c", RUN, variant, tmp, json.dumps(seasons)],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            result = json.loads(out.stdout)
+            print(
+                f"  {variant:10s} load {result['load'] * 1000:7.1f} ms"
+                f"  RSS +{result['rss_mb']:6.1f} MiB"
+                f"  peak RSS {result['peak_mb']:6.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
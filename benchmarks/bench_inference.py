@@ -0,0 +1,63 @@
+"""Benchmark prediction latency by batch size: predict_proba vs compiled.
+
+Usage: python benchmarks/bench_inference.py [n_seasons]
+"""
+
+import sys
+import time
+from collections.abc import Callable
+
+import numpy as np
+from common import synthetic_games
+
+from charliehustle.config import Config
+from charliehustle.data.features import build_feature_matrix
+from charliehustle.models import inference
+from charliehustle.models.inference import compile_model
+from charliehustle.models.train import train_model, training_arrays
+
+BATCH_SIZES = (1, 15, 100, 1_000, 10_000)
+
+
+def latency(fn: Callable[[], object], min_time: float = 0.2) -> float:
+    """Median seconds per call, over enough calls to run ``min_time``."""
+    fn()
+    times = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time or len(times) < 5:
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return float(np.median(times))
+
+
+def main() -> None:
+    n_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    features = build_feature_matrix(synthetic_games(n_seasons), Config())
+    X, y = training_arrays(features)
+    model = train_model((X, y), n_splits=2)
+    ensemble = compile_model(model)
+    compiled = inference._predict_loop_compiled
+    print(
+        f"{ensemble.n_trees} trees of depth <= {ensemble.depth},"
+        f" numba {'on' if compiled is not None else 'off'}"
+    )
+    print(f"  {'batch':>6s} {'predict_proba':>14s} {'compiled':>10s}")
+
+    for size in BATCH_SIZES:
+        batch = np.resize(X, (size, X.shape[1]))
+        baseline = latency(lambda: model.predict_proba(batch))
+        t = latency(lambda: ensemble.predict_proba(batch))
+        np.testing.assert_allclose(
+            ensemble.predict_proba(batch),
+            model.predict_proba(batch)[:, 1],
+            atol=1e-6,
+        )
+        print(
+            f"  {size:6d} {baseline * 1e6:11.0f} us {t * 1e6:7.0f} us"
+            f"  ({baseline / t:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark cold-loading a model: joblib pickle vs native UBJSON/JSON.
+
+Each load runs in a fresh interpreter, as a CLI command would. Reported are
+the whole process time (dominated by importing xgboost, which imports
+scikit-learn, either way) and the load call itself.
+
+Usage: python benchmarks/bench_model_load.py [n_seasons] [repeat]
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+from common import synthetic_games
+
+from charliehustle.config import Config
+from charliehustle.data.features import build_feature_matrix
+from charliehustle.models.train import train_model
+
+# (imports, load call) per format
+LOADERS = {
+    "pickle": ("import joblib, xgboost", "joblib.load({path!r})"),
+    "native": (
+        "from pathlib import Path;"
+        " from charliehustle.models.train import load_model",
+        "load_model(Path({path!r}))",
+    ),
+}
+
+TIMED = """{imports}
+import time
+start = time.perf_counter()
+{load}
+print(time.perf_counter() - start)
+"""
+
+
+def cold_load(imports: str, load: str, repeat: int) -> tuple[float, float]:
+    """Best (process, load call) seconds over ``repeat`` fresh interpreters."""
+    best_process = best_load = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c", TIMED.format(imports=imports, load=load)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        best_process = min(best_process, time.perf_counter() - start)
+        best_load = min(best_load, float(out.stdout))
+    return best_process, best_load
+
+
+def main() -> None:
+    n_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    features = build_feature_matrix(synthetic_games(n_seasons), Config())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = {
+            "native": tmp / "xgb_model.ubj",
+            "native json": tmp / "xgb_model.json",
+            "pickle": tmp / "xgb_model.pkl",
+        }
+        model = train_model(features, model_path=paths["native"])
+        train_model(features, model_path=paths["native json"])
+        joblib.dump(model, paths["pickle"])
+
+        print(f"{len(features)} games")
+        for label, path in paths.items():
+            imports, load = LOADERS[label.split()[0]]
+            process, call = cold_load(
+                imports, load.format(path=str(path)), repeat
+            )
+            size = path.stat().st_size / 1024
+            print(
+                f"  {label:12s} {size:7.0f} KiB  process {process:5.2f} s"
+                f"  load {call * 1000:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Benchmark rolling team stats against the original list-slicing loop.
+
+Compares the long-table groupby path used by compute_team_rolling_stats and
+the ring-buffer kernel used for incremental updates.
+
+Usage: python benchmarks/bench_rolling.py [n_seasons]
+"""
+
+import sys
+
+import pandas as pd
+from common import synthetic_games, timeit
+
+from charliehustle.data import rolling
+from charliehustle.data.elo import encode_teams
+from charliehustle.data.features import compute_team_rolling_stats
+from charliehustle.data.rolling import rolling_features, run_rolling
+
+COLUMNS = [
+    "home_win_pct",
+    "away_win_pct",
+    "home_run_diff",
+    "away_run_diff",
+    "home_pyth_win_pct",
+    "away_pyth_win_pct",
+    "home_games_played",
+    "away_games_played",
+]
+
+
+def compute_team_rolling_stats_iterrows(
+    games: pd.DataFrame,
+    window: int = 30,
+) -> pd.DataFrame:
+    """The original implementation, kept as a baseline.
+
+    For each game, features represent team state BEFORE that game was played.
+    """
+    teams = set(games["home_team"]) | set(games["away_team"])
+    team_logs: dict[str, list[dict]] = {t: [] for t in teams}
+
+    # First pass: build per-team game logs in order
+    for _, game in games.iterrows():
+        home, away = game["home_team"], game["away_team"]
+        team_logs[home].append(
+            {
+                "runs_scored": game["home_score"],
+                "runs_allowed": game["away_score"],
+                "won": game["home_win"],
+            }
+        )
+        team_logs[away].append(
+            {
+                "runs_scored": game["away_score"],
+                "runs_allowed": game["home_score"],
+                "won": 1 - game["home_win"],
+            }
+        )
+
+    # Second pass: compute features using history available before each game
+    team_game_idx: dict[str, int] = {t: 0 for t in teams}
+    team_histories: dict[str, list[dict]] = {t: [] for t in teams}
+
+    features: dict[str, list] = {
+        "home_win_pct": [],
+        "away_win_pct": [],
+        "home_run_diff": [],
+        "away_run_diff": [],
+        "home_pyth_win_pct": [],
+        "away_pyth_win_pct": [],
+        "home_games_played": [],
+        "away_games_played": [],
+    }
+
+    for _, game in games.iterrows():
+        home, away = game["home_team"], game["away_team"]
+
+        for prefix, team in [("home", home), ("away", away)]:
+            history = team_histories[team]
+            n = len(history)
+
+            if n == 0:
+                features[f"{prefix}_win_pct"].append(0.5)
+                features[f"{prefix}_run_diff"].append(0.0)
+                features[f"{prefix}_pyth_win_pct"].append(0.5)
+                features[f"{prefix}_games_played"].append(0)
+            else:
+                recent = history[-window:]
+                wins = sum(g["won"] for g in recent)
+                rs = sum(g["runs_scored"] for g in recent)
+                ra = sum(g["runs_allowed"] for g in recent)
+
+                features[f"{prefix}_win_pct"].append(wins / len(recent))
+                features[f"{prefix}_run_diff"].append((rs - ra) / len(recent))
+
+                # Pythagorean expected win% (exponent 1.83)
+                if rs + ra > 0:
+                    pyth = rs**1.83 / (rs**1.83 + ra**1.83)
+                else:
+                    pyth = 0.5
+                features[f"{prefix}_pyth_win_pct"].append(pyth)
+                features[f"{prefix}_games_played"].append(n)
+
+            # Add this game to history AFTER computing features
+            log = team_logs[team][team_game_idx[team]]
+            team_histories[team].append(log)
+            team_game_idx[team] += 1
+
+    games = games.copy()
+    for col, values in features.items():
+        games[col] = values
+
+    return games
+
+
+def ring_buffer_stats(games: pd.DataFrame, window: int) -> pd.DataFrame:
+    """Rolling stats from the ring-buffer kernel, laid out like the wide table."""
+    home_idx, away_idx, teams = encode_teams(games)
+    sums, played = run_rolling(
+        home_idx,
+        away_idx,
+        games["home_score"].to_numpy(),
+        games["away_score"].to_numpy(),
+        games["home_win"].to_numpy(),
+        n_teams=len(teams),
+        windows=[window],
+    )
+    out = {}
+    for name, values in rolling_features(sums[:, :, 0], played, window).items():
+        out[f"home_{name}"] = values[:, 0]
+        out[f"away_{name}"] = values[:, 1]
+    out["home_games_played"] = played[:, 0]
+    out["away_games_played"] = played[:, 1]
+    return pd.DataFrame(out)[COLUMNS]
+
+
+def check(result: pd.DataFrame, expected: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(
+        result[COLUMNS], expected[COLUMNS], check_exact=True
+    )
+
+
+def main() -> None:
+    n_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    games = synthetic_games(n_seasons)
+    print(f"{len(games)} games over {n_seasons} seasons")
+
+    expected = compute_team_rolling_stats_iterrows(games, window=30)
+    baseline = timeit(
+        lambda: compute_team_rolling_stats_iterrows(games, window=30), repeat=1
+    )
+    print(f"  iterrows:             {baseline * 1000:9.1f} ms")
+
+    check(compute_team_rolling_stats(games, window=30), expected)
+    t = timeit(lambda: compute_team_rolling_stats(games, window=30))
+    print(f"  long table:           {t * 1000:9.1f} ms  ({baseline / t:5.1f}x)")
+    t = timeit(
+        lambda: compute_team_rolling_stats(
+            games, window=30, extra_windows=(10, 81)
+        )
+    )
+    print(f"  long table, 30/10/81: {t * 1000:9.1f} ms")
+
+    compiled = rolling._rolling_loop_compiled
+    rolling._rolling_loop_compiled = None
+    check(ring_buffer_stats(games, 30), expected)
+    t = timeit(lambda: ring_buffer_stats(games, 30))
+    print(f"  ring buffer (python): {t * 1000:9.1f} ms  ({baseline / t:5.1f}x)")
+    rolling._rolling_loop_compiled = compiled
+
+    if compiled is not None:
+        check(ring_buffer_stats(games, 30), expected)  # JIT warm-up
+        t = timeit(lambda: ring_buffer_stats(games, 30))
+        print(f"  ring buffer (numba):  {t * 1000:9.1f} ms  ({baseline / t:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Benchmark sequential vs parallel time-series CV folds in train_model.
+
+Usage: python benchmarks/bench_train_cv.py [n_seasons] [jobs]
+"""
+
+import os
+import sys
+
+import numpy as np
+from common import synthetic_games, timeit
+
+from charliehustle.config import Config
+from charliehustle.data.features import FEATURE_COLUMNS, build_feature_matrix
+from charliehustle.models.train import cross_validate
+
+
+def main() -> None:
+    n_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else min(5, os.cpu_count())
+    features = build_feature_matrix(synthetic_games(n_seasons), Config())
+    X = features[FEATURE_COLUMNS].values
+    y = features["home_win"].values
+    print(f"{len(X)} games over {n_seasons} seasons, {os.cpu_count()} cores")
+
+    expected = cross_validate(X, y)
+    baseline = timeit(lambda: cross_validate(X, y), repeat=1)
+    print(f"  sequential folds:     {baseline:7.2f} s")
+
+    assert cross_validate(X, y, jobs=jobs) == expected
+    t = timeit(lambda: cross_validate(X, y, jobs=jobs), repeat=1)
+    print(
+        f"  {jobs} parallel folds:     {t:7.2f} s  ({baseline / t:4.1f}x)"
+    )
+    print(f"  CV accuracy: {np.mean(expected):.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark train_model's shared quantized matrix against per-fit arrays.
+
+The baseline fits every CV fold and the final model from raw arrays, so
+XGBoost runs the quantile sketch for each fit.
+
+Usage: python benchmarks/bench_train_matrix.py [n_seasons]
+"""
+
+import sys
+
+import numpy as np
+from common import synthetic_games, timeit
+from sklearn.model_selection import TimeSeriesSplit
+
+from charliehustle.config import Config
+from charliehustle.data.features import build_feature_matrix
+from charliehustle.models.train import (
+    build_model,
+    train_model,
+    training_arrays,
+)
+
+
+def train_per_fit(X: np.ndarray, y: np.ndarray, n_splits: int = 5) -> None:
+    """The previous train_model: every fit quantizes its own arrays."""
+    for train_idx, val_idx in TimeSeriesSplit(n_splits=n_splits).split(X):
+        model = build_model()
+        model.fit(X[train_idx], y[train_idx], verbose=False)
+        model.score(X[val_idx], y[val_idx])
+    build_model().fit(X, y, verbose=False)
+
+
+def main() -> None:
+    n_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    features = build_feature_matrix(synthetic_games(n_seasons), Config())
+    X, y = training_arrays(features)
+    print(f"{len(X)} games over {n_seasons} seasons")
+
+    baseline = timeit(lambda: train_per_fit(X, y), repeat=1)
+    print(f"  quantize per fit:     {baseline:7.2f} s")
+    t = timeit(lambda: train_model((X, y)), repeat=1)
+    print(f"  shared quantization:  {t:7.2f} s  ({baseline / t:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
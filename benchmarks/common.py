@@ -0,0 +1,62 @@
+"""Shared helpers for benchmarks."""
+
+import time
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+TEAMS = [
+    "ARI", "ATL", "BAL", "BOS", "CHC", "CWS", "CIN", "CLE", "COL", "DET",
+    "HOU", "KC", "LAA", "LAD", "MIA", "MIL", "MIN", "NYM", "NYY", "OAK",
+    "PHI", "PIT", "SD", "SEA", "SF", "STL", "TB", "TEX", "TOR", "WSH",
+]
+
+
+def synthetic_games(n_seasons: int = 15, seed: int = 0) -> pd.DataFrame:
+    """Build a random games table shaped like ``fetch_season_games`` output.
+
+    Each season has 2,430 games (15 per day) spread from April to September.
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    game_id = 0
+    for s in range(n_seasons):
+        season = 2010 + s
+        n = 2430
+        matchups = np.array([rng.permutation(len(TEAMS)) for _ in range(n // 15)])
+        home = matchups[:, 0::2].ravel()
+        away = matchups[:, 1::2].ravel()
+        days = np.repeat(np.arange(n // 15), 15)
+        home_score = rng.poisson(4.6, n)
+        away_score = rng.poisson(4.4, n)
+        ties = home_score == away_score
+        home_score[ties] += 1
+        frames.append(
+            pd.DataFrame(
+                {
+                    "game_id": np.arange(game_id, game_id + n),
+                    "date": pd.Timestamp(f"{season}-04-01")
+                    + pd.to_timedelta(days, unit="D"),
+                    "home_team": np.array(TEAMS)[home],
+                    "home_id": home,
+                    "away_team": np.array(TEAMS)[away],
+                    "away_id": away,
+                    "home_score": home_score,
+                    "away_score": away_score,
+                    "home_win": (home_score > away_score).astype(int),
+                }
+            )
+        )
+        game_id += n
+    return pd.concat(frames, ignore_index=True)
+
+
+def timeit(fn: Callable[[], object], repeat: int = 3) -> float:
+    """Return the best wall-clock time of ``repeat`` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
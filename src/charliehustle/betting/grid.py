@@ -0,0 +1,94 @@
+"""Staking grid search.
+
+Evaluates every combination of Kelly fraction, minimum edge and bet cap on
+one set of predicted games. Predictions are made once by the caller; each
+configuration only re-runs the staking, spread across worker processes that
+receive the games once at startup rather than with every task.
+"""
+
+import itertools
+import logging
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from charliehustle.betting.simulate import place_bets
+from charliehustle.config import DEFAULT_CONFIG, Config
+from charliehustle.parallel import worker_data, worker_pool
+
+logger = logging.getLogger(__name__)
+
+GRID_PARAMS = ["kelly_fraction", "min_edge", "max_bet_fraction"]
+
+def staking_grid(
+    kelly_fractions: Sequence[float],
+    min_edges: Sequence[float],
+    max_bet_fractions: Sequence[float],
+    config: Config = DEFAULT_CONFIG,
+) -> list[Config]:
+    """Copies of ``config`` for every combination of staking settings."""
+    return [
+        config.model_copy(
+            update={
+                "kelly_fraction": kelly,
+                "min_edge": edge,
+                "max_bet_fraction": cap,
+            }
+        )
+        for kelly, edge, cap in itertools.product(
+            kelly_fractions, min_edges, max_bet_fractions
+        )
+    ]
+
+
+def staking_summary(games: pd.DataFrame, config: Config) -> dict:
+    """Final bankroll, ROI, max drawdown and bet count for one configuration.
+
+    ``max_drawdown`` is the largest peak-to-trough fall in bankroll, as a
+    fraction of the peak (the starting bankroll counts as the first peak).
+    """
+    results = place_bets(games, config)
+    initial = config.initial_bankroll
+    bankroll = np.concatenate([[initial], results.get("bankroll", [])])
+    peak = np.maximum.accumulate(bankroll)
+    return {
+        **{param: getattr(config, param) for param in GRID_PARAMS},
+        "n_bets": len(results),
+        "final_bankroll": bankroll[-1],
+        "roi": (bankroll[-1] - initial) / initial,
+        "max_drawdown": ((peak - bankroll) / peak).max(),
+    }
+
+
+def _worker_summary(config: Config) -> dict:
+    return staking_summary(worker_data(), config)
+
+
+def grid_search(
+    games: pd.DataFrame,
+    configs: Sequence[Config],
+    jobs: int = 1,
+) -> pd.DataFrame:
+    """Evaluate staking configurations on the same predicted games.
+
+    Args:
+        games: Predicted games, as for ``backtest``.
+        configs: Configurations to compare, e.g. from ``staking_grid``.
+        jobs: Worker processes (1 runs in this process).
+
+    Returns:
+        One row per configuration, in ``configs`` order, with the staking
+        settings and the ``staking_summary`` columns.
+    """
+    if jobs > 1 and len(configs) > 1:
+        chunksize = max(1, len(configs) // (jobs * 4))
+        with worker_pool(jobs, games) as pool:
+            rows = list(
+                pool.map(_worker_summary, configs, chunksize=chunksize)
+            )
+    else:
+        rows = [staking_summary(games, config) for config in configs]
+
+    logger.info(f"Evaluated {len(rows)} staking configurations")
+    return pd.DataFrame(rows)
@@ -1,7 +1,17 @@
-"""Kelly criterion bet sizing."""
+"""Kelly criterion bet sizing.
 
+Like the odds converters, these accept scalars, NumPy arrays or pandas
+Series (broadcast against each other) and return the matching kind.
+"""
 
-def kelly_criterion(model_prob: float, decimal_odds: float) -> float:
+import numpy as np
+
+from charliehustle.betting.odds import ArrayLike, _as_float_array, _like
+
+
+def kelly_criterion(
+    model_prob: ArrayLike, decimal_odds: ArrayLike
+) -> ArrayLike:
     """Calculate the Kelly criterion fraction of bankroll to bet.
 
     Args:
@@ -11,26 +21,29 @@ def kelly_criterion(model_prob: float, decimal_odds: float) -> float:
     Returns:
         Fraction of bankroll to bet (0 if no edge).
     """
-    b = decimal_odds - 1  # Net odds (profit per $1 bet)
-    q = 1 - model_prob
-    edge = model_prob * b - q
-
-    if edge <= 0:
-        return 0.0
+    p = _as_float_array(model_prob)
+    b = _as_float_array(decimal_odds) - 1  # Net odds (profit per $1 bet)
+    q = 1 - p
+    edge = p * b - q
 
-    return edge / b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.where(edge <= 0, 0.0, edge / b)
+    return _like(result, model_prob, decimal_odds)
 
 
 def fractional_kelly(
-    model_prob: float,
-    decimal_odds: float,
-    fraction: float = 0.25,
-    max_bet: float = 0.05,
-) -> float:
+    model_prob: ArrayLike,
+    decimal_odds: ArrayLike,
+    fraction: ArrayLike = 0.25,
+    max_bet: ArrayLike = 0.05,
+) -> ArrayLike:
     """Kelly criterion scaled by a safety fraction and capped.
 
     Full Kelly is aggressive and can lead to large drawdowns.
     Quarter-Kelly (fraction=0.25) is a common conservative approach.
     """
-    full_kelly = kelly_criterion(model_prob, decimal_odds)
-    return min(full_kelly * fraction, max_bet)
+    full_kelly = _as_float_array(kelly_criterion(model_prob, decimal_odds))
+    result = np.minimum(
+        full_kelly * _as_float_array(fraction), _as_float_array(max_bet)
+    )
+    return _like(result, model_prob, decimal_odds, fraction, max_bet)
@@ -0,0 +1,185 @@
+"""Monte Carlo bankroll simulation.
+
+A backtest is a single bankroll path, so its ROI mixes skill with luck. This
+module replays the same bets over many simulated seasons at once. Bets are
+priced and filtered once with ``price_bets``; each path then only differs in
+which bets win, so the Kelly staking becomes a recurrence over a
+(paths x bets) array, stepped one bet at a time for every path together.
+Paths are simulated in chunks to bound memory.
+
+Outcomes are drawn in one of two ways:
+
+- ``model``: each bet wins with the model's probability for the picked side,
+  i.e. the spread of results if the model were perfectly calibrated.
+- ``bootstrap``: each path resamples the season's actual bets (with their
+  real outcomes) with replacement.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from charliehustle.betting.simulate import MIN_BET, price_bets, round_exact
+from charliehustle.config import DEFAULT_CONFIG, Config
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("model", "bootstrap")
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def _simulate_chunk(
+    initial_bankroll: float,
+    bet_fraction: np.ndarray,
+    decimal_odds: np.ndarray,
+    won: np.ndarray,
+    ruin_level: float,
+) -> dict[str, np.ndarray]:
+    """Stake and settle a (paths x bets) block of bets, one bet at a time.
+
+    Follows ``backtest``'s rules, so a path with the actual outcomes matches
+    it to the cent: stakes and payouts are rounded to cents and stakes below
+    ``MIN_BET`` are skipped.
+    """
+    n_paths, n_bets = won.shape
+    bankroll = np.full(n_paths, float(initial_bankroll))
+    peak = bankroll.copy()
+    max_drawdown = np.zeros(n_paths)
+    ruined = np.zeros(n_paths, dtype=bool)
+    n_placed = np.zeros(n_paths, dtype=np.int64)
+    n_won = np.zeros(n_paths, dtype=np.int64)
+
+    for j in range(n_bets):
+        stake = round_exact(bankroll * bet_fraction[:, j], 2)
+        placed = stake >= MIN_BET
+        win = won[:, j] & placed
+        payout = np.where(
+            win, round_exact(stake * (decimal_odds[:, j] - 1), 2), -stake
+        )
+        bankroll = np.where(
+            placed, round_exact(bankroll + payout, 2), bankroll
+        )
+
+        np.maximum(peak, bankroll, out=peak)
+        np.maximum(max_drawdown, (peak - bankroll) / peak, out=max_drawdown)
+        ruined |= bankroll < ruin_level
+        n_placed += placed
+        n_won += win
+
+    return {
+        "final_bankroll": bankroll,
+        "roi": (bankroll - initial_bankroll) / initial_bankroll,
+        "max_drawdown": max_drawdown,
+        "ruined": ruined,
+        "n_bets": n_placed,
+        "n_won": n_won,
+    }
+
+
+def simulate_paths(
+    games: pd.DataFrame,
+    config: Config = DEFAULT_CONFIG,
+    n_paths: int = 10_000,
+    method: str = "model",
+    seed: int = 0,
+    chunk_size: int = 1_000,
+    ruin_fraction: float = 0.5,
+) -> pd.DataFrame:
+    """Simulate many seasons of the bets ``backtest`` would consider.
+
+    Args:
+        games: Predicted games, as for ``backtest``.
+        config: Staking settings (bankroll, Kelly fraction, edge, cap).
+        n_paths: Number of simulated seasons.
+        method: ``model`` to draw outcomes from the model probabilities, or
+            ``bootstrap`` to resample the actual bets with replacement.
+        seed: Random seed. The same seed and ``chunk_size`` reproduce the
+            same paths.
+        chunk_size: Paths simulated together; bounds memory at roughly
+            ``chunk_size * n_bets`` values per array.
+        ruin_fraction: A path is ruined if its bankroll ever falls below this
+            fraction of the starting bankroll.
+
+    Returns:
+        One row per path: final_bankroll, roi, max_drawdown (largest
+        peak-to-trough fall, as a fraction of the peak), ruined, n_bets and
+        n_won.
+    """
+    if method not in METHODS:
+        raise ValueError(
+            f"Unknown method {method!r}, expected one of {METHODS}"
+        )
+
+    priced = price_bets(games, config)
+    candidates = (priced["edge"] >= config.min_edge).to_numpy()
+    bets = priced[candidates]
+    pick_prob = bets["pick_prob"].to_numpy()
+    bet_fraction = bets["bet_fraction"].to_numpy()
+    decimal_odds = bets["decimal_odds"].to_numpy()
+    actual_won = bets["is_home_pick"].to_numpy() == games.loc[
+        candidates, "home_win"
+    ].to_numpy().astype(bool)
+    n_bets = len(bets)
+
+    ruin_level = config.initial_bankroll * ruin_fraction
+    n_chunks = -(-n_paths // chunk_size)
+    rngs = [
+        np.random.default_rng(s)
+        for s in np.random.SeedSequence(seed).spawn(n_chunks)
+    ]
+
+    chunks = []
+    for i, rng in enumerate(rngs):
+        size = min(chunk_size, n_paths - i * chunk_size)
+        if method == "model":
+            won = rng.random((size, n_bets)) < pick_prob
+            fractions = np.broadcast_to(bet_fraction, won.shape)
+            odds = np.broadcast_to(decimal_odds, won.shape)
+        else:
+            idx = rng.integers(0, n_bets, size=(size, n_bets))
+            won = actual_won[idx]
+            fractions = bet_fraction[idx]
+            odds = decimal_odds[idx]
+        chunks.append(
+            pd.DataFrame(
+                _simulate_chunk(
+                    config.initial_bankroll, fractions, odds, won, ruin_level
+                )
+            )
+        )
+        logger.debug(f"Simulated {i * chunk_size + size}/{n_paths} paths")
+
+    return pd.concat(chunks, ignore_index=True)
+
+
+def summarize_paths(paths: pd.DataFrame) -> pd.DataFrame:
+    """Quantiles of ROI, final bankroll, drawdown and bet count across paths."""
+    cols = ["roi", "final_bankroll", "max_drawdown", "n_bets"]
+    summary = paths[cols].quantile(list(QUANTILES))
+    summary.index = [f"p{round(q * 100)}" for q in QUANTILES]
+    return summary
+
+
+def print_monte_carlo_summary(
+    paths: pd.DataFrame,
+    initial_bankroll: float,
+) -> None:
+    """Print ROI and drawdown quantiles and the probability of ruin."""
+    summary = summarize_paths(paths)
+
+    print(f"\n{'=' * 50}")
+    print(f"  Monte Carlo Results ({len(paths):,} paths)")
+    print(f"{'=' * 50}")
+    print(f"  Starting Bank:   ${initial_bankroll:,.2f}")
+    print(f"  Mean ROI:        {paths['roi'].mean():+.1%}")
+    print(f"  P(profit):       {(paths['roi'] > 0).mean():.1%}")
+    print(f"  P(ruin):         {paths['ruined'].mean():.2%}")
+    print(f"  {'':14}{'ROI':>10}{'Drawdown':>12}{'Bets':>8}")
+    for label, row in summary.iterrows():
+        print(
+            f"  {label:14}{row['roi']:>+10.1%}"
+            f"{row['max_drawdown']:>12.1%}{row['n_bets']:>8.0f}"
+        )
+    print(f"{'=' * 50}\n")
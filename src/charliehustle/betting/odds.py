@@ -1,39 +1,69 @@
-"""Odds conversion utilities."""
+"""Odds conversion utilities.
 
+Every converter accepts a scalar, a NumPy array or a pandas Series and
+returns the same kind: a float for scalars, an array for arrays and a Series
+(with the input's index) for Series, so whole slates can be priced at once.
+"""
 
-def american_to_decimal(american: float) -> float:
+import numpy as np
+import pandas as pd
+
+ArrayLike = float | np.ndarray | pd.Series
+
+
+def _as_float_array(x: ArrayLike) -> np.ndarray:
+    return np.asarray(x, dtype=np.float64)
+
+
+def _like(result: np.ndarray, *inputs: ArrayLike) -> ArrayLike:
+    """Return ``result`` shaped like the inputs: float, array or Series."""
+    for x in inputs:
+        if isinstance(x, pd.Series):
+            return pd.Series(result, index=x.index, name=x.name)
+    if result.ndim == 0:
+        return float(result)
+    return result
+
+
+def american_to_decimal(american: ArrayLike) -> ArrayLike:
     """Convert American odds to decimal odds.
 
     Examples:
         +150 -> 2.50  (bet $100, get $250 back)
         -150 -> 1.667 (bet $150, get $250 back)
     """
-    if american > 0:
-        return american / 100 + 1
-    return 100 / abs(american) + 1
+    a = _as_float_array(american)
+    with np.errstate(divide="ignore"):
+        result = np.where(a > 0, a / 100 + 1, 100 / np.abs(a) + 1)
+    return _like(result, american)
 
 
-def decimal_to_american(decimal: float) -> float:
+def decimal_to_american(decimal: ArrayLike) -> ArrayLike:
     """Convert decimal odds to American odds."""
-    if decimal >= 2.0:
-        return (decimal - 1) * 100
-    return -100 / (decimal - 1)
+    d = _as_float_array(decimal)
+    with np.errstate(divide="ignore"):
+        result = np.where(d >= 2.0, (d - 1) * 100, -100 / (d - 1))
+    return _like(result, decimal)
 
 
-def american_to_implied_prob(american: float) -> float:
+def american_to_implied_prob(american: ArrayLike) -> ArrayLike:
     """Convert American odds to implied probability (no-vig).
 
     Examples:
         -150 -> 0.600
         +150 -> 0.400
     """
-    if american < 0:
-        return abs(american) / (abs(american) + 100)
-    return 100 / (american + 100)
+    a = _as_float_array(american)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.where(
+            a < 0, np.abs(a) / (np.abs(a) + 100), 100 / (a + 100)
+        )
+    return _like(result, american)
 
 
-def implied_prob_to_american(prob: float) -> float:
+def implied_prob_to_american(prob: ArrayLike) -> ArrayLike:
     """Convert implied probability to American odds."""
-    if prob >= 0.5:
-        return -(prob / (1 - prob)) * 100
-    return ((1 - prob) / prob) * 100
+    p = _as_float_array(prob)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.where(p >= 0.5, -(p / (1 - p)) * 100, ((1 - p) / p) * 100)
+    return _like(result, prob)
@@ -1,106 +1,207 @@
-"""Betting simulation and backtesting engine."""
+"""Betting simulation and backtesting engine.
+
+Everything about a bet except its size depends only on the game: the side
+picked, the odds, the edge and the Kelly fraction are computed for every game
+at once with array operations. Only the bankroll is sequential (each stake is
+a fraction of the bankroll after the previous bet), so a short loop over the
+games that clear the minimum edge compounds it.
+"""
 
 import logging
 
+import numpy as np
 import pandas as pd
 
 from charliehustle.betting.kelly import fractional_kelly
-from charliehustle.betting.odds import american_to_decimal, implied_prob_to_american
+from charliehustle.betting.odds import (
+    american_to_decimal,
+    implied_prob_to_american,
+)
 from charliehustle.config import DEFAULT_CONFIG, Config
 
 logger = logging.getLogger(__name__)
 
+SYNTHETIC_VIG = 0.95  # Payout haircut for odds synthesized from the model
 
-def backtest(
+MIN_BET = 1.0
+
+
+def price_bets(
     games: pd.DataFrame,
     config: Config = DEFAULT_CONFIG,
 ) -> pd.DataFrame:
-    """Run a betting simulation over predicted games.
+    """Pick a side, price it and size it as a bankroll fraction for every game.
 
-    Expects columns: home_win, model_home_prob, home_team, away_team.
-    Optionally: home_line, away_line (American odds) for real odds.
+    Expects columns: model_home_prob, and optionally home_line, away_line
+    (American odds) for real odds; otherwise odds are synthesized from the
+    model probability with ~5% vig.
 
-    Returns a DataFrame with one row per bet placed, tracking bankroll.
+    Returns a frame aligned with ``games`` holding is_home_pick, pick_prob,
+    decimal_odds, edge and bet_fraction.
     """
-    bankroll = config.initial_bankroll
     has_odds = "home_line" in games.columns and "away_line" in games.columns
 
-    bets: list[dict] = []
-
-    for _, game in games.iterrows():
-        model_home_prob = game["model_home_prob"]
-        model_away_prob = 1 - model_home_prob
-
-        # Pick the side with higher model probability
-        if model_home_prob >= 0.5:
-            pick = game["home_team"]
-            pick_prob = model_home_prob
-            is_home_pick = True
-        else:
-            pick = game["away_team"]
-            pick_prob = model_away_prob
-            is_home_pick = False
-
-        # Determine odds
-        if has_odds:
-            pick_line = (
-                game["home_line"] if is_home_pick else game["away_line"]
-            )
-            decimal_odds = american_to_decimal(float(pick_line))
-        else:
-            # Synthesize odds from model probability with ~5% vig
-            fair_line = implied_prob_to_american(1 - pick_prob)
-            decimal_odds = american_to_decimal(fair_line) * 0.95
-
-        # Kelly criterion sizing
-        bet_fraction = fractional_kelly(
-            pick_prob,
-            decimal_odds,
-            fraction=config.kelly_fraction,
-            max_bet=config.max_bet_fraction,
+    # Pick the side with higher model probability
+    home_prob = games["model_home_prob"].to_numpy(dtype=np.float64)
+    is_home_pick = home_prob >= 0.5
+    pick_prob = np.where(is_home_pick, home_prob, 1 - home_prob)
+
+    # Determine odds
+    if has_odds:
+        pick_line = np.where(
+            is_home_pick,
+            games["home_line"].to_numpy(dtype=np.float64),
+            games["away_line"].to_numpy(dtype=np.float64),
         )
+        decimal_odds = american_to_decimal(pick_line)
+    else:
+        fair_line = implied_prob_to_american(1 - pick_prob)
+        decimal_odds = american_to_decimal(fair_line) * SYNTHETIC_VIG
+
+    # Kelly criterion sizing
+    bet_fraction = fractional_kelly(
+        pick_prob,
+        decimal_odds,
+        fraction=config.kelly_fraction,
+        max_bet=config.max_bet_fraction,
+    )
 
-        # Check minimum edge
-        implied_prob = 1 / decimal_odds
-        edge = pick_prob - implied_prob
-        if edge < config.min_edge:
-            continue
+    return pd.DataFrame(
+        {
+            "is_home_pick": is_home_pick,
+            "pick_prob": pick_prob,
+            "decimal_odds": decimal_odds,
+            "edge": pick_prob - 1 / decimal_odds,
+            "bet_fraction": bet_fraction,
+        },
+        index=games.index,
+    )
 
-        bet_amount = round(bankroll * bet_fraction, 2)
-        if bet_amount < 1.0:
-            continue
 
-        # Resolve bet
-        actual_winner = (
-            game["home_team"] if game["home_win"] else game["away_team"]
-        )
-        won = pick == actual_winner
+def _compound(
+    initial_bankroll: float,
+    bet_fraction: list[float],
+    decimal_odds: list[float],
+    won: list[bool],
+) -> tuple[list[int], list[float], list[float], list[float]]:
+    """Stake each bet from the running bankroll and settle it.
 
-        if won:
-            payout = round(bet_amount * (decimal_odds - 1), 2)
+    Returns (positions of bets placed, bet amounts, payouts, bankroll after
+    each bet). Bets whose stake rounds below ``MIN_BET`` are skipped.
+    """
+    bankroll = initial_bankroll
+    placed: list[int] = []
+    amounts: list[float] = []
+    payouts: list[float] = []
+    bankrolls: list[float] = []
+    for i, fraction in enumerate(bet_fraction):
+        bet_amount = round(bankroll * fraction, 2)
+        if bet_amount < MIN_BET:
+            continue
+        if won[i]:
+            payout = round(bet_amount * (decimal_odds[i] - 1), 2)
         else:
             payout = -bet_amount
-
         bankroll = round(bankroll + payout, 2)
+        placed.append(i)
+        amounts.append(bet_amount)
+        payouts.append(payout)
+        bankrolls.append(bankroll)
+    return placed, amounts, payouts, bankrolls
+
+
+# Beyond this scaled magnitude the float error of ``values * 10**digits``
+# approaches _TIE_TOLERANCE, so round_exact defers to Python's round
+_EXACT_SCALED_LIMIT = 2.0**31
+_TIE_TOLERANCE = 1e-6
+
+
+def round_exact(values: np.ndarray, digits: int) -> np.ndarray:
+    """Round like Python's ``round``, which rounds the exact binary value.
+
+    ``np.round`` scales first, so it rounds e.g. 49.875 (stored as
+    49.87499999...) up to 49.88 where ``round`` gives 49.87. Values whose
+    scaled form is not near a tie are rounded with NumPy; the rest fall back
+    to ``round`` one at a time.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 10.0**digits
+    frac = scaled - np.floor(scaled)
+    result = np.rint(scaled) / 10.0**digits
+    unsure = (np.abs(frac - 0.5) < _TIE_TOLERANCE) | ~(
+        np.abs(scaled) < _EXACT_SCALED_LIMIT
+    )
+    if unsure.any():
+        result[unsure] = [round(v, digits) for v in values[unsure].tolist()]
+    return result
 
-        bets.append(
-            {
-                "date": game["date"],
-                "home_team": game["home_team"],
-                "away_team": game["away_team"],
-                "pick": pick,
-                "pick_prob": round(pick_prob, 4),
-                "edge": round(edge, 4),
-                "decimal_odds": round(decimal_odds, 4),
-                "bet_fraction": round(bet_fraction, 4),
-                "bet_amount": bet_amount,
-                "won": won,
-                "payout": payout,
-                "bankroll": bankroll,
-            }
-        )
 
-    results = pd.DataFrame(bets)
+def place_bets(
+    games: pd.DataFrame,
+    config: Config = DEFAULT_CONFIG,
+) -> pd.DataFrame:
+    """Place and settle bets over predicted games without printing.
+
+    Expects columns: home_win, model_home_prob, home_team, away_team, date.
+    Optionally: home_line, away_line (American odds) for real odds.
+
+    Returns a DataFrame with one row per bet placed, tracking bankroll.
+    """
+    priced = price_bets(games, config)
+
+    # Check minimum edge
+    candidates = (priced["edge"] >= config.min_edge).to_numpy()
+    bets = priced[candidates]
+    games = games[candidates]
+
+    is_home_pick = bets["is_home_pick"].to_numpy()
+    won = is_home_pick == games["home_win"].to_numpy().astype(bool)
+
+    placed, amounts, payouts, bankrolls = _compound(
+        config.initial_bankroll,
+        bets["bet_fraction"].tolist(),
+        bets["decimal_odds"].tolist(),
+        won.tolist(),
+    )
+
+    if not placed:
+        return pd.DataFrame()
+
+    games = games.iloc[placed]
+    bets = bets.iloc[placed]
+    results = pd.DataFrame(
+        {
+            "date": games["date"].to_numpy(),
+            "home_team": games["home_team"].to_numpy(),
+            "away_team": games["away_team"].to_numpy(),
+            "pick": np.where(
+                is_home_pick[placed], games["home_team"], games["away_team"]
+            ),
+            "pick_prob": round_exact(bets["pick_prob"].to_numpy(), 4),
+            "edge": round_exact(bets["edge"].to_numpy(), 4),
+            "decimal_odds": round_exact(bets["decimal_odds"].to_numpy(), 4),
+            "bet_fraction": round_exact(bets["bet_fraction"].to_numpy(), 4),
+            "bet_amount": amounts,
+            "won": won[placed],
+            "payout": payouts,
+            "bankroll": bankrolls,
+        }
+    )
+
+    return results
+
+
+def backtest(
+    games: pd.DataFrame,
+    config: Config = DEFAULT_CONFIG,
+) -> pd.DataFrame:
+    """Run a betting simulation over predicted games and print a summary.
+
+    See ``place_bets`` for the expected columns.
+
+    Returns a DataFrame with one row per bet placed, tracking bankroll.
+    """
+    results = place_bets(games, config)
 
     if len(results) > 0:
         _print_summary(results, config.initial_bankroll)
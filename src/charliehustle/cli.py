@@ -5,7 +5,6 @@ import sys
 from pathlib import Path
 
 import click
-import pandas as pd
 
 from charliehustle.config import Config
 
@@ -28,71 +27,237 @@ def cli(ctx: click.Context, data_dir: str, verbose: bool) -> None:
 
 @cli.command()
 @click.argument("seasons", nargs=-1, type=int, required=True)
+@click.option(
+    "--update",
+    is_flag=True,
+    help="Fetch games played since the last fetch instead of using the cache",
+)
+@click.option(
+    "--rebuild",
+    is_flag=True,
+    help="Ignore saved feature state and rebuild each season from scratch",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Seasons to fetch and build concurrently",
+)
+@click.option(
+    "--pitching-stats",
+    is_flag=True,
+    help="Fetch the previous seasons' FanGraphs pitching stats for"
+    " starting-pitcher features",
+)
 @click.pass_context
-def build(ctx: click.Context, seasons: tuple[int, ...]) -> None:
+def build(
+    ctx: click.Context,
+    seasons: tuple[int, ...],
+    update: bool,
+    rebuild: bool,
+    jobs: int,
+    pitching_stats: bool,
+) -> None:
     """Fetch game data and build feature matrices.
 
+    Seasons with saved feature state only featurize games played since the
+    last build and append them.
+
     Example: charliehustle build 2023 2024
+    Daily in-season refresh: charliehustle build 2025 --update
+    Backfill: charliehustle build $(seq 2010 2025) --jobs 8
+    With last season's pitcher stats: charliehustle build 2025 --pitching-stats
     """
-    from charliehustle.data.features import build_feature_matrix
-    from charliehustle.data.sources import fetch_season_games
-    from charliehustle.data.storage import save_parquet
+    from charliehustle.data.pipeline import build_seasons
 
     config = ctx.obj["config"]
 
-    for season in seasons:
-        click.echo(f"\n--- {season} Season ---")
-        games = fetch_season_games(season, config)
-        features = build_feature_matrix(games, config)
-
-        out_path = config.data_dir / f"{season}" / "features.parquet"
-        save_parquet(features, out_path)
-        click.echo(f"Saved {len(features)} game features to {out_path}")
+    failures = build_seasons(
+        list(seasons),
+        config,
+        jobs=jobs,
+        update=update,
+        rebuild=rebuild,
+        pitching_stats=pitching_stats,
+        echo=click.echo,
+    )
+    if failures:
+        click.echo(f"\nFailed seasons: {', '.join(map(str, sorted(failures)))}")
+        sys.exit(1)
 
 
 @cli.command()
 @click.argument("train_seasons", nargs=-1, type=int, required=True)
 @click.option(
-    "--model-name", default="xgb_model.pkl", help="Model filename"
+    "--model-name", default="xgb_model.ubj", help="Model filename"
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Cross-validation folds to fit concurrently",
+)
+@click.option(
+    "--default-params",
+    is_flag=True,
+    help="Ignore parameters saved by 'tune'",
 )
 @click.pass_context
 def train(
-    ctx: click.Context, train_seasons: tuple[int, ...], model_name: str
+    ctx: click.Context,
+    train_seasons: tuple[int, ...],
+    model_name: str,
+    jobs: int,
+    default_params: bool,
 ) -> None:
     """Train a model on one or more seasons.
 
+    Uses the parameters saved by 'tune', if any.
+
     Example: charliehustle train 2019 2020 2021 2022 2023
     """
-    from charliehustle.data.storage import load_parquet
-    from charliehustle.models.train import train_model
+    from charliehustle.data.cache import (
+        artifact_cache,
+        record_key,
+        recorded_key,
+    )
+    from charliehustle.data.dataset import features_path, missing_seasons
+    from charliehustle.models.train import (
+        METADATA_ARTIFACT,
+        MODEL_ARTIFACT,
+        cached_training_arrays,
+        load_params,
+        metadata_path,
+        model_inputs,
+        model_key,
+        params_path,
+        train_model,
+    )
 
     config = ctx.obj["config"]
     model_path = config.data_dir / "models" / model_name
+    artifacts = {
+        MODEL_ARTIFACT: model_path,
+        METADATA_ARTIFACT: metadata_path(model_path),
+    }
+
+    for season in missing_seasons(train_seasons, config):
+        click.echo(
+            f"No features found for {season}. Run 'build {season}' first."
+        )
+        sys.exit(1)
+    paths = [features_path(season, config) for season in train_seasons]
+
+    params = None if default_params else load_params(params_path(config))
+    if params is not None:
+        click.echo(f"Using tuned parameters from {params_path(config)}")
+
+    # Skip training if these features already produced this model
+    cache = artifact_cache(config)
+    key = model_key(paths, model_path, params)
+    if recorded_key(model_path) == key:
+        click.echo(f"Model at {model_path} is up to date")
+        return
+    if cache.restore(key, artifacts):
+        record_key(model_path, key)
+        click.echo(f"Restored model from the artifact cache to {model_path}")
+        return
+
+    X, y = cached_training_arrays(list(train_seasons), config)
+    click.echo(f"Training on {len(y)} games from {len(train_seasons)} seasons")
+
+    train_model(
+        (X, y),
+        model_path=model_path,
+        jobs=jobs,
+        params=params,
+        seasons=list(train_seasons),
+    )
+    cache.put(
+        key,
+        "model",
+        artifacts,
+        params=params,
+        inputs=model_inputs(paths),
+    )
+    record_key(model_path, key)
+    click.echo(f"Model saved to {model_path}")
 
-    all_features = []
-    for season in train_seasons:
-        path = config.data_dir / f"{season}" / "features.parquet"
-        df = load_parquet(path)
-        if df is None:
-            click.echo(
-                f"No features found for {season}. Run 'build {season}' first."
-            )
-            sys.exit(1)
-        all_features.append(df)
-
-    features = pd.concat(all_features, ignore_index=True)
+
+@cli.command()
+@click.argument("train_seasons", nargs=-1, type=int, required=True)
+@click.option(
+    "--trials",
+    type=click.IntRange(min=1),
+    default=32,
+    help="Parameter sets to try",
+)
+@click.option(
+    "--method",
+    type=click.Choice(["halving", "random"]),
+    default="halving",
+    help="Successive halving prunes weak trials after each CV fold",
+)
+@click.option("--seed", type=int, default=0, help="Random seed")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Fits to run concurrently",
+)
+@click.pass_context
+def tune(
+    ctx: click.Context,
+    train_seasons: tuple[int, ...],
+    trials: int,
+    method: str,
+    seed: int,
+    jobs: int,
+) -> None:
+    """Search XGBoost hyperparameters with time-series CV.
+
+    Saves the best parameters to models/best_params.json for 'train' to use.
+
+    Example: charliehustle tune 2019 2020 2021 2022 2023 --trials 64 -j 8
+    """
+    from charliehustle.data.dataset import load_features, missing_seasons
+    from charliehustle.data.features import FEATURE_COLUMNS, TARGET_COLUMN
+    from charliehustle.data.storage import save_parquet
+    from charliehustle.models.train import params_path, save_params
+    from charliehustle.models.tune import tune as tune_params
+
+    config = ctx.obj["config"]
+
+    for season in missing_seasons(train_seasons, config):
+        click.echo(
+            f"No features found for {season}. Run 'build {season}' first."
+        )
+        sys.exit(1)
+
+    features = load_features(
+        train_seasons, config, columns=[*FEATURE_COLUMNS, TARGET_COLUMN]
+    )
     click.echo(
-        f"Training on {len(features)} games from {len(train_seasons)} seasons"
+        f"Tuning on {len(features)} games from {len(train_seasons)} seasons"
     )
 
-    train_model(features, model_path=model_path)
-    click.echo(f"Model saved to {model_path}")
+    best, results = tune_params(
+        features, n_trials=trials, method=method, seed=seed, jobs=jobs
+    )
+    save_parquet(results, config.data_dir / "models" / "tune_trials.parquet")
+    save_params(best, params_path(config))
+
+    click.echo(results.head(5).to_string(index=False))
+    click.echo(f"\nBest parameters saved to {params_path(config)}")
 
 
 @cli.command()
 @click.argument("season", type=int)
 @click.option(
-    "--model-name", default="xgb_model.pkl", help="Model filename"
+    "--model-name", default="xgb_model.ubj", help="Model filename"
 )
 @click.pass_context
 def evaluate(ctx: click.Context, season: int, model_name: str) -> None:
@@ -100,25 +265,20 @@ def evaluate(ctx: click.Context, season: int, model_name: str) -> None:
 
     Example: charliehustle evaluate 2024
     """
-    from charliehustle.data.storage import load_parquet
     from charliehustle.models.evaluate import evaluate_predictions, print_evaluation
-    from charliehustle.models.predict import predict_games
-    from charliehustle.models.train import load_model
+    from charliehustle.models.predict import cached_predict_games
 
     config = ctx.obj["config"]
     model_path = config.data_dir / "models" / model_name
 
-    model = load_model(model_path)
-
     path = config.data_dir / f"{season}" / "features.parquet"
-    features = load_parquet(path)
-    if features is None:
+    games = cached_predict_games(model_path, path, config)
+    if games is None:
         click.echo(
             f"No features found for {season}. Run 'build {season}' first."
         )
         sys.exit(1)
 
-    games = predict_games(model, features)
     metrics = evaluate_predictions(games)
     print_evaluation(metrics)
 
@@ -126,7 +286,7 @@ def evaluate(ctx: click.Context, season: int, model_name: str) -> None:
 @cli.command()
 @click.argument("season", type=int)
 @click.option(
-    "--model-name", default="xgb_model.pkl", help="Model filename"
+    "--model-name", default="xgb_model.ubj", help="Model filename"
 )
 @click.option(
     "--bankroll", type=float, default=1000.0, help="Starting bankroll"
@@ -146,6 +306,21 @@ def evaluate(ctx: click.Context, season: int, model_name: str) -> None:
 @click.option(
     "--plot/--no-plot", default=True, help="Generate bankroll plot"
 )
+@click.option(
+    "--monte-carlo",
+    "n_paths",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Also simulate this many seasons of outcomes (0 to skip)",
+)
+@click.option(
+    "--method",
+    type=click.Choice(["model", "bootstrap"]),
+    default="model",
+    help="Monte Carlo outcomes: drawn from model probabilities, or "
+    "bootstrapped from the actual bets",
+)
+@click.option("--seed", type=int, default=0, help="Monte Carlo random seed")
 @click.pass_context
 def simulate(
     ctx: click.Context,
@@ -155,15 +330,20 @@ def simulate(
     kelly_fraction: float,
     min_edge: float,
     plot: bool,
+    n_paths: int,
+    method: str,
+    seed: int,
 ) -> None:
     """Run a betting simulation on a season.
 
     Example: charliehustle simulate 2024 --bankroll 1000 --kelly-fraction 0.25
     """
+    from charliehustle.betting.monte_carlo import (
+        print_monte_carlo_summary,
+        simulate_paths,
+    )
     from charliehustle.betting.simulate import backtest
-    from charliehustle.data.storage import load_parquet
-    from charliehustle.models.predict import predict_games
-    from charliehustle.models.train import load_model
+    from charliehustle.models.predict import cached_predict_games
     from charliehustle.viz import plot_bankroll
 
     config = ctx.obj["config"]
@@ -172,19 +352,23 @@ def simulate(
     config.min_edge = min_edge
 
     model_path = config.data_dir / "models" / model_name
-    model = load_model(model_path)
 
     path = config.data_dir / f"{season}" / "features.parquet"
-    features = load_parquet(path)
-    if features is None:
+    games = cached_predict_games(model_path, path, config)
+    if games is None:
         click.echo(
             f"No features found for {season}. Run 'build {season}' first."
         )
         sys.exit(1)
 
-    games = predict_games(model, features)
     results = backtest(games, config)
 
+    if n_paths:
+        paths = simulate_paths(
+            games, config, n_paths=n_paths, method=method, seed=seed
+        )
+        print_monte_carlo_summary(paths, config.initial_bankroll)
+
     if plot and len(results) > 0:
         plot_path = config.data_dir / "plots" / f"bankroll_{season}.png"
         plot_bankroll(
@@ -192,3 +376,215 @@ def simulate(
             title=f"{season} MLB Season Simulation",
             output_path=plot_path,
         )
+
+
+@cli.command("simulate-grid")
+@click.argument("season", type=int)
+@click.option(
+    "--model-name", default="xgb_model.ubj", help="Model filename"
+)
+@click.option(
+    "--bankroll", type=float, default=1000.0, help="Starting bankroll"
+)
+@click.option(
+    "--kelly-fraction",
+    "kelly_fractions",
+    type=float,
+    multiple=True,
+    default=(0.1, 0.25, 0.5, 1.0),
+    help="Kelly fraction to try (repeatable)",
+)
+@click.option(
+    "--min-edge",
+    "min_edges",
+    type=float,
+    multiple=True,
+    default=(0.0, 0.02, 0.04, 0.06),
+    help="Minimum edge to try (repeatable)",
+)
+@click.option(
+    "--max-bet-fraction",
+    "max_bet_fractions",
+    type=float,
+    multiple=True,
+    default=(0.02, 0.05, 0.1),
+    help="Bet cap as a fraction of bankroll to try (repeatable)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Configurations to evaluate concurrently",
+)
+@click.pass_context
+def simulate_grid(
+    ctx: click.Context,
+    season: int,
+    model_name: str,
+    bankroll: float,
+    kelly_fractions: tuple[float, ...],
+    min_edges: tuple[float, ...],
+    max_bet_fractions: tuple[float, ...],
+    jobs: int,
+) -> None:
+    """Compare staking settings on a season, predicting only once.
+
+    Saves one row per configuration to simulations/grid_<season>.parquet.
+
+    Example: charliehustle simulate-grid 2024 --kelly-fraction 0.25
+    --kelly-fraction 0.5 --min-edge 0.03 --jobs 8
+    """
+    from charliehustle.betting.grid import grid_search, staking_grid
+    from charliehustle.data.storage import save_parquet
+    from charliehustle.models.predict import cached_predict_games
+
+    config = ctx.obj["config"]
+    config.initial_bankroll = bankroll
+
+    model_path = config.data_dir / "models" / model_name
+
+    path = config.data_dir / f"{season}" / "features.parquet"
+    games = cached_predict_games(model_path, path, config)
+    if games is None:
+        click.echo(
+            f"No features found for {season}. Run 'build {season}' first."
+        )
+        sys.exit(1)
+
+    configs = staking_grid(
+        kelly_fractions, min_edges, max_bet_fractions, config
+    )
+    summary = grid_search(games, configs, jobs=jobs)
+
+    out_path = config.data_dir / "simulations" / f"grid_{season}.parquet"
+    save_parquet(summary, out_path)
+
+    click.echo(
+        summary.sort_values("roi", ascending=False)
+        .head(10)
+        .to_string(index=False)
+    )
+    click.echo(f"\nSaved {len(summary)} configurations to {out_path}")
+
+
+@cli.command("walk-forward")
+@click.argument("season", type=int)
+@click.option(
+    "--history",
+    type=click.IntRange(min=0),
+    default=3,
+    help="Earlier seasons to include as training history",
+)
+@click.option(
+    "--step-days",
+    type=click.IntRange(min=1),
+    default=14,
+    help="Days between model refreshes",
+)
+@click.option(
+    "--warm-start",
+    is_flag=True,
+    help="Continue boosting the previous model instead of retraining",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Blocks to retrain concurrently",
+)
+@click.option(
+    "--bankroll", type=float, default=1000.0, help="Starting bankroll"
+)
+@click.option(
+    "--default-params",
+    is_flag=True,
+    help="Ignore parameters saved by 'tune'",
+)
+@click.pass_context
+def walk_forward(
+    ctx: click.Context,
+    season: int,
+    history: int,
+    step_days: int,
+    warm_start: bool,
+    jobs: int,
+    bankroll: float,
+    default_params: bool,
+) -> None:
+    """Backtest a season with a model retrained every few days.
+
+    Each block of --step-days is predicted by a model trained only on games
+    before it, starting with --history earlier seasons. Uses the parameters
+    saved by 'tune', if any.
+
+    Example: charliehustle walk-forward 2024 --history 3 --step-days 7 -j 4
+    """
+    from charliehustle.betting.simulate import backtest
+    from charliehustle.data.cache import artifact_cache, artifact_id, stage_key
+    from charliehustle.data.dataset import (
+        features_path,
+        load_features,
+        missing_seasons,
+    )
+    from charliehustle.data.storage import load_parquet
+    from charliehustle.models.evaluate import (
+        evaluate_predictions,
+        print_evaluation,
+    )
+    from charliehustle.models.train import (
+        MODEL_PARAMS,
+        load_params,
+        params_path,
+    )
+    from charliehustle.models.walk_forward import (
+        UPDATE_ESTIMATORS,
+        walk_forward_predict,
+    )
+
+    config = ctx.obj["config"]
+    config.initial_bankroll = bankroll
+
+    seasons = list(range(season - history, season + 1))
+    for s in missing_seasons(seasons, config):
+        click.echo(f"No features found for {s}. Run 'build {s}' first.")
+        sys.exit(1)
+    paths = [features_path(s, config) for s in seasons]
+
+    model_params = None if default_params else load_params(params_path(config))
+    if model_params is not None:
+        click.echo(f"Using tuned parameters from {params_path(config)}")
+
+    # Walk-forward predictions depend only on the features and settings
+    cache = artifact_cache(config)
+    params = {
+        "step_days": step_days,
+        "warm_start": warm_start,
+        "update_estimators": UPDATE_ESTIMATORS if warm_start else None,
+        "model": {**MODEL_PARAMS, **(model_params or {})},
+    }
+    inputs = {f"{s}": artifact_id(path) for s, path in zip(seasons, paths)}
+    key = stage_key("walk_forward", params, inputs)
+    cached_dir = cache.get(key)
+    if cached_dir is not None:
+        click.echo("Using cached walk-forward predictions")
+        games = load_parquet(cached_dir / "predictions.parquet")
+    else:
+        features = load_features(seasons, config)
+        first_day = features.loc[features["season"] == season, "date"].min()
+        games = walk_forward_predict(
+            features,
+            start=first_day,
+            step_days=step_days,
+            warm_start=warm_start,
+            update_estimators=UPDATE_ESTIMATORS,
+            jobs=jobs,
+            params=model_params,
+        )
+        cache.put_frames(
+            key, "walk_forward", {"predictions.parquet": games}, params, inputs
+        )
+
+    print_evaluation(evaluate_predictions(games))
+    backtest(games, config)
@@ -18,6 +18,9 @@ class Config(BaseModel):
 
     # Feature engineering
     rolling_window: int = 30
+    warm_start_min_games: int = 10
+    pitcher_window: int = 5  # Starts in a pitcher's rolling runs allowed
+    form_window: int = 10  # Games in a team's recent form
 
     # Betting
     initial_bankroll: float = 1000.0
@@ -25,5 +28,8 @@ class Config(BaseModel):
     min_edge: float = 0.02
     max_bet_fraction: float = 0.05
 
+    # Artifact cache size budget (None for unbounded)
+    cache_max_mb: int | None = 2048
+
 
 DEFAULT_CONFIG = Config()
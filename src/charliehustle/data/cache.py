@@ -0,0 +1,343 @@
+"""Content-addressed artifact cache for pipeline stages.
+
+Each stage output (season features, a trained model, predictions) is stored
+under a key hashed from the stage name, the config fields it depends on, the
+keys or content digests of its inputs and the stage's version in
+``STAGE_VERSIONS``. A change anywhere upstream changes every downstream key,
+so only the affected stages are recomputed, and switching a setting back
+reuses the earlier outputs. The package version alone would not do: it is
+only bumped on release, so code changes between releases would keep serving
+outputs made by the old code.
+
+Entries live in ``<data_dir>/cache/objects/<key>/``, each with the stage's
+files and an ``entry.json`` manifest record (stage, params, inputs, size,
+last use). One record per entry, rather than one shared manifest file, keeps
+concurrent season builds from racing on writes. Once the cache grows past
+``Config.cache_max_mb``, the least recently used entries are evicted.
+
+The working copies under ``data/<season>/`` and ``data/models/`` stay where
+the rest of the code expects them; ``artifacts.json`` in each of those
+directories records the key each working copy was made from, along with the
+file's size and modification time. A working copy rewritten by anything
+other than ``record_key``'s caller (say, ``train_model`` saving straight to
+the path) no longer matches, so its recorded key is ignored and it is
+identified by its contents instead.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from collections.abc import Callable, Collection, Mapping
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+from pydantic import BaseModel
+
+from charliehustle import __version__
+from charliehustle.config import DEFAULT_CONFIG, Config
+from charliehustle.data.storage import file_digest
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_FILE = "entry.json"
+_ARTIFACTS_FILE = "artifacts.json"
+
+# Bump a stage's version with any code change that alters its outputs, so
+# entries made by the old code are no longer hit. Downstream stages need no
+# bump: their inputs' keys or digests change with it.
+STAGE_VERSIONS = {
+    # 2: compact dtypes, 3: starting-pitcher features, 4: team form
+    "features": 4,
+    "feature_store": 1,
+    "model": 1,
+    "predictions": 1,
+    "walk_forward": 1,
+}
+
+
+class CacheEntry(BaseModel):
+    """Manifest record for one cached stage output."""
+
+    key: str
+    stage: str
+    files: list[str]
+    size: int
+    params: dict[str, Any] = {}
+    inputs: dict[str, str] = {}
+    code_version: str = __version__
+    stage_version: int = 1
+    created: datetime
+    last_used: datetime
+
+
+def stage_key(
+    stage: str,
+    params: Mapping[str, Any],
+    inputs: Mapping[str, str | None],
+) -> str:
+    """Hash a stage's name, config params, input keys and code versions."""
+    payload = json.dumps(
+        {
+            "stage": stage,
+            "params": dict(params),
+            "inputs": dict(inputs),
+            "code_version": __version__,
+            "stage_version": STAGE_VERSIONS.get(stage, 1),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def frame_digest(df: pd.DataFrame | pd.Series | None) -> str | None:
+    """SHA-256 of a frame's values, column names and dtypes.
+
+    A DataFrame's index is ignored; a Series' index is included, since
+    per-team Series (like ELO ratings) are keyed by it, but not its order:
+    the same ratings hash the same whichever order the teams are in.
+    """
+    if df is None:
+        return None
+    if isinstance(df, pd.Series):
+        df = df.sort_index(kind="stable")
+    digest = hashlib.sha256()
+    frame = df.to_frame() if isinstance(df, pd.Series) else df
+    digest.update(
+        json.dumps(
+            [[str(c), str(t)] for c, t in frame.dtypes.items()]
+        ).encode()
+    )
+    if isinstance(df, pd.Series):
+        digest.update(pd.util.hash_pandas_object(df.index).to_numpy())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy())
+    return digest.hexdigest()
+
+
+def _write_json_atomic(path: Path, text: str) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text)
+    os.replace(tmp_path, path)
+
+
+class ArtifactCache:
+    """Stage outputs stored by key, with LRU eviction past a size budget."""
+
+    def __init__(self, root: Path, max_bytes: int | None = None) -> None:
+        self.root = root
+        self.objects = root / "objects"
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, key: str) -> Path:
+        return self.objects / key / _ENTRY_FILE
+
+    def _load_entry(self, key: str) -> CacheEntry | None:
+        try:
+            return CacheEntry.model_validate_json(
+                self._entry_path(key).read_text()
+            )
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def get(self, key: str) -> Path | None:
+        """Directory holding the files for ``key``, or None on a miss.
+
+        A hit marks the entry as recently used.
+        """
+        entry = self._load_entry(key)
+        if entry is None:
+            return None
+        entry.last_used = datetime.now()
+        _write_json_atomic(self._entry_path(key), entry.model_dump_json())
+        logger.debug(f"Cache hit for {entry.stage} {key[:12]}")
+        return self.objects / key
+
+    def entry(self, key: str | None) -> CacheEntry | None:
+        """Manifest record for ``key``, without marking it as used."""
+        return None if key is None else self._load_entry(key)
+
+    def put(
+        self,
+        key: str,
+        stage: str,
+        files: Mapping[str, Path],
+        params: Mapping[str, Any] | None = None,
+        inputs: Mapping[str, str | None] | None = None,
+    ) -> Path:
+        """Copy ``files`` (stored name -> source path) into the cache."""
+        tmp_dir = self._staging_dir(key)
+        for name, src in files.items():
+            shutil.copyfile(src, tmp_dir / name)
+        return self._commit(key, stage, tmp_dir, list(files), params, inputs)
+
+    def put_frames(
+        self,
+        key: str,
+        stage: str,
+        frames: Mapping[str, pd.DataFrame],
+        params: Mapping[str, Any] | None = None,
+        inputs: Mapping[str, str | None] | None = None,
+    ) -> Path:
+        """Write ``frames`` (stored name -> DataFrame) into the cache as parquet."""
+        tmp_dir = self._staging_dir(key)
+        for name, df in frames.items():
+            df.to_parquet(tmp_dir / name, index=False)
+        return self._commit(key, stage, tmp_dir, list(frames), params, inputs)
+
+    def put_written(
+        self,
+        key: str,
+        stage: str,
+        writers: Mapping[str, Callable[[Path], None]],
+        params: Mapping[str, Any] | None = None,
+        inputs: Mapping[str, str | None] | None = None,
+    ) -> Path:
+        """Write files straight into the cache.
+
+        ``writers`` maps each stored name to a function that writes the file
+        to the path it is given.
+        """
+        tmp_dir = self._staging_dir(key)
+        for name, write in writers.items():
+            write(tmp_dir / name)
+        return self._commit(key, stage, tmp_dir, list(writers), params, inputs)
+
+    def _staging_dir(self, key: str) -> Path:
+        tmp_dir = self.objects / f".{key}.{os.getpid()}.tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        return tmp_dir
+
+    def _commit(
+        self,
+        key: str,
+        stage: str,
+        tmp_dir: Path,
+        names: list[str],
+        params: Mapping[str, Any] | None,
+        inputs: Mapping[str, str | None] | None,
+    ) -> Path:
+        """Move a staged entry into place, then evict if over budget."""
+        target = self.objects / key
+        now = datetime.now()
+        entry = CacheEntry(
+            key=key,
+            stage=stage,
+            files=names,
+            size=sum((tmp_dir / name).stat().st_size for name in names),
+            params=dict(params or {}),
+            inputs={k: str(v) for k, v in (inputs or {}).items()},
+            stage_version=STAGE_VERSIONS.get(stage, 1),
+            created=now,
+            last_used=now,
+        )
+        (tmp_dir / _ENTRY_FILE).write_text(entry.model_dump_json())
+        try:
+            os.replace(tmp_dir, target)
+        except OSError:
+            # Already cached, e.g. by another process
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        logger.debug(f"Cached {stage} {key[:12]} ({entry.size} bytes)")
+
+        if self.max_bytes is not None:
+            # The caller is about to read the new entry, so it always stays,
+            # even when it alone is over budget
+            self.evict(self.max_bytes, keep={key})
+        return target
+
+    def restore(self, key: str, dest: Mapping[str, Path]) -> bool:
+        """Copy cached files (stored name -> destination path) out of the cache.
+
+        Returns False on a miss.
+        """
+        src_dir = self.get(key)
+        if src_dir is None:
+            return False
+        for name, path in dest.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            shutil.copyfile(src_dir / name, tmp_path)
+            os.replace(tmp_path, path)
+        return True
+
+    def entries(self) -> pd.DataFrame:
+        """The manifest: one row per entry, least recently used first."""
+        records = []
+        if self.objects.exists():
+            for entry_path in self.objects.glob(f"*/{_ENTRY_FILE}"):
+                entry = self._load_entry(entry_path.parent.name)
+                if entry is not None:
+                    records.append(entry.model_dump())
+        columns = list(CacheEntry.model_fields)
+        manifest = pd.DataFrame(records, columns=columns)
+        return manifest.sort_values("last_used", ignore_index=True)
+
+    def evict(self, max_bytes: int, keep: Collection[str] = ()) -> list[str]:
+        """Remove least recently used entries until the total fits.
+
+        Entries in ``keep`` are never removed. Returns the evicted keys.
+        """
+        manifest = self.entries()
+        total = int(manifest["size"].sum())
+        evicted = []
+        for entry in manifest.itertuples():
+            if total <= max_bytes:
+                break
+            if entry.key in keep:
+                continue
+            shutil.rmtree(self.objects / entry.key, ignore_errors=True)
+            total -= entry.size
+            evicted.append(entry.key)
+        if evicted:
+            logger.info(
+                f"Evicted {len(evicted)} cache entries to fit {max_bytes} bytes"
+            )
+        return evicted
+
+
+def artifact_cache(config: Config = DEFAULT_CONFIG) -> ArtifactCache:
+    """The cache under ``config.data_dir``, bounded by ``cache_max_mb``."""
+    max_bytes = (
+        None if config.cache_max_mb is None else config.cache_max_mb * 2**20
+    )
+    return ArtifactCache(config.data_dir / "cache", max_bytes=max_bytes)
+
+
+def _file_stamp(path: Path) -> dict[str, int] | None:
+    """Size and modification time, to tell whether a file was rewritten."""
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def recorded_key(path: Path) -> str | None:
+    """Key the working copy at ``path`` was made from, if recorded.
+
+    None if the file has changed since the key was recorded.
+    """
+    record = path.parent / _ARTIFACTS_FILE
+    if not record.exists() or not path.exists():
+        return None
+    entry = json.loads(record.read_text()).get(path.name)
+    # Records from before the file stamp can't be checked, so aren't trusted
+    if not isinstance(entry, dict) or entry["stamp"] != _file_stamp(path):
+        return None
+    return entry["key"]
+
+
+def record_key(path: Path, key: str) -> None:
+    """Record that the working copy at ``path``, as it is now, is ``key``."""
+    record = path.parent / _ARTIFACTS_FILE
+    keys = json.loads(record.read_text()) if record.exists() else {}
+    keys[path.name] = {"key": key, "stamp": _file_stamp(path)}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write_json_atomic(record, json.dumps(keys, indent=2, sort_keys=True))
+
+
+def artifact_id(path: Path) -> str:
+    """Identify a working copy by its recorded key, else by its contents."""
+    return recorded_key(path) or file_digest(path)
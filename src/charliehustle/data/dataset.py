@@ -0,0 +1,166 @@
+"""Multi-season feature dataset with predicate pushdown.
+
+Each season's features stay in ``<data_dir>/<season>/features.parquet``,
+where the pipeline and the artifact cache keep them. ``features_dataset``
+reads those files as one Arrow dataset partitioned by season (taken from the
+directory name), and ``save_features`` writes one row group per month with
+min/max statistics. Filters on season and date are pushed down to the
+reader, so whole files and months outside the requested range are skipped,
+and only the requested columns are decoded.
+"""
+
+import logging
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from charliehustle.config import DEFAULT_CONFIG, Config
+
+logger = logging.getLogger(__name__)
+
+FEATURES_FILE = "features.parquet"
+
+# Partition key read from the season directory name
+_PARTITIONING = ds.DirectoryPartitioning(pa.schema([("season", pa.int16())]))
+
+
+def features_path(season: int, config: Config = DEFAULT_CONFIG) -> Path:
+    """Where a season's feature matrix is saved."""
+    return config.data_dir / f"{season}" / FEATURES_FILE
+
+
+def missing_seasons(
+    seasons: Iterable[int], config: Config = DEFAULT_CONFIG
+) -> list[int]:
+    """The seasons that have no saved features."""
+    return [s for s in seasons if not features_path(s, config).exists()]
+
+
+def save_features(features: pd.DataFrame, path: Path) -> None:
+    """Save a feature matrix with one row group per calendar month.
+
+    Like ``save_parquet``, writes to a temporary file and renames it into
+    place.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    table = pa.Table.from_pandas(features, preserve_index=False)
+    months = features["date"].dt.year * 12 + features["date"].dt.month
+    bounds = [
+        0,
+        *np.flatnonzero(np.diff(months.to_numpy())) + 1,
+        len(features),
+    ]
+    with pq.ParquetWriter(tmp_path, table.schema) as writer:
+        if len(features) == 0:
+            writer.write_table(table)
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            writer.write_table(table.slice(start, end - start))
+    os.replace(tmp_path, path)
+    logger.debug(f"Saved {len(features)} rows to {path}")
+
+
+def features_dataset(
+    seasons: Iterable[int], config: Config = DEFAULT_CONFIG
+) -> ds.Dataset:
+    """The seasons' feature files as one dataset with a ``season`` column.
+
+    Raises:
+        FileNotFoundError: If a season has no saved features.
+    """
+    seasons = list(seasons)
+    missing = missing_seasons(seasons, config)
+    if missing:
+        raise FileNotFoundError(
+            f"No features for seasons {', '.join(map(str, missing))}"
+        )
+    return ds.dataset(
+        [str(features_path(s, config)) for s in seasons],
+        format="parquet",
+        partitioning=_PARTITIONING,
+        partition_base_dir=str(config.data_dir),
+    )
+
+
+def _filter(
+    start: pd.Timestamp | str | None, end: pd.Timestamp | str | None
+) -> ds.Expression | None:
+    """Rows with ``start <= date < end``; either bound may be open."""
+    conditions = []
+    if start is not None:
+        conditions.append(ds.field("date") >= pd.Timestamp(start))
+    if end is not None:
+        conditions.append(ds.field("date") < pd.Timestamp(end))
+    if not conditions:
+        return None
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+def load_features(
+    seasons: Iterable[int],
+    config: Config = DEFAULT_CONFIG,
+    columns: list[str] | None = None,
+    start: pd.Timestamp | str | None = None,
+    end: pd.Timestamp | str | None = None,
+) -> pd.DataFrame:
+    """Load several seasons' features in one read, in season order.
+
+    Args:
+        seasons: Seasons to load.
+        config: Configuration (for the data directory).
+        columns: Columns to read, e.g. ``FEATURE_COLUMNS``; all columns
+            (plus ``season``) if None.
+        start: First date to include.
+        end: Date to stop before.
+
+    Raises:
+        FileNotFoundError: If a season has no saved features.
+    """
+    table = features_dataset(seasons, config).to_table(
+        columns=columns, filter=_filter(start, end)
+    )
+    return table.to_pandas()
+
+
+def load_feature_arrays(
+    seasons: Iterable[int],
+    columns: list[str],
+    target: str,
+    config: Config = DEFAULT_CONFIG,
+    start: pd.Timestamp | str | None = None,
+    end: pd.Timestamp | str | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Read ``columns`` into one contiguous float32 matrix, plus ``target``.
+
+    Batches are copied straight from Arrow into the preallocated matrix,
+    without building per-season DataFrames or concatenating them.
+
+    Raises:
+        FileNotFoundError: If a season has no saved features.
+    """
+    dataset = features_dataset(seasons, config)
+    expression = _filter(start, end)
+    n = dataset.count_rows(filter=expression)
+    X = np.empty((n, len(columns)), dtype=np.float32)
+    y = np.empty(n, dtype=np.int64)
+    row = 0
+    for batch in dataset.to_batches(
+        columns=[*columns, target], filter=expression
+    ):
+        end_row = row + batch.num_rows
+        for j, name in enumerate(columns):
+            X[row:end_row, j] = batch.column(name).to_numpy(
+                zero_copy_only=False
+            )
+        y[row:end_row] = batch.column(target).to_numpy(zero_copy_only=False)
+        row = end_row
+    return X, y
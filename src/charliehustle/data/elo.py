@@ -0,0 +1,454 @@
+"""Array-based ELO rating engine.
+
+Teams are encoded to integer IDs and ratings live in a flat array, so the
+per-game update is a tight loop over preallocated NumPy buffers. When numba
+is installed the loop is compiled; otherwise it runs over plain Python lists,
+which is still far cheaper than ``DataFrame.iterrows``.
+"""
+
+import itertools
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from charliehustle.config import DEFAULT_CONFIG, Config
+from charliehustle.data.schema import TEAMS
+from charliehustle.data.storage import load_parquet, save_parquet
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional speedup
+    njit = None
+
+
+def encode_teams(
+    games: pd.DataFrame,
+) -> tuple[np.ndarray, np.ndarray, pd.Index]:
+    """Encode home/away team names as integer IDs.
+
+    Returns (home_idx, away_idx, teams) where ``teams[i]`` is the name for ID i.
+    Categorical team columns are factorized on their codes.
+    """
+    n = len(games)
+    codes, teams = pd.factorize(
+        pd.concat([games["home_team"], games["away_team"]], ignore_index=True),
+        sort=True,
+    )
+    codes = codes.astype(np.int64)
+    return codes[:n], codes[n:], pd.Index(teams.astype(str))
+
+
+def _elo_loop(
+    home_idx,
+    away_idx,
+    outcome,
+    ratings,
+    out_home,
+    out_away,
+    out_prob,
+    k: float,
+    hfa: float,
+    new_season,
+    reversion: float,
+    mean: float,
+) -> None:
+    """Sequential ELO update, written to run on lists or compiled arrays."""
+    for i in range(len(home_idx)):
+        if new_season[i]:
+            for t in range(len(ratings)):
+                ratings[t] = ratings[t] + reversion * (mean - ratings[t])
+
+        home = home_idx[i]
+        away = away_idx[i]
+        h_elo = ratings[home]
+        a_elo = ratings[away]
+
+        out_home[i] = h_elo
+        out_away[i] = a_elo
+
+        # Expected outcome with home-field advantage
+        exp_home = 1 / (1 + 10 ** ((a_elo - h_elo - hfa) / 400))
+        out_prob[i] = exp_home
+
+        actual_home = outcome[i]
+        ratings[home] = h_elo + k * (actual_home - exp_home)
+        ratings[away] = a_elo + k * ((1 - actual_home) - (1 - exp_home))
+
+
+_elo_loop_compiled = njit(cache=True)(_elo_loop) if njit is not None else None
+
+
+def run_elo(
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    outcome: np.ndarray,
+    ratings: np.ndarray,
+    k: float,
+    hfa: float,
+    new_season: np.ndarray | None = None,
+    reversion: float = 0.0,
+    mean: float = 1500.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Replay games in order and return pre-game ratings.
+
+    Args:
+        home_idx: Integer home team ID per game.
+        away_idx: Integer away team ID per game.
+        outcome: 1.0 if the home team won, else 0.0.
+        ratings: Starting rating per team ID (not modified).
+        k: ELO K-factor.
+        hfa: Home-field advantage in rating points.
+        new_season: Flags games that open a new season; every rating is
+            regressed toward ``mean`` by ``reversion`` before such a game.
+        reversion: Fraction of the distance to ``mean`` removed at each
+            season boundary.
+        mean: League-average rating.
+
+    Returns:
+        (home_elo, away_elo, elo_home_prob, final_ratings)
+    """
+    n = len(home_idx)
+    outcome = np.asarray(outcome, dtype=np.float64)
+    ratings = np.array(ratings, dtype=np.float64)
+    if new_season is None:
+        new_season = np.zeros(n, dtype=np.bool_)
+
+    if _elo_loop_compiled is not None:
+        out_home = np.empty(n, dtype=np.float64)
+        out_away = np.empty(n, dtype=np.float64)
+        out_prob = np.empty(n, dtype=np.float64)
+        _elo_loop_compiled(
+            np.asarray(home_idx, dtype=np.int64),
+            np.asarray(away_idx, dtype=np.int64),
+            outcome,
+            ratings,
+            out_home,
+            out_away,
+            out_prob,
+            float(k),
+            float(hfa),
+            np.asarray(new_season, dtype=np.bool_),
+            float(reversion),
+            float(mean),
+        )
+        return out_home, out_away, out_prob, ratings
+
+    # Pure-Python fallback: lists avoid per-element NumPy scalar boxing
+    out_home = [0.0] * n
+    out_away = [0.0] * n
+    out_prob = [0.0] * n
+    state = ratings.tolist()
+    _elo_loop(
+        np.asarray(home_idx).tolist(),
+        np.asarray(away_idx).tolist(),
+        outcome.tolist(),
+        state,
+        out_home,
+        out_away,
+        out_prob,
+        float(k),
+        float(hfa),
+        np.asarray(new_season).tolist(),
+        float(reversion),
+        float(mean),
+    )
+    return (
+        np.array(out_home),
+        np.array(out_away),
+        np.array(out_prob),
+        np.array(state),
+    )
+
+
+def _sweep_loop(
+    home_idx,
+    away_idx,
+    outcome,
+    new_season,
+    ratings,
+    k,
+    hfa,
+    reversion,
+    mean: float,
+    warmup: int,
+    brier,
+    log_loss,
+) -> None:
+    """ELO update for every configuration at once, vectorized over configs.
+
+    ``ratings`` has shape (n_teams, n_configs); ``k``, ``hfa`` and ``reversion``
+    have shape (n_configs,). Squared and log errors are accumulated in place.
+    """
+    for i in range(len(home_idx)):
+        if new_season[i]:
+            ratings += reversion * (mean - ratings)
+
+        home = home_idx[i]
+        away = away_idx[i]
+        h_elo = ratings[home]
+        a_elo = ratings[away]
+
+        exp_home = 1 / (1 + 10 ** ((a_elo - h_elo - hfa) / 400))
+        actual_home = outcome[i]
+
+        if i >= warmup:
+            brier += (exp_home - actual_home) ** 2
+            p = exp_home if actual_home > 0.5 else 1 - exp_home
+            log_loss -= np.log(np.maximum(p, _EPS))
+
+        delta = k * (actual_home - exp_home)
+        ratings[home] = h_elo + delta
+        ratings[away] = a_elo - delta
+
+
+def _sweep_loop_scalar(
+    home_idx,
+    away_idx,
+    outcome,
+    new_season,
+    ratings,
+    k,
+    hfa,
+    reversion,
+    mean: float,
+    warmup: int,
+    brier,
+    log_loss,
+) -> None:
+    """Same as ``_sweep_loop`` with an explicit inner loop, for numba."""
+    n_teams, n_configs = ratings.shape
+    for i in range(len(home_idx)):
+        if new_season[i]:
+            for t in range(n_teams):
+                for c in range(n_configs):
+                    ratings[t, c] += reversion[c] * (mean - ratings[t, c])
+
+        home = home_idx[i]
+        away = away_idx[i]
+        actual_home = outcome[i]
+        for c in range(n_configs):
+            h_elo = ratings[home, c]
+            a_elo = ratings[away, c]
+            exp_home = 1 / (1 + np.exp((a_elo - h_elo - hfa[c]) * _LN10_400))
+
+            if i >= warmup:
+                brier[c] += (exp_home - actual_home) ** 2
+                p = exp_home if actual_home > 0.5 else 1 - exp_home
+                log_loss[c] -= np.log(max(p, _EPS))
+
+            delta = k[c] * (actual_home - exp_home)
+            ratings[home, c] = h_elo + delta
+            ratings[away, c] = a_elo - delta
+
+
+_EPS = 1e-15
+_LN10_400 = np.log(10) / 400
+_sweep_loop_compiled = (
+    njit(cache=True)(_sweep_loop_scalar) if njit is not None else None
+)
+
+
+def season_starts(games: pd.DataFrame) -> np.ndarray:
+    """Flag the first game of every season after the first one.
+
+    Seasons come from a season column, else the year of the date column.
+    Games with neither are taken to be a single season.
+    """
+    flags = np.zeros(len(games), dtype=np.bool_)
+    if "season" in games.columns:
+        seasons = games["season"].to_numpy()
+    elif "date" in games.columns:
+        seasons = games["date"].dt.year.to_numpy()
+    else:
+        return flags
+    flags[1:] = seasons[1:] != seasons[:-1]
+    return flags
+
+
+def season_numbers(games: pd.DataFrame) -> np.ndarray:
+    """Each game's season as a count of ``season_starts`` before it, from 0."""
+    return np.cumsum(season_starts(games))
+
+
+def sweep_elo(
+    games: pd.DataFrame,
+    k_values: Sequence[float],
+    hfa_values: Sequence[float],
+    reversion_values: Sequence[float] | None = None,
+    config: Config = DEFAULT_CONFIG,
+    warmup: int = 0,
+) -> pd.DataFrame:
+    """Score every (k, home advantage, reversion) combination in one pass.
+
+    All rating trajectories are advanced together as an
+    (n_configs x n_teams) array, so the cost of a grid is close to the cost
+    of a single ``compute_elo_ratings`` call. Ratings regress toward
+    ``config.elo_mean`` by the reversion factor at each season boundary.
+
+    Args:
+        games: Games sorted by date, spanning one or more seasons.
+        k_values: Candidate K-factors.
+        hfa_values: Candidate home-field advantages.
+        reversion_values: Candidate reversion factors (defaults to the
+            configured one).
+        config: Supplies ``elo_mean`` and the default reversion factor.
+        warmup: Number of leading games excluded from scoring.
+
+    Returns:
+        One row per combination with brier_score and log_loss, best first.
+    """
+    if reversion_values is None:
+        reversion_values = [config.elo_reversion_factor]
+
+    grid = np.array(
+        list(itertools.product(k_values, hfa_values, reversion_values)),
+        dtype=np.float64,
+    )
+    k, hfa, reversion = grid[:, 0].copy(), grid[:, 1].copy(), grid[:, 2].copy()
+
+    home_idx, away_idx, teams = encode_teams(games)
+    ratings = np.full((len(teams), len(grid)), config.elo_mean)
+    brier = np.zeros(len(grid))
+    log_loss = np.zeros(len(grid))
+
+    loop = _sweep_loop_compiled or _sweep_loop
+    loop(
+        home_idx,
+        away_idx,
+        games["home_win"].to_numpy(dtype=np.float64),
+        season_starts(games),
+        ratings,
+        k,
+        hfa,
+        reversion,
+        float(config.elo_mean),
+        int(warmup),
+        brier,
+        log_loss,
+    )
+
+    n_scored = max(len(games) - warmup, 1)
+    logger.info(f"Swept {len(grid)} ELO configurations over {len(games)} games")
+    return (
+        pd.DataFrame(
+            {
+                "elo_k": k,
+                "elo_home_advantage": hfa,
+                "elo_reversion_factor": reversion,
+                "brier_score": brier / n_scored,
+                "log_loss": log_loss / n_scored,
+            }
+        )
+        .sort_values("brier_score", kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def regress_to_mean(
+    ratings: pd.Series, config: Config = DEFAULT_CONFIG
+) -> pd.Series:
+    """Pull ratings toward ``elo_mean`` by ``elo_reversion_factor``.
+
+    Applied between seasons to account for roster turnover.
+    """
+    r = config.elo_reversion_factor
+    return ratings + r * (config.elo_mean - ratings)
+
+
+def final_elo_ratings(
+    games: pd.DataFrame, config: Config = DEFAULT_CONFIG
+) -> pd.Series:
+    """Recover each team's rating after its last game.
+
+    Expects the columns added by ``compute_elo_ratings``. Returns a Series of
+    post-game ratings indexed by team name.
+    """
+    actual_home = games["home_win"].to_numpy(dtype=np.float64)
+    exp_home = games["elo_home_prob"].to_numpy()
+    k = config.elo_k
+
+    home_post = games["home_elo"].to_numpy() + k * (actual_home - exp_home)
+    away_post = games["away_elo"].to_numpy() + k * (
+        (1 - actual_home) - (1 - exp_home)
+    )
+
+    n = len(games)
+    sides = pd.DataFrame(
+        {
+            "team": np.concatenate(
+                [games["home_team"].to_numpy(), games["away_team"].to_numpy()]
+            ),
+            "order": np.concatenate([np.arange(n), np.arange(n)]),
+            "elo": np.concatenate([home_post, away_post]),
+        }
+    )
+    last = sides.sort_values("order", kind="stable").drop_duplicates(
+        "team", keep="last"
+    )
+    return last.set_index("team")["elo"].sort_index().rename("elo")
+
+
+def rename_carried_ratings(
+    ratings: pd.Series, teams: Sequence[str]
+) -> pd.Series:
+    """Relabel ``ratings`` to the names ``teams`` uses for the same franchise.
+
+    Ratings are keyed by team name, and franchises get renamed (Cleveland
+    Indians to Guardians, Oakland Athletics to Athletics). A rating saved
+    under a name not in ``teams`` is moved to the name in ``teams`` with the
+    same ``TEAMS`` team_id, so the team keeps its rating rather than
+    starting at ``elo_mean``. Names without a team_id are left as they are.
+    """
+    ids = dict(zip(TEAMS["name"], TEAMS["team_id"]))
+    teams = pd.Index(teams).astype(str)
+    current = {ids[t]: t for t in teams if t in ids}
+    renamed = {
+        name: current[ids[name]]
+        for name in ratings.index
+        if name not in teams and ids.get(name) in current
+    }
+    if not renamed:
+        return ratings
+    moved = ratings.index.isin(list(renamed))
+    ratings = ratings.rename(index=renamed)
+    # A rating already saved under the current name wins over a moved one
+    return ratings[~(ratings.index.duplicated(keep=False) & moved)]
+
+
+def elo_ratings_path(season: int, config: Config = DEFAULT_CONFIG) -> Path:
+    """Location of the end-of-season ratings for a season."""
+    return config.data_dir / f"{season}" / "elo_ratings.parquet"
+
+
+def save_elo_ratings(ratings: pd.Series, path: Path) -> None:
+    """Persist team ratings as a two-column (team, elo) Parquet file."""
+    save_parquet(ratings.rename("elo").rename_axis("team").reset_index(), path)
+
+
+def load_elo_ratings(path: Path) -> pd.Series | None:
+    """Load team ratings saved by ``save_elo_ratings``, or None if missing."""
+    df = load_parquet(path)
+    if df is None:
+        return None
+    return df.set_index("team")["elo"]
+
+
+def preseason_ratings(
+    season: int, config: Config = DEFAULT_CONFIG
+) -> pd.Series | None:
+    """Starting ratings for a season, seeded from the previous one.
+
+    Loads the prior season's end-of-season ratings and regresses them to the
+    mean. Returns None if the prior season hasn't been built.
+    """
+    prior = load_elo_ratings(elo_ratings_path(season - 1, config))
+    if prior is None:
+        logger.info(f"No {season - 1} ELO ratings found; starting cold")
+        return None
+    logger.info(f"Seeding {season} ELO from {season - 1} end-of-season ratings")
+    return regress_to_mean(prior, config)
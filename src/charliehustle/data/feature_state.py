@@ -0,0 +1,289 @@
+"""Per-team feature state for incremental feature builds.
+
+After a season's feature matrix is built, the state each feature depends on
+(ELO ratings, rolling-window ring buffers, last game dates and streaks) is
+saved next to ``features.parquet``. A later build only featurizes games played
+after the checkpoint and appends them, instead of replaying the whole season.
+"""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from charliehustle.config import DEFAULT_CONFIG, Config
+from charliehustle.data.elo import (
+    encode_teams,
+    rename_carried_ratings,
+    run_elo,
+)
+from charliehustle.data.features import (
+    compute_pitcher_features,
+    compute_team_form,
+    drop_insufficient_history,
+)
+from charliehustle.data.rolling import rolling_features, run_rolling
+from charliehustle.data.schema import compact_features
+from charliehustle.data.team_games import (
+    attach_team_features,
+    final_streaks,
+    team_game_table,
+    team_rest_days,
+    team_streaks,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureState(BaseModel):
+    """Per-team state after the last game folded into a feature matrix."""
+
+    # Config values the state was built with; a mismatch forces a rebuild
+    params: dict[str, float]
+    min_games: int
+
+    last_date: datetime | None = None
+    last_date_game_ids: list[int] = []
+
+    teams: list[str] = []
+    elo: list[float] = []
+    games_played: list[int] = []
+    buffers: list[list[list[float]]] = []
+    last_game_dates: list[datetime | None] = []
+    streaks: list[int] = []
+
+    def elo_ratings(self) -> pd.Series:
+        """Current ratings indexed by team name."""
+        return pd.Series(self.elo, index=self.teams, name="elo")
+
+
+def state_params(config: Config) -> dict[str, float]:
+    """Config fields that feature values depend on."""
+    return {
+        "elo_k": config.elo_k,
+        "elo_home_advantage": config.elo_home_advantage,
+        "elo_mean": config.elo_mean,
+        "elo_reversion_factor": config.elo_reversion_factor,
+        "rolling_window": config.rolling_window,
+        "warm_start_min_games": config.warm_start_min_games,
+        "pitcher_window": config.pitcher_window,
+        "form_window": config.form_window,
+    }
+
+
+def feature_state_path(season: int, config: Config = DEFAULT_CONFIG) -> Path:
+    """Location of a season's feature state checkpoint."""
+    return config.data_dir / f"{season}" / "feature_state.json"
+
+
+def save_feature_state(state: FeatureState, path: Path) -> None:
+    """Write a feature state checkpoint as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(state.model_dump_json())
+    logger.debug(f"Saved feature state for {len(state.teams)} teams to {path}")
+
+
+def load_feature_state(
+    path: Path, config: Config = DEFAULT_CONFIG
+) -> FeatureState | None:
+    """Load a checkpoint, or None if missing or built with other settings."""
+    if not path.exists():
+        return None
+    state = FeatureState.model_validate_json(path.read_text())
+    if state.params != state_params(config):
+        logger.info(f"Feature state at {path} is stale (config changed)")
+        return None
+    return state
+
+
+def empty_feature_state(
+    config: Config = DEFAULT_CONFIG,
+    initial_elo: pd.Series | None = None,
+    min_games: int | None = None,
+) -> FeatureState:
+    """State before a season's first game, optionally with seeded ratings."""
+    if min_games is None:
+        min_games = config.rolling_window
+    state = FeatureState(params=state_params(config), min_games=min_games)
+    if initial_elo is not None:
+        n = len(initial_elo)
+        state.teams = [str(t) for t in initial_elo.index]
+        state.elo = [float(r) for r in initial_elo]
+        state.games_played = [0] * n
+        state.buffers = [[[0.0] * 3] * config.rolling_window] * n
+        state.last_game_dates = [None] * n
+        state.streaks = [0] * n
+    return state
+
+
+def unprocessed_games(games: pd.DataFrame, state: FeatureState) -> pd.DataFrame:
+    """Games not yet folded into ``state``."""
+    if state.last_date is None:
+        return games
+    last = pd.Timestamp(state.last_date)
+    is_new = (games["date"] > last) | (
+        (games["date"] == last)
+        & ~games["game_id"].isin(state.last_date_game_ids)
+    )
+    return games[is_new]
+
+
+def _advance_state(
+    games: pd.DataFrame,
+    state: FeatureState,
+    config: Config = DEFAULT_CONFIG,
+) -> tuple[pd.DataFrame, FeatureState]:
+    """Replay games played after ``state`` through the per-team engines.
+
+    Returns the new games with the ELO, rolling and per-team features (but
+    not the season-level starting-pitcher and team form columns, and without
+    dropping short histories) and the advanced state.
+    """
+    games = unprocessed_games(games, state)
+    window = config.rolling_window
+
+    prev = pd.Index(state.teams)
+    playing = (
+        pd.concat([games["home_team"], games["away_team"]]).astype(str).unique()
+    )
+    teams = prev.union(pd.Index(playing))
+    known = teams.get_indexer(prev)
+
+    ratings = np.full(len(teams), config.elo_mean)
+    count = np.zeros(len(teams), dtype=np.int64)
+    buf = np.zeros((len(teams), window, 3))
+    if len(prev):
+        ratings[known] = state.elo
+        count[known] = state.games_played
+        buf[known] = state.buffers
+    last_dates = pd.Series(
+        pd.to_datetime(state.last_game_dates), index=prev, dtype="datetime64[ns]"
+    )
+    streaks = pd.Series(state.streaks, index=prev, dtype=np.int64)
+
+    home_idx = teams.get_indexer(games["home_team"])
+    away_idx = teams.get_indexer(games["away_team"])
+    home_elo, away_elo, home_prob, ratings = run_elo(
+        home_idx,
+        away_idx,
+        games["home_win"].to_numpy(dtype=np.float64),
+        ratings,
+        k=config.elo_k,
+        hfa=config.elo_home_advantage,
+    )
+    sums, played = run_rolling(
+        home_idx,
+        away_idx,
+        games["home_score"].to_numpy(),
+        games["away_score"].to_numpy(),
+        games["home_win"].to_numpy(),
+        n_teams=len(teams),
+        windows=[window],
+        count=count,
+        buf=buf,
+    )
+
+    features = games.copy()
+    features["home_elo"] = home_elo
+    features["away_elo"] = away_elo
+    features["elo_home_prob"] = home_prob
+    for name, values in rolling_features(sums[:, :, 0], played, window).items():
+        features[f"home_{name}"] = values[:, 0]
+        features[f"away_{name}"] = values[:, 1]
+    features["home_games_played"] = played[:, 0]
+    features["away_games_played"] = played[:, 1]
+
+    table = team_game_table(games)
+    per_team = pd.concat(
+        [team_rest_days(table, last_dates), team_streaks(table, streaks)],
+        axis=1,
+    )
+    features = attach_team_features(features, table, per_team)
+
+    # Advance the checkpoint
+    last_dates = last_dates.reindex(teams)
+    streaks = streaks.reindex(teams, fill_value=0)
+    last_date = state.last_date
+    last_date_game_ids = state.last_date_game_ids
+    if len(games):
+        last_dates.update(table.groupby("team")["date"].last())
+        streaks.update(final_streaks(table, streaks))
+
+        newest = games["date"].max()
+        on_newest = games.loc[games["date"] == newest, "game_id"].tolist()
+        if last_date is not None and pd.Timestamp(last_date) == newest:
+            last_date_game_ids = last_date_game_ids + on_newest
+        else:
+            last_date, last_date_game_ids = newest, on_newest
+
+    state = state.model_copy(
+        update={
+            "last_date": last_date,
+            "last_date_game_ids": [int(g) for g in last_date_game_ids],
+            "teams": [str(t) for t in teams],
+            "elo": ratings.tolist(),
+            "games_played": count.tolist(),
+            "buffers": buf.tolist(),
+            "last_game_dates": [
+                None if pd.isna(d) else d.to_pydatetime() for d in last_dates
+            ],
+            "streaks": [int(s) for s in streaks],
+        }
+    )
+
+    return features, state
+
+
+def extend_feature_matrix(
+    games: pd.DataFrame,
+    state: FeatureState,
+    config: Config = DEFAULT_CONFIG,
+    pitcher_index: pd.DataFrame | None = None,
+    team_form: pd.DataFrame | None = None,
+) -> tuple[pd.DataFrame, FeatureState]:
+    """Featurize games played after ``state`` and advance the state.
+
+    Produces the same values ``build_feature_matrix`` would for these games
+    if it had replayed the season from the start. ``games`` is the season so
+    far: starting-pitcher stats and team form are cumulative sums over it,
+    which are cheap to recompute, so they are not kept in the state.
+    ``team_form`` is a prebuilt ``team_form_table(games)``.
+
+    Returns:
+        (features for new games with enough history, updated state)
+    """
+    features, state = _advance_state(games, state, config)
+    season = compute_team_form(
+        compute_pitcher_features(games, config, pitcher_index), config, team_form
+    )
+    season_columns = season.columns.difference(games.columns, sort=False)
+    features[season_columns] = season.loc[features.index, season_columns]
+
+    logger.info(f"Featurized {len(features)} new games")
+    features = drop_insufficient_history(features, state.min_games)
+    return compact_features(features), state
+
+
+def build_feature_state(
+    games: pd.DataFrame,
+    config: Config = DEFAULT_CONFIG,
+    initial_elo: pd.Series | None = None,
+    min_games: int | None = None,
+) -> FeatureState:
+    """State after replaying ``games`` from the start of a season.
+
+    ``initial_elo`` is relabelled for renamed franchises the same way
+    ``compute_elo_ratings`` does it.
+
+    Only the per-team engines are run; the season-level features, which the
+    state doesn't hold, are not computed.
+    """
+    if initial_elo is not None:
+        _, _, teams = encode_teams(games)
+        initial_elo = rename_carried_ratings(initial_elo, teams)
+    state = empty_feature_state(config, initial_elo, min_games)
+    _, state = _advance_state(games, state, config)
+    return state
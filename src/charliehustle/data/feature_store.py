@@ -0,0 +1,89 @@
+"""Memory-mapped feature matrix in Arrow IPC format.
+
+The matrix is stored as a single ``FixedSizeList<float32>`` column, one list
+per game. Arrow keeps the list values in one contiguous buffer, which is
+exactly the row-major (C order) float32 matrix, so a memory-mapped file can
+be handed to XGBoost as a NumPy view without copying or converting. Pages
+are read from disk on first touch, so loading is instant and the matrix
+takes no memory beyond the page cache. Worker processes don't share the
+mapping: ``cross_validate`` with ``jobs > 1`` sends each worker its own
+pickled copy of the arrays.
+
+The file is written uncompressed in one record batch, which is what makes
+the zero-copy view possible.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+logger = logging.getLogger(__name__)
+
+_FEATURES = "features"
+_TARGET = "target"
+_COLUMNS_KEY = b"columns"
+
+
+def save_feature_store(
+    X: np.ndarray, y: np.ndarray, columns: list[str], path: Path
+) -> None:
+    """Write a feature matrix and its labels as an Arrow IPC file.
+
+    Writes to a temporary file and renames it into place.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    if X.shape != (len(y), len(columns)):
+        raise ValueError(
+            f"Matrix of shape {X.shape} does not match {len(y)} labels"
+            f" and {len(columns)} columns"
+        )
+    table = pa.table(
+        {
+            _FEATURES: pa.FixedSizeListArray.from_arrays(
+                pa.array(X.reshape(-1)), len(columns)
+            ),
+            _TARGET: pa.array(np.asarray(y)),
+        }
+    ).replace_schema_metadata({_COLUMNS_KEY: json.dumps(columns)})
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(len(y), 1))
+    os.replace(tmp_path, path)
+    logger.debug(f"Saved {len(y)} x {len(columns)} feature store to {path}")
+
+
+def load_feature_store(
+    path: Path, columns: list[str]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Memory-map a feature store as (X, y) without copying.
+
+    ``X`` is a read-only, C-contiguous float32 view of the file.
+
+    Raises:
+        ValueError: If the store holds other columns than ``columns``.
+    """
+    table = ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    stored = json.loads(table.schema.metadata[_COLUMNS_KEY])
+    if stored != columns:
+        raise ValueError(
+            f"Feature store {path} has columns {stored}, expected {columns}"
+        )
+    features = _single_chunk(table.column(_FEATURES))
+    X = features.flatten().to_numpy(zero_copy_only=True)
+    y = _single_chunk(table.column(_TARGET)).to_numpy(zero_copy_only=True)
+    return X.reshape(len(features), len(columns)), y
+
+
+def _single_chunk(column: pa.ChunkedArray) -> pa.Array:
+    # Stores are written as one batch, so this never has to concatenate
+    if column.num_chunks == 1:
+        return column.chunk(0)
+    return column.combine_chunks()
@@ -1,11 +1,28 @@
 """Feature engineering for game prediction."""
 
 import logging
+from collections.abc import Sequence
 
 import numpy as np
 import pandas as pd
 
 from charliehustle.config import DEFAULT_CONFIG, Config
+from charliehustle.data.elo import (
+    encode_teams,
+    rename_carried_ratings,
+    run_elo,
+    season_starts,
+)
+from charliehustle.data.pitchers import pitcher_features
+from charliehustle.data.schema import compact_features
+from charliehustle.data.team_form import attach_team_form, team_form_table
+from charliehustle.data.team_games import (
+    attach_team_features,
+    team_game_table,
+    team_rest_days,
+    team_rolling_stats,
+    team_streaks,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +38,26 @@ FEATURE_COLUMNS = [
     "away_pyth_win_pct",
     "home_rest_days",
     "away_rest_days",
+    "home_streak",
+    "away_streak",
+    "home_sp_runs_allowed",
+    "away_sp_runs_allowed",
+    "home_sp_decision_pct",
+    "away_sp_decision_pct",
+    "home_sp_fip",
+    "away_sp_fip",
+    "home_sp_whip",
+    "away_sp_whip",
+    "home_season_runs_per_game",
+    "away_season_runs_per_game",
+    "home_season_runs_allowed_per_game",
+    "away_season_runs_allowed_per_game",
+    "home_recent_runs_per_game",
+    "away_recent_runs_per_game",
+    "home_recent_runs_allowed_per_game",
+    "away_recent_runs_allowed_per_game",
+    "home_bullpen_decision_pct",
+    "away_bullpen_decision_pct",
 ]
 
 TARGET_COLUMN = "home_win"
@@ -29,37 +66,40 @@ TARGET_COLUMN = "home_win"
 def compute_elo_ratings(
     games: pd.DataFrame,
     config: Config = DEFAULT_CONFIG,
+    initial_ratings: pd.Series | None = None,
 ) -> pd.DataFrame:
     """Compute pre-game ELO ratings for every game.
 
+    Ratings in ``initial_ratings`` saved under a franchise's old name are
+    moved to its new one (``rename_carried_ratings``); teams still missing
+    start at ``config.elo_mean``. If the games span several seasons, ratings
+    are regressed to the mean by ``config.elo_reversion_factor`` at each
+    season boundary. Seasons are read from a season or date column; games
+    with neither are treated as one season.
+
     Adds columns: home_elo, away_elo, elo_home_prob.
     """
-    k = config.elo_k
-    hfa = config.elo_home_advantage
-    mean = config.elo_mean
-
-    teams = set(games["home_team"]) | set(games["away_team"])
-    elo: dict[str, float] = {team: mean for team in teams}
-
-    home_elos: list[float] = []
-    away_elos: list[float] = []
-    home_probs: list[float] = []
-
-    for _, game in games.iterrows():
-        home, away = game["home_team"], game["away_team"]
-        h_elo, a_elo = elo[home], elo[away]
-
-        home_elos.append(h_elo)
-        away_elos.append(a_elo)
-
-        # Expected outcome with home-field advantage
-        exp_home = 1 / (1 + 10 ** ((a_elo - h_elo - hfa) / 400))
-        home_probs.append(exp_home)
+    home_idx, away_idx, teams = encode_teams(games)
+    ratings = np.full(len(teams), config.elo_mean)
+    if initial_ratings is not None:
+        ratings = (
+            rename_carried_ratings(initial_ratings, teams)
+            .reindex(teams)
+            .fillna(config.elo_mean)
+            .to_numpy()
+        )
 
-        # Update ratings
-        actual_home = float(game["home_win"])
-        elo[home] = h_elo + k * (actual_home - exp_home)
-        elo[away] = a_elo + k * ((1 - actual_home) - (1 - exp_home))
+    home_elos, away_elos, home_probs, _ = run_elo(
+        home_idx,
+        away_idx,
+        games["home_win"].to_numpy(dtype=np.float64),
+        ratings,
+        k=config.elo_k,
+        hfa=config.elo_home_advantage,
+        new_season=season_starts(games),
+        reversion=config.elo_reversion_factor,
+        mean=config.elo_mean,
+    )
 
     games = games.copy()
     games["home_elo"] = home_elos
@@ -71,135 +111,134 @@ def compute_elo_ratings(
 def compute_team_rolling_stats(
     games: pd.DataFrame,
     window: int = 30,
+    extra_windows: Sequence[int] = (),
+    table: pd.DataFrame | None = None,
 ) -> pd.DataFrame:
     """Compute rolling team stats and attach them as pre-game features.
 
     For each game, features represent team state BEFORE that game was played.
+    Stats over ``window`` games are added unsuffixed (e.g. home_win_pct); each
+    of ``extra_windows`` is added with a ``_<window>`` suffix
+    (e.g. home_win_pct_10). Pass ``table`` to reuse a prebuilt
+    ``team_game_table(games)``.
     """
-    teams = set(games["home_team"]) | set(games["away_team"])
-    team_logs: dict[str, list[dict]] = {t: [] for t in teams}
-
-    # First pass: build per-team game logs in order
-    for _, game in games.iterrows():
-        home, away = game["home_team"], game["away_team"]
-        team_logs[home].append(
-            {
-                "runs_scored": game["home_score"],
-                "runs_allowed": game["away_score"],
-                "won": game["home_win"],
-            }
-        )
-        team_logs[away].append(
-            {
-                "runs_scored": game["away_score"],
-                "runs_allowed": game["home_score"],
-                "won": 1 - game["home_win"],
-            }
-        )
+    if table is None:
+        table = team_game_table(games)
+    windows = [window, *(w for w in extra_windows if w != window)]
+    return attach_team_features(games, table, team_rolling_stats(table, windows))
 
-    # Second pass: compute features using history available before each game
-    team_game_idx: dict[str, int] = {t: 0 for t in teams}
-    team_histories: dict[str, list[dict]] = {t: [] for t in teams}
-
-    features: dict[str, list] = {
-        "home_win_pct": [],
-        "away_win_pct": [],
-        "home_run_diff": [],
-        "away_run_diff": [],
-        "home_pyth_win_pct": [],
-        "away_pyth_win_pct": [],
-        "home_games_played": [],
-        "away_games_played": [],
-    }
-
-    for _, game in games.iterrows():
-        home, away = game["home_team"], game["away_team"]
-
-        for prefix, team in [("home", home), ("away", away)]:
-            history = team_histories[team]
-            n = len(history)
-
-            if n == 0:
-                features[f"{prefix}_win_pct"].append(0.5)
-                features[f"{prefix}_run_diff"].append(0.0)
-                features[f"{prefix}_pyth_win_pct"].append(0.5)
-                features[f"{prefix}_games_played"].append(0)
-            else:
-                recent = history[-window:]
-                wins = sum(g["won"] for g in recent)
-                rs = sum(g["runs_scored"] for g in recent)
-                ra = sum(g["runs_allowed"] for g in recent)
-
-                features[f"{prefix}_win_pct"].append(wins / len(recent))
-                features[f"{prefix}_run_diff"].append((rs - ra) / len(recent))
-
-                # Pythagorean expected win% (exponent 1.83)
-                if rs + ra > 0:
-                    pyth = rs**1.83 / (rs**1.83 + ra**1.83)
-                else:
-                    pyth = 0.5
-                features[f"{prefix}_pyth_win_pct"].append(pyth)
-                features[f"{prefix}_games_played"].append(n)
-
-            # Add this game to history AFTER computing features
-            log = team_logs[team][team_game_idx[team]]
-            team_histories[team].append(log)
-            team_game_idx[team] += 1
 
-    games = games.copy()
-    for col, values in features.items():
-        games[col] = values
+def compute_rest_days(
+    games: pd.DataFrame,
+    table: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Compute days of rest for each team before each game."""
+    if table is None:
+        table = team_game_table(games)
+    return attach_team_features(games, table, team_rest_days(table).to_frame())
 
-    return games
 
+def compute_streaks(
+    games: pd.DataFrame,
+    table: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Compute each team's win (+) or loss (-) streak entering each game."""
+    if table is None:
+        table = team_game_table(games)
+    return attach_team_features(games, table, team_streaks(table).to_frame())
 
-def compute_rest_days(games: pd.DataFrame) -> pd.DataFrame:
-    """Compute days of rest for each team before each game."""
-    last_game_date: dict[str, pd.Timestamp] = {}
-    home_rest: list[int] = []
-    away_rest: list[int] = []
-
-    for _, game in games.iterrows():
-        home, away = game["home_team"], game["away_team"]
-        game_date = game["date"]
-
-        for rest_list, team in [(home_rest, home), (away_rest, away)]:
-            if team in last_game_date:
-                delta = (game_date - last_game_date[team]).days
-                rest_list.append(min(delta, 7))  # Cap at 7 for all-star break etc.
-            else:
-                rest_list.append(3)  # Default for season opener
-            last_game_date[team] = game_date
 
-    games = games.copy()
-    games["home_rest_days"] = home_rest
-    games["away_rest_days"] = away_rest
-    return games
+def compute_pitcher_features(
+    games: pd.DataFrame,
+    config: Config = DEFAULT_CONFIG,
+    pitcher_index: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Attach pre-game stats for each game's probable starting pitchers.
 
+    ``pitcher_index`` is the previous season's ``load_pitcher_index``; without
+    it the sp_fip and sp_whip columns are NaN. See
+    ``charliehustle.data.pitchers``.
+    """
+    pitching = pitcher_features(games, pitcher_index, config.pitcher_window)
+    return pd.concat(
+        [games.drop(columns=pitching.columns, errors="ignore"), pitching], axis=1
+    )
 
-def build_feature_matrix(
+
+def compute_team_form(
     games: pd.DataFrame,
     config: Config = DEFAULT_CONFIG,
+    form: pd.DataFrame | None = None,
 ) -> pd.DataFrame:
-    """Build complete feature matrix from raw game data.
+    """Attach each team's form as of the day before each game.
 
-    Computes ELO ratings, rolling team stats, and rest days.
-    Drops early-season games with insufficient history.
+    Pass ``form`` to reuse a prebuilt ``team_form_table(games)``. See
+    ``charliehustle.data.team_form``.
     """
-    logger.info(f"Building features for {len(games)} games...")
+    if form is None:
+        form = team_form_table(games, config.form_window)
+    return attach_team_form(games, form)
+
+
+def min_history_games(config: Config, warm_start: bool) -> int:
+    """Games each team needs before its rows are kept in the feature matrix.
+
+    A cold start needs a full rolling window; when ELO is seeded from a
+    previous season only ``config.warm_start_min_games`` are required.
+    """
+    if not warm_start:
+        return config.rolling_window
+    return min(config.warm_start_min_games, config.rolling_window)
 
-    games = compute_elo_ratings(games, config)
-    games = compute_team_rolling_stats(games, config.rolling_window)
-    games = compute_rest_days(games)
 
-    # Drop games where either team has played fewer than rolling_window games
-    min_games = config.rolling_window
-    games = games[
+def drop_insufficient_history(games: pd.DataFrame, min_games: int) -> pd.DataFrame:
+    """Drop games where either team has played fewer than ``min_games``."""
+    return games[
         (games["home_games_played"] >= min_games)
         & (games["away_games_played"] >= min_games)
     ].copy()
 
+
+def build_feature_matrix(
+    games: pd.DataFrame,
+    config: Config = DEFAULT_CONFIG,
+    initial_elo: pd.Series | None = None,
+    pitcher_index: pd.DataFrame | None = None,
+    team_form: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Build complete feature matrix from raw game data.
+
+    Computes ELO ratings, rolling team stats, rest days, streaks,
+    starting-pitcher stats (using ``pitcher_index`` for last season's) and
+    team form (from ``team_form``, a prebuilt ``team_form_table(games)``,
+    if given).
+    Drops early-season games with insufficient history. When ``initial_elo``
+    carries ratings over from a previous season, ELO is already warm and only
+    ``config.warm_start_min_games`` games are needed instead of a full
+    rolling window.
+
+    The matrix uses the compact types from ``charliehustle.data.schema``:
+    features are computed in float64 and stored as float32.
+    """
+    logger.info(f"Building features for {len(games)} games...")
+
+    games = compute_elo_ratings(games, config, initial_ratings=initial_elo)
+
+    # Per-team features share one long-format table
+    table = team_game_table(games)
+    games = compute_team_rolling_stats(
+        games, config.rolling_window, table=table
+    )
+    games = compute_rest_days(games, table=table)
+    games = compute_streaks(games, table=table)
+    games = compute_pitcher_features(games, config, pitcher_index)
+    games = compute_team_form(games, config, team_form)
+
+    games = drop_insufficient_history(
+        games, min_history_games(config, warm_start=initial_elo is not None)
+    )
+
     logger.info(
         f"Feature matrix: {len(games)} games with {len(FEATURE_COLUMNS)} features"
     )
-    return games
+    return compact_features(games)
@@ -0,0 +1,299 @@
+"""Multi-season build pipeline: fetch games, seed ELO, build features.
+
+Fetching is network-bound and runs in a thread pool; feature building is
+CPU-bound and runs in a process pool. Seasons depend on each other only
+through preseason ELO ratings, which are cheap to chain in the main process
+once every season's games are in hand, so the expensive builds are
+independent. A failure in one season is reported without stopping the rest.
+Each season's starting-pitcher features use the previous season's FanGraphs
+pitching stats when they have been fetched.
+"""
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+
+import pandas as pd
+
+from charliehustle.config import DEFAULT_CONFIG, Config
+from charliehustle.data.cache import (
+    artifact_cache,
+    frame_digest,
+    record_key,
+    recorded_key,
+    stage_key,
+)
+from charliehustle.data.dataset import features_path, save_features
+from charliehustle.data.elo import (
+    elo_ratings_path,
+    final_elo_ratings,
+    preseason_ratings,
+    regress_to_mean,
+    save_elo_ratings,
+)
+from charliehustle.data.feature_state import (
+    build_feature_state,
+    extend_feature_matrix,
+    feature_state_path,
+    load_feature_state,
+    save_feature_state,
+    state_params,
+)
+from charliehustle.data.features import (
+    build_feature_matrix,
+    compute_elo_ratings,
+    min_history_games,
+)
+from charliehustle.data.pitchers import load_pitcher_index
+from charliehustle.data.schema import compact_features
+from charliehustle.data.sources import fetch_pitching_stats, fetch_season_games
+from charliehustle.data.storage import load_parquet, save_parquet
+from charliehustle.data.team_form import team_form_path, team_form_table
+
+logger = logging.getLogger(__name__)
+
+
+def build_season(
+    season: int,
+    games: pd.DataFrame,
+    config: Config = DEFAULT_CONFIG,
+    initial_elo: pd.Series | None = None,
+    rebuild: bool = False,
+    pitcher_index: pd.DataFrame | None = None,
+) -> int:
+    """Featurize one season and save its features, state, ratings and form.
+
+    Outputs are keyed in the artifact cache by the games, the preseason
+    ratings, the previous season's pitcher index and the feature settings.
+    If the saved outputs already match the key nothing is done, and if the
+    cache has them they are restored. Otherwise, if the season has saved
+    feature state from the same preseason ratings and pitcher index (and
+    ``rebuild`` is False), only games after the checkpoint are featurized and
+    appended.
+
+    Returns the number of rows in the saved feature matrix.
+    """
+    out_path = features_path(season, config)
+    state_path = feature_state_path(season, config)
+    outputs = {
+        out_path.name: out_path,
+        state_path.name: state_path,
+        "elo_ratings.parquet": elo_ratings_path(season, config),
+        "team_form.parquet": team_form_path(season, config),
+    }
+    cache = artifact_cache(config)
+    inputs = {
+        "games": frame_digest(games),
+        "initial_elo": frame_digest(initial_elo),
+        "pitcher_index": frame_digest(pitcher_index),
+    }
+    key = stage_key("features", state_params(config), inputs)
+    previous = recorded_key(out_path)
+
+    if not rebuild:
+        if previous == key:
+            logger.info(f"{season} features are up to date")
+            return len(load_parquet(out_path))
+        if cache.restore(key, outputs):
+            record_key(out_path, key)
+            logger.info(f"Restored {season} features from the artifact cache")
+            return len(load_parquet(out_path))
+
+    state = None if rebuild else load_feature_state(state_path, config)
+    previous_entry = cache.entry(previous)
+    if previous_entry is None or any(
+        previous_entry.inputs.get(name) != str(inputs[name])
+        for name in ("initial_elo", "pitcher_index")
+    ):
+        # Appending is only valid on top of the same preseason ratings and
+        # pitcher index, which every saved row's features depend on
+        state = None
+    existing = load_parquet(out_path) if state is not None else None
+    form = team_form_table(games, config.form_window)
+
+    if existing is not None:
+        new_features, state = extend_feature_matrix(
+            games, state, config, pitcher_index, team_form=form
+        )
+        features = compact_features(
+            pd.concat([existing, new_features], ignore_index=True)
+        )
+        logger.info(f"Added {len(new_features)} new {season} game features")
+    else:
+        features = build_feature_matrix(
+            games,
+            config,
+            initial_elo=initial_elo,
+            pitcher_index=pitcher_index,
+            team_form=form,
+        )
+        state = build_feature_state(
+            games,
+            config,
+            initial_elo=initial_elo,
+            min_games=min_history_games(config, initial_elo is not None),
+        )
+
+    save_features(features, out_path)
+    save_feature_state(state, state_path)
+    save_elo_ratings(state.elo_ratings(), outputs["elo_ratings.parquet"])
+    save_parquet(form, outputs["team_form.parquet"])
+    cache.put(key, "features", outputs, state_params(config), inputs)
+    record_key(out_path, key)
+    return len(features)
+
+
+def preseason_chain(
+    games_by_season: dict[int, pd.DataFrame],
+    config: Config = DEFAULT_CONFIG,
+) -> dict[int, pd.Series | None]:
+    """Starting ELO ratings for each season, chained in season order.
+
+    A season whose predecessor is in ``games_by_season`` is seeded from that
+    season's end-of-season ratings; otherwise from ratings saved on disk.
+    """
+    seeds: dict[int, pd.Series | None] = {}
+    final: dict[int, pd.Series] = {}
+    for season in sorted(games_by_season):
+        if season - 1 in final:
+            seeds[season] = regress_to_mean(final[season - 1], config)
+        else:
+            seeds[season] = preseason_ratings(season, config)
+        games = compute_elo_ratings(
+            games_by_season[season], config, initial_ratings=seeds[season]
+        )
+        final[season] = final_elo_ratings(games, config)
+    return seeds
+
+
+def _run(
+    executor: Executor | None,
+    fn: Callable,
+    tasks: dict[int, tuple],
+) -> dict[int, Future]:
+    """Submit one call per season, or run them in order without an executor."""
+    futures: dict[int, Future] = {}
+    for season, args in tasks.items():
+        if executor is not None:
+            futures[season] = executor.submit(fn, *args)
+            continue
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+        futures[season] = future
+    return futures
+
+
+def build_seasons(
+    seasons: list[int],
+    config: Config = DEFAULT_CONFIG,
+    jobs: int = 1,
+    update: bool = False,
+    rebuild: bool = False,
+    pitching_stats: bool = False,
+    echo: Callable[[str], None] = print,
+) -> dict[int, Exception]:
+    """Fetch and build several seasons, optionally in parallel.
+
+    Args:
+        seasons: Seasons to build.
+        config: Supplies the data directory and feature settings.
+        jobs: Number of concurrent fetches and builds (1 runs in order, in
+            this process).
+        update: Fetch games played since the last fetch for each season.
+        rebuild: Ignore saved feature state.
+        pitching_stats: Also fetch each previous season's FanGraphs pitching
+            stats. Starting-pitcher features use them whenever they are
+            cached, whether or not this is set.
+        echo: Progress callback, called with one line per event.
+
+    Returns:
+        Errors by season for seasons that failed to fetch or build.
+    """
+    seasons = sorted(set(seasons))
+    failures: dict[int, Exception] = {}
+
+    def _collect(
+        futures: dict[int, Future],
+        stage: str,
+        report: Callable[[int, object], str],
+    ) -> dict[int, object]:
+        """Gather results as they finish, recording failures per season."""
+        by_future = {f: s for s, f in futures.items()}
+        results = {}
+        for future in as_completed(by_future):
+            season = by_future[future]
+            try:
+                results[season] = future.result()
+            except Exception as exc:
+                logger.debug(f"{season} {stage} failed", exc_info=True)
+                failures[season] = exc
+                echo(f"[{season}] {stage} failed: {exc}")
+            else:
+                echo(f"[{season}] {report(season, results[season])}")
+        return results
+
+    fetch_pool = ThreadPoolExecutor(jobs) if jobs > 1 else None
+    try:
+        fetched = _collect(
+            _run(
+                fetch_pool,
+                fetch_season_games,
+                {s: (s, config, update) for s in seasons},
+            ),
+            "fetch",
+            lambda season, games: f"Fetched {len(games)} games",
+        )
+        if pitching_stats:
+            futures = _run(
+                fetch_pool,
+                fetch_pitching_stats,
+                {s - 1: (s - 1, config) for s in fetched},
+            )
+            for season, future in sorted(futures.items()):
+                # Not a build failure: the next season just gets no
+                # sp_fip/sp_whip
+                try:
+                    stats = future.result()
+                except Exception as exc:
+                    logger.debug(f"{season} pitching stats failed", exc_info=True)
+                    echo(f"[{season}] pitching stats fetch failed: {exc}")
+                else:
+                    echo(f"[{season}] Fetched {len(stats)} pitchers' stats")
+    finally:
+        if fetch_pool is not None:
+            fetch_pool.shutdown()
+
+    games_by_season = {s: fetched[s] for s in sorted(fetched)}
+    seeds = preseason_chain(games_by_season, config)
+    pitchers = {s: load_pitcher_index(s - 1, config) for s in games_by_season}
+
+    build_pool = ProcessPoolExecutor(jobs) if jobs > 1 else None
+    try:
+        _collect(
+            _run(
+                build_pool,
+                build_season,
+                {
+                    s: (s, games, config, seeds[s], rebuild, pitchers[s])
+                    for s, games in games_by_season.items()
+                },
+            ),
+            "build",
+            lambda season, n: (
+                f"Saved {n} game features to {features_path(season, config)}"
+            ),
+        )
+    finally:
+        if build_pool is not None:
+            build_pool.shutdown()
+
+    return failures
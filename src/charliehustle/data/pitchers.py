@@ -0,0 +1,243 @@
+"""Starting-pitcher features.
+
+Each game's probable starters (from the schedule) are matched by normalized
+name against two sources that are both known before first pitch:
+
+* A pitcher index built once per season from the FanGraphs pitching stats
+  (``fetch_pitching_stats``). Features use the previous season's index, since
+  the current season's FanGraphs table covers games not yet played.
+* The season's own game log: runs the starter's team allowed in their previous
+  starts and their win-loss record in earlier decisions (``winning_pitcher`` /
+  ``losing_pitcher``). Each game only sees games before it in the same
+  season (see ``season_starts``).
+
+Names are factorized once and every lookup is a sort plus ``searchsorted``
+over integer keys, so nothing loops over games in Python.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from charliehustle.config import DEFAULT_CONFIG, Config
+from charliehustle.data.elo import season_numbers
+from charliehustle.data.storage import load_parquet, save_parquet
+
+logger = logging.getLogger(__name__)
+
+STARTER_COLUMNS = ["home_probable_pitcher", "away_probable_pitcher"]
+
+# FanGraphs columns kept in the pitcher index, by feature name
+INDEX_STATS = {"fip": "FIP", "whip": "WHIP"}
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Lowercase ASCII names without punctuation, for matching across sources.
+
+    Missing names become "". Each distinct name is only normalized once.
+    """
+    codes, uniques = pd.factorize(names, use_na_sentinel=True)
+    keys = (
+        pd.Series(uniques, dtype=object)
+        .astype(str)
+        .str.normalize("NFKD")
+        .str.encode("ascii", errors="ignore")
+        .str.decode("ascii")
+        .str.lower()
+        .str.replace(r"[^a-z0-9 ]", "", regex=True)
+        .str.split()
+        .str.join(" ")
+        .to_numpy(dtype=object)
+    )
+    keys = np.append(keys, "")
+    return pd.Series(keys[codes], index=names.index, dtype=str)
+
+
+def build_pitcher_index(stats: pd.DataFrame) -> pd.DataFrame:
+    """Season stats indexed by normalized pitcher name.
+
+    Returns a frame indexed by ``key`` with pitcher_id (FanGraphs ``IDfg``),
+    ip and the ``INDEX_STATS`` columns. When two pitchers share a name the
+    one with more innings is kept.
+    """
+    index = pd.DataFrame(
+        {
+            "key": normalize_names(stats["Name"]),
+            "pitcher_id": stats["IDfg"] if "IDfg" in stats else -1,
+            "ip": stats["IP"].astype(np.float32),
+            **{
+                name: stats[column].astype(np.float32)
+                for name, column in INDEX_STATS.items()
+            },
+        }
+    )
+    return (
+        index[index["key"] != ""]
+        .sort_values("ip", ascending=False, kind="stable")
+        .drop_duplicates("key")
+        .set_index("key")
+        .sort_index()
+    )
+
+
+def pitcher_index_path(season: int, config: Config = DEFAULT_CONFIG) -> Path:
+    """Location of a season's prebuilt pitcher index."""
+    return config.data_dir / f"{season}" / "pitcher_index.parquet"
+
+
+def load_pitcher_index(
+    season: int, config: Config = DEFAULT_CONFIG
+) -> pd.DataFrame | None:
+    """The season's pitcher index, building it from cached FanGraphs stats.
+
+    Returns None if the season's pitching stats were never fetched. The
+    index is rebuilt when the stats file is newer than it.
+    """
+    stats_path = config.data_dir / f"{season}" / "pitching_stats.parquet"
+    path = pitcher_index_path(season, config)
+    if not stats_path.exists():
+        return None
+    if path.exists() and os.path.getmtime(path) >= os.path.getmtime(stats_path):
+        return load_parquet(path).set_index("key")
+
+    index = build_pitcher_index(load_parquet(stats_path))
+    save_parquet(index.reset_index(), path)
+    logger.info(f"Indexed {len(index)} {season} pitchers")
+    return index
+
+
+def _names(games: pd.DataFrame, column: str) -> pd.Series:
+    """A name column, or all-missing for games cached before it existed."""
+    if column in games.columns:
+        return games[column]
+    return pd.Series(None, index=games.index, dtype=object)
+
+
+def _group_start(sorted_keys: np.ndarray) -> np.ndarray:
+    """Position of the first row of each row's group in sorted keys."""
+    new_group = np.ones(len(sorted_keys), dtype=bool)
+    new_group[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    return np.maximum.accumulate(np.where(new_group, np.arange(len(new_group)), 0))
+
+
+def _prior_starts(
+    pitcher: np.ndarray, order: np.ndarray, runs_allowed: np.ndarray, window: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Starts before each one and mean runs allowed over the last ``window``."""
+    n = len(pitcher)
+    sort_idx = np.lexsort((order, pitcher))
+    start = _group_start(pitcher[sort_idx])
+    position = np.arange(n) - start
+    cumsum = np.concatenate([[0.0], np.cumsum(runs_allowed[sort_idx])])
+    count = np.minimum(position, window)
+    sums = cumsum[np.arange(n)] - cumsum[np.arange(n) - count]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, sums / count, np.nan)
+
+    starts = np.empty(n, dtype=np.int64)
+    runs = np.empty(n)
+    starts[sort_idx] = position
+    runs[sort_idx] = mean
+    return starts, runs
+
+
+def _prior_decision_pct(
+    pitcher: np.ndarray,
+    order: np.ndarray,
+    decided: np.ndarray,
+    decided_order: np.ndarray,
+    won: np.ndarray,
+) -> np.ndarray:
+    """Share of each pitcher's decisions before ``order`` that were wins."""
+    n_games = max(int(order.max(initial=0)), int(decided_order.max(initial=0))) + 1
+    keys = decided.astype(np.int64) * n_games + decided_order
+    sort_idx = np.argsort(keys, kind="stable")
+    keys = keys[sort_idx]
+    wins = np.concatenate([[0], np.cumsum(won[sort_idx])])
+
+    query = pitcher.astype(np.int64) * n_games
+    first = np.searchsorted(keys, query, side="left")
+    before = np.searchsorted(keys, query + order, side="left")
+    decisions = before - first
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(decisions > 0, (wins[before] - wins[first]) / decisions, np.nan)
+
+
+def pitcher_features(
+    games: pd.DataFrame,
+    index: pd.DataFrame | None = None,
+    window: int = 5,
+) -> pd.DataFrame:
+    """Pre-game features for each game's probable starters.
+
+    ``games`` must be in date order and include every earlier game of the
+    season, since in-season stats are accumulated over it. They start over
+    with each season in ``games``.
+
+    Returns a frame aligned with ``games`` with, for ``home_`` and ``away_``:
+        sp_starts: Starts made earlier in the season.
+        sp_runs_allowed: Runs the team allowed per start over their last
+            ``window`` starts.
+        sp_decision_pct: Wins / (wins + losses) in earlier decisions.
+        sp_fip, sp_whip: Stats from ``index`` (the previous season).
+    Unknown starters get 0 starts and NaN for the rest.
+    """
+    n = len(games)
+    order = np.arange(n)
+    starters = pd.concat(
+        [_names(games, c).astype(object) for c in STARTER_COLUMNS],
+        ignore_index=True,
+    )
+    decided = pd.concat(
+        [
+            _names(games, "winning_pitcher").astype(object),
+            _names(games, "losing_pitcher").astype(object),
+        ],
+        ignore_index=True,
+    )
+    keys = normalize_names(pd.concat([starters, decided], ignore_index=True))
+    codes, _ = pd.factorize(keys)
+    known = (keys != "").to_numpy()
+    # Key in-season stats by (pitcher, season), so each season starts afresh
+    seasons = np.tile(season_numbers(games), 4)
+    codes = codes * (seasons.max(initial=0) + 1) + seasons
+    starter_codes, decided_codes = codes[: 2 * n], codes[2 * n :]
+    starter_known, decided_known = known[: 2 * n], known[2 * n :]
+
+    home_score = games["home_score"].to_numpy(dtype=np.float64)
+    away_score = games["away_score"].to_numpy(dtype=np.float64)
+    starts, runs_allowed = _prior_starts(
+        starter_codes,
+        np.tile(order, 2),
+        np.concatenate([away_score, home_score]),
+        window,
+    )
+    decision_pct = _prior_decision_pct(
+        starter_codes,
+        np.tile(order, 2),
+        decided_codes[decided_known],
+        np.tile(order, 2)[decided_known],
+        np.repeat([1, 0], n)[decided_known],
+    )
+
+    columns = {
+        "sp_starts": np.where(starter_known, starts, 0),
+        "sp_runs_allowed": np.where(starter_known, runs_allowed, np.nan),
+        "sp_decision_pct": np.where(starter_known, decision_pct, np.nan),
+    }
+    for name in INDEX_STATS:
+        if index is None:
+            columns[f"sp_{name}"] = np.full(2 * n, np.nan)
+        else:
+            columns[f"sp_{name}"] = (
+                index[name].reindex(keys[: 2 * n]).to_numpy(dtype=np.float64)
+            )
+
+    out = pd.DataFrame(index=games.index)
+    for name, values in columns.items():
+        out[f"home_{name}"] = values[:n]
+        out[f"away_{name}"] = values[n:]
+    return out
@@ -0,0 +1,256 @@
+"""Incremental rolling-window team stats.
+
+Each team keeps a fixed-size circular buffer of its recent games and a running
+sum per window, so every game costs O(number of windows) instead of re-summing
+the whole window. Several window sizes share one buffer and one pass. As in
+``charliehustle.data.elo``, the loop is compiled when numba is installed and
+otherwise runs over plain Python lists.
+"""
+
+import logging
+from collections.abc import Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional speedup
+    njit = None
+
+# Per-side stats tracked in the buffers, in storage order
+_RS, _RA, _WON = 0, 1, 2
+_N_STATS = 3
+
+PYTH_EXPONENT = 1.83
+
+
+def _rolling_loop(
+    home_idx,
+    away_idx,
+    home_score,
+    away_score,
+    home_won,
+    windows,
+    max_window: int,
+    count,
+    buf,
+    sums,
+    out_sums,
+    out_played,
+) -> None:
+    """Push every game through the per-team ring buffers.
+
+    Flat layouts, so the same code runs on lists or compiled arrays:
+        buf[(team * max_window + slot) * 3 + stat]
+        sums[(team * n_windows + j) * 3 + stat]
+        out_sums[((game * 2 + side) * n_windows + j) * 3 + stat]
+        out_played[game * 2 + side]
+    """
+    n_windows = len(windows)
+    for i in range(len(home_idx)):
+        for side in range(2):
+            if side == 0:
+                team = home_idx[i]
+                rs = home_score[i]
+                ra = away_score[i]
+                won = home_won[i]
+            else:
+                team = away_idx[i]
+                rs = away_score[i]
+                ra = home_score[i]
+                won = 1 - home_won[i]
+
+            c = count[team]
+            row = i * 2 + side
+            out_played[row] = c
+
+            # Record state BEFORE this game
+            for j in range(n_windows):
+                s = (team * n_windows + j) * _N_STATS
+                o = (row * n_windows + j) * _N_STATS
+                out_sums[o + _RS] = sums[s + _RS]
+                out_sums[o + _RA] = sums[s + _RA]
+                out_sums[o + _WON] = sums[s + _WON]
+
+            # Evict the game falling out of each window, then add this one
+            for j in range(n_windows):
+                w = windows[j]
+                s = (team * n_windows + j) * _N_STATS
+                if c >= w:
+                    old = (team * max_window + (c - w) % max_window) * _N_STATS
+                    sums[s + _RS] -= buf[old + _RS]
+                    sums[s + _RA] -= buf[old + _RA]
+                    sums[s + _WON] -= buf[old + _WON]
+                sums[s + _RS] += rs
+                sums[s + _RA] += ra
+                sums[s + _WON] += won
+
+            slot = (team * max_window + c % max_window) * _N_STATS
+            buf[slot + _RS] = rs
+            buf[slot + _RA] = ra
+            buf[slot + _WON] = won
+            count[team] = c + 1
+
+
+_rolling_loop_compiled = (
+    njit(cache=True)(_rolling_loop) if njit is not None else None
+)
+
+
+def run_rolling(
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    home_score: np.ndarray,
+    away_score: np.ndarray,
+    home_won: np.ndarray,
+    n_teams: int,
+    windows: Sequence[int],
+    count: np.ndarray | None = None,
+    buf: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute pre-game rolling sums for several windows in one pass.
+
+    Pass ``count`` and ``buf`` to resume from an earlier run; they are updated
+    in place, so after the call they hold the state following the last game.
+
+    Args:
+        home_idx: Integer home team ID per game.
+        away_idx: Integer away team ID per game.
+        home_score: Home runs per game.
+        away_score: Away runs per game.
+        home_won: 1 if the home team won, else 0.
+        n_teams: Number of distinct team IDs.
+        windows: Window sizes, in games.
+        count: Games played so far per team, shape (n_teams,).
+        buf: Ring buffers of shape (n_teams, max(windows), 3) holding runs
+            scored, runs allowed and wins; game ``c`` of a team is stored in
+            slot ``c % max(windows)``.
+
+    Returns:
+        (sums, games_played) where ``sums`` has shape
+        (n_games, 2, n_windows, 3) holding runs scored, runs allowed and wins
+        over the last ``window`` games for the home (0) and away (1) side, and
+        ``games_played`` has shape (n_games, 2).
+    """
+    n = len(home_idx)
+    windows = np.asarray(windows, dtype=np.int64)
+    n_windows = len(windows)
+    max_window = int(windows.max())
+
+    args = [
+        np.asarray(home_idx, dtype=np.int64),
+        np.asarray(away_idx, dtype=np.int64),
+        np.asarray(home_score, dtype=np.float64),
+        np.asarray(away_score, dtype=np.float64),
+        np.asarray(home_won, dtype=np.float64),
+        windows,
+    ]
+    if count is None:
+        count = np.zeros(n_teams, dtype=np.int64)
+    if buf is None:
+        buf = np.zeros((n_teams, max_window, _N_STATS))
+    sums = _window_sums(count, buf, windows).reshape(-1)
+    flat_buf = buf.reshape(-1)  # A view, so the kernel updates ``buf``
+    out_sums = np.empty(n * 2 * n_windows * _N_STATS)
+    out_played = np.empty(n * 2, dtype=np.int64)
+
+    if _rolling_loop_compiled is not None:
+        _rolling_loop_compiled(
+            *args, max_window, count, flat_buf, sums, out_sums, out_played
+        )
+    else:
+        # Pure-Python fallback: lists avoid per-element NumPy scalar boxing
+        out_sums_list = out_sums.tolist()
+        out_played_list = out_played.tolist()
+        count_list = count.tolist()
+        buf_list = flat_buf.tolist()
+        _rolling_loop(
+            *[a.tolist() for a in args],
+            max_window,
+            count_list,
+            buf_list,
+            sums.tolist(),
+            out_sums_list,
+            out_played_list,
+        )
+        out_sums = np.array(out_sums_list)
+        out_played = np.array(out_played_list, dtype=np.int64)
+        count[:] = count_list
+        flat_buf[:] = buf_list
+
+    return (
+        out_sums.reshape(n, 2, n_windows, _N_STATS),
+        out_played.reshape(n, 2),
+    )
+
+
+def _window_sums(
+    count: np.ndarray, buf: np.ndarray, windows: np.ndarray
+) -> np.ndarray:
+    """Sum the last ``w`` buffered games per team for each window.
+
+    Returns an array of shape (n_teams, n_windows, 3).
+    """
+    max_window = buf.shape[1]
+    back = np.arange(max_window)
+    slots = (count[:, None] - 1 - back[None, :]) % max_window
+    recent = np.take_along_axis(buf, slots[:, :, None], axis=1)
+    sums = np.empty((len(count), len(windows), _N_STATS))
+    for j, w in enumerate(windows):
+        valid = back[None, :] < np.minimum(count, w)[:, None]
+        sums[:, j] = (recent * valid[:, :, None]).sum(axis=1)
+    return sums
+
+
+def _pyth_pow(runs: np.ndarray) -> np.ndarray:
+    """Raise run totals to the Pythagorean exponent.
+
+    Run totals are whole numbers, so look them up in a table built with
+    Python's scalar ``**``; NumPy's vectorized power can differ in the last
+    bit, and the features should match scalar arithmetic exactly.
+    """
+    if runs.size == 0 or not np.array_equal(runs, np.floor(runs)):
+        return runs**PYTH_EXPONENT
+    table = np.array(
+        [float(r) ** PYTH_EXPONENT for r in range(int(runs.max()) + 1)]
+    )
+    return table[runs.astype(np.int64)]
+
+
+def rolling_features(
+    sums: np.ndarray,
+    games_played: np.ndarray,
+    window: int,
+) -> dict[str, np.ndarray]:
+    """Turn rolling sums for one window into win%, run diff and Pythagorean win%.
+
+    Args:
+        sums: Array of shape (n_games, 2, 3) from ``run_rolling`` for one window.
+        games_played: Array of shape (n_games, 2).
+        window: The window size the sums were taken over.
+
+    Returns:
+        Arrays of shape (n_games, 2) keyed by win_pct, run_diff, pyth_win_pct.
+    """
+    rs = sums[..., _RS]
+    ra = sums[..., _RA]
+    wins = sums[..., _WON]
+    n = np.minimum(games_played, window)
+    has_games = n > 0
+    denom = np.where(has_games, n, 1)
+
+    # Pythagorean expected win% (exponent 1.83)
+    rs_pow = _pyth_pow(rs)
+    ra_pow = _pyth_pow(ra)
+    scored = (rs + ra) > 0
+    pyth = np.where(
+        scored, rs_pow / np.where(scored, rs_pow + ra_pow, 1.0), 0.5
+    )
+
+    return {
+        "win_pct": np.where(has_games, wins / denom, 0.5),
+        "run_diff": np.where(has_games, (rs - ra) / denom, 0.0),
+        "pyth_win_pct": np.where(has_games, pyth, 0.5),
+    }
@@ -0,0 +1,116 @@
+"""Compact column types for the games and features tables.
+
+Team names are stored as a categorical over a fixed team dimension table
+(``TEAMS``), so each row holds a one-byte code instead of a Python string,
+and grouping or factorizing by team works on the codes. Scores, IDs and
+small counts use the narrowest integer type that holds them, and feature
+values are float32, the precision XGBoost trains on anyway.
+"""
+
+import numpy as np
+import pandas as pd
+
+# MLB Stats API team IDs with every name the API has used for them
+TEAMS = pd.DataFrame(
+    [
+        (108, "Anaheim Angels"),
+        (108, "Los Angeles Angels"),
+        (108, "Los Angeles Angels of Anaheim"),
+        (109, "Arizona Diamondbacks"),
+        (110, "Baltimore Orioles"),
+        (111, "Boston Red Sox"),
+        (112, "Chicago Cubs"),
+        (113, "Cincinnati Reds"),
+        (114, "Cleveland Guardians"),
+        (114, "Cleveland Indians"),
+        (115, "Colorado Rockies"),
+        (116, "Detroit Tigers"),
+        (117, "Houston Astros"),
+        (118, "Kansas City Royals"),
+        (119, "Los Angeles Dodgers"),
+        (120, "Montreal Expos"),
+        (120, "Washington Nationals"),
+        (121, "New York Mets"),
+        (133, "Athletics"),
+        (133, "Oakland Athletics"),
+        (134, "Pittsburgh Pirates"),
+        (135, "San Diego Padres"),
+        (136, "Seattle Mariners"),
+        (137, "San Francisco Giants"),
+        (138, "St. Louis Cardinals"),
+        (139, "Tampa Bay Devil Rays"),
+        (139, "Tampa Bay Rays"),
+        (140, "Texas Rangers"),
+        (141, "Toronto Blue Jays"),
+        (142, "Minnesota Twins"),
+        (143, "Philadelphia Phillies"),
+        (144, "Atlanta Braves"),
+        (145, "Chicago White Sox"),
+        (146, "Florida Marlins"),
+        (146, "Miami Marlins"),
+        (147, "New York Yankees"),
+        (158, "Milwaukee Brewers"),
+    ],
+    columns=["team_id", "name"],
+).astype({"team_id": np.int16})
+
+TEAM_COLUMNS = ["home_team", "away_team"]
+
+GAME_DTYPES = {
+    "home_id": np.int16,
+    "away_id": np.int16,
+    "home_score": np.int16,
+    "away_score": np.int16,
+    "home_win": np.int8,
+}
+
+# Integer feature columns by suffix; other float columns become float32
+_FEATURE_INT_DTYPES = {
+    "_games_played": np.int16,
+    "_rest_days": np.int8,
+    "_streak": np.int16,
+    "_sp_starts": np.int16,
+}
+
+
+def team_dtype(names: pd.Series | list[str] = ()) -> pd.CategoricalDtype:
+    """Categorical dtype over the names in TEAMS plus any other ``names``.
+
+    Categories are sorted, so codes order like the names themselves. Real
+    MLB data always gets the same categories; other names (test fixtures,
+    exhibition opponents) are added to them.
+    """
+    known = set(TEAMS["name"])
+    extra = {str(n) for n in pd.unique(pd.Series(names, dtype=object))}
+    return pd.CategoricalDtype(sorted(known | extra))
+
+
+def compact_games(games: pd.DataFrame) -> pd.DataFrame:
+    """Games with categorical teams and small integer columns.
+
+    Only converts the columns ``games`` has; returns a copy.
+    """
+    games = games.astype(
+        {c: t for c, t in GAME_DTYPES.items() if c in games.columns}
+    )
+    teams = [c for c in TEAM_COLUMNS if c in games.columns]
+    if teams:
+        dtype = team_dtype(pd.concat([games[c].astype(object) for c in teams]))
+        games = games.astype({c: dtype for c in teams})
+    return games
+
+
+def compact_features(features: pd.DataFrame) -> pd.DataFrame:
+    """A feature matrix with ``compact_games`` types and float32 features."""
+    features = compact_games(features)
+    dtypes = {}
+    for column, dtype in features.dtypes.items():
+        int_dtype = next(
+            (t for s, t in _FEATURE_INT_DTYPES.items() if column.endswith(s)),
+            None,
+        )
+        if int_dtype is not None:
+            dtypes[column] = int_dtype
+        elif dtype == np.float64:
+            dtypes[column] = np.float32
+    return features.astype(dtypes)
@@ -1,36 +1,55 @@
 """Data fetching from MLB Stats API and pybaseball."""
 
+import json
 import logging
+import os
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Protocol
 
 import pandas as pd
 import statsapi
 
 from charliehustle.config import DEFAULT_CONFIG, Config
+from charliehustle.data.schema import compact_games
 from charliehustle.data.storage import load_parquet, save_parquet
 
 logger = logging.getLogger(__name__)
 
+GAME_COLUMNS = [
+    "game_id",
+    "date",
+    "home_team",
+    "home_id",
+    "away_team",
+    "away_id",
+    "home_score",
+    "away_score",
+    "home_win",
+    "winning_pitcher",
+    "losing_pitcher",
+    "home_probable_pitcher",
+    "away_probable_pitcher",
+]
 
-def fetch_season_games(
-    season: int, config: Config = DEFAULT_CONFIG
-) -> pd.DataFrame:
-    """Fetch all regular season games for a season from MLB Stats API.
 
-    Returns a DataFrame with one row per completed regular-season game.
-    """
-    cache_path = config.data_dir / f"{season}" / "games.parquet"
-    cached = load_parquet(cache_path)
-    if cached is not None:
-        logger.info(f"Loaded {len(cached)} games from cache for {season}")
-        return cached
+SEASON_START = (3, 20)
+SEASON_END = (11, 15)
 
-    logger.info(f"Fetching {season} schedule from MLB Stats API...")
-    raw = statsapi.schedule(
-        start_date=f"03/20/{season}",
-        end_date=f"11/15/{season}",
-        sportId=1,
-    )
+# Statuses after which a game's date needs no refetching
+_SETTLED_STATUSES = {"Final", "Cancelled"}
+
+
+class ScheduleClient(Protocol):
+    """The part of the MLB Stats API client used here (``statsapi``)."""
 
+    def schedule(
+        self, start_date: str, end_date: str, sportId: int
+    ) -> list[dict[str, Any]]: ...
+
+
+def _parse_schedule(raw: list[dict[str, Any]]) -> pd.DataFrame:
+    """Keep completed regular-season games from a raw schedule response."""
     records = []
     for g in raw:
         if g["game_type"] != "R":
@@ -50,15 +69,137 @@ def fetch_season_games(
                 "home_win": int(g["home_score"] > g["away_score"]),
                 "winning_pitcher": g.get("winning_pitcher", ""),
                 "losing_pitcher": g.get("losing_pitcher", ""),
+                "home_probable_pitcher": g.get("home_probable_pitcher", ""),
+                "away_probable_pitcher": g.get("away_probable_pitcher", ""),
             }
         )
 
-    df = pd.DataFrame(records)
+    df = pd.DataFrame(records, columns=GAME_COLUMNS)
     df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date").reset_index(drop=True)
+    return compact_games(df)
+
+
+def _complete_through(raw: list[dict[str, Any]], end: date) -> date:
+    """Last date up to which every regular-season game in ``raw`` is settled.
+
+    A game is settled once it is Final, cancelled, or postponed to a date
+    where it has already been played (its game_id is Final elsewhere in
+    ``raw``). Anything else (scheduled, in progress, suspended, or postponed
+    and not yet made up) holds the checkpoint at the day before it, so its
+    date is fetched again on the next update.
+    """
+    final_ids = {g["game_id"] for g in raw if g["status"] == "Final"}
+    pending = [
+        date.fromisoformat(g["game_date"])
+        for g in raw
+        if g["game_type"] == "R"
+        and g["status"] not in _SETTLED_STATUSES
+        and g["game_id"] not in final_ids
+    ]
+    if not pending:
+        return end
+    return min(pending) - timedelta(days=1)
+
+
+def _fetch_schedule(
+    client: ScheduleClient, start: date, end: date
+) -> tuple[pd.DataFrame, date]:
+    """Completed games from ``start`` to ``end`` and how far they are complete."""
+    logger.info(f"Fetching schedule {start} to {end} from MLB Stats API...")
+    raw = client.schedule(
+        start_date=start.strftime("%m/%d/%Y"),
+        end_date=end.strftime("%m/%d/%Y"),
+        sportId=1,
+    )
+    return _parse_schedule(raw), _complete_through(raw, end)
+
 
+def _fetch_log_path(season: int, config: Config) -> Path:
+    return config.data_dir / f"{season}" / "games_fetch.json"
+
+
+def fetch_season_games(
+    season: int,
+    config: Config = DEFAULT_CONFIG,
+    update: bool = False,
+    client: ScheduleClient | None = None,
+    today: date | None = None,
+) -> pd.DataFrame:
+    """Fetch all regular season games for a season from MLB Stats API.
+
+    Returns a DataFrame with one row per completed regular-season game.
+
+    The result is cached to ``games.parquet`` along with the last date whose
+    games are known to be complete, judged by game status (every game on and
+    before it is Final or otherwise settled). With ``update=True`` only the
+    dates after that are requested, merged into the cache (deduplicated by
+    game_id) and the cache is rewritten.
+
+    Args:
+        season: Season year.
+        config: Supplies the data directory.
+        update: Fetch games played since the last fetch instead of returning
+            the cache as-is.
+        client: Schedule client; defaults to the ``statsapi`` module.
+        today: Override the current date (the last date fetched).
+    """
+    if client is None:
+        client = statsapi
+    if today is None:
+        today = date.today()
+
+    cache_path = config.data_dir / f"{season}" / "games.parquet"
+    log_path = _fetch_log_path(season, config)
+    cached = load_parquet(cache_path)
+    if cached is not None:
+        # Caches written before the compact schema hold strings and int64s
+        cached = compact_games(cached)
+    if cached is not None and not update:
+        logger.info(f"Loaded {len(cached)} games from cache for {season}")
+        return cached
+
+    season_start = date(season, *SEASON_START)
+    season_end = date(season, *SEASON_END)
+    start = season_start
+    if cached is not None and log_path.exists():
+        complete_through = date.fromisoformat(
+            json.loads(log_path.read_text())["complete_through"]
+        )
+        start = complete_through + timedelta(days=1)
+    elif cached is not None:
+        # No record of how far the cache got: refetch from its last game date
+        start = cached["date"].max().date() if len(cached) else season_start
+
+    end = min(season_end, today)
+    if start > end:
+        if cached is None:
+            # Before opening day: nothing to fetch or cache yet
+            logger.info(f"No {season} games have been played yet")
+            return _parse_schedule([])
+        logger.info(f"{season} games are up to date ({len(cached)} games)")
+        return cached
+
+    fetched, complete_through = _fetch_schedule(client, start, end)
+    if cached is not None:
+        fetched = pd.concat([cached, fetched], ignore_index=True)
+    df = compact_games(
+        fetched.drop_duplicates("game_id", keep="last")
+        .sort_values("date", kind="stable")
+        .reset_index(drop=True)
+    )
+
+    # Games first: if the log write is interrupted the old checkpoint stays,
+    # which only means refetching some dates
     save_parquet(df, cache_path)
-    logger.info(f"Fetched and cached {len(df)} games for {season}")
+    tmp_path = log_path.with_name(f".{log_path.name}.tmp")
+    tmp_path.write_text(
+        json.dumps({"complete_through": complete_through.isoformat()})
+    )
+    os.replace(tmp_path, log_path)
+    logger.info(
+        f"Fetched {len(df) - (0 if cached is None else len(cached))} new games"
+        f" ({len(df)} cached) for {season}"
+    )
     return df
 
 
@@ -1,6 +1,8 @@
 """Data caching and storage utilities."""
 
+import hashlib
 import logging
+import os
 from pathlib import Path
 
 import pandas as pd
@@ -9,9 +11,15 @@ logger = logging.getLogger(__name__)
 
 
 def save_parquet(df: pd.DataFrame, path: Path) -> None:
-    """Save a DataFrame as Parquet."""
+    """Save a DataFrame as Parquet.
+
+    Writes to a temporary file and renames it into place, so readers never see
+    a partially written file.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(path, index=False)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
     logger.debug(f"Saved {len(df)} rows to {path}")
 
 
@@ -20,3 +28,12 @@ def load_parquet(path: Path) -> pd.DataFrame | None:
     if path.exists():
         return pd.read_parquet(path)
     return None
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,149 @@
+"""Point-in-time team form, as an as-of table.
+
+End-of-season FanGraphs aggregates (``fetch_batting_stats``) include games
+after the one being predicted, so team offense and pitching are summarized
+from the season's own game log instead. ``team_form_table`` holds one row per
+team per date it played, with aggregates through that date's games:
+
+    season_runs_per_game, season_runs_allowed_per_game:
+        Averages over the season so far.
+    recent_runs_per_game, recent_runs_allowed_per_game:
+        Averages over the team's last ``window`` games.
+    bullpen_decision_pct:
+        Share of the last ``window`` decisions that went to a pitcher other
+        than the team's probable starter, a proxy for bullpen usage.
+
+``attach_team_form`` joins the table onto games with ``merge_asof`` on date,
+taking each team's latest row from strictly before the game's date, so a
+game never sees its own result (or, in a doubleheader, the other game's).
+
+Games may span several seasons (see ``season_starts``). Every aggregate
+starts over with each season, and a team's first game of a season gets NaN
+rather than its form from the end of the season before.
+"""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from charliehustle.config import DEFAULT_CONFIG, Config
+from charliehustle.data.elo import season_numbers
+from charliehustle.data.pitchers import STARTER_COLUMNS, normalize_names
+from charliehustle.data.team_games import team_game_table
+
+logger = logging.getLogger(__name__)
+
+FORM_COLUMNS = [
+    "season_runs_per_game",
+    "season_runs_allowed_per_game",
+    "recent_runs_per_game",
+    "recent_runs_allowed_per_game",
+    "bullpen_decision_pct",
+]
+
+
+def team_form_path(season: int, config: Config = DEFAULT_CONFIG) -> Path:
+    """Location of a season's team form table."""
+    return config.data_dir / f"{season}" / "team_form.parquet"
+
+
+def _bullpen_decisions(games: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Per side, 1.0 if a reliever got the decision, NaN when unknown."""
+    columns = ["winning_pitcher", "losing_pitcher", *STARTER_COLUMNS]
+    if not set(columns) <= set(games.columns):
+        missing = np.full(len(games), np.nan)
+        return missing, missing
+    names = {c: normalize_names(games[c].astype(object)).to_numpy() for c in columns}
+    home_won = games["home_win"].to_numpy().astype(bool)
+    flags = []
+    for starter, won in [
+        (names["home_probable_pitcher"], home_won),
+        (names["away_probable_pitcher"], ~home_won),
+    ]:
+        decision = np.where(won, names["winning_pitcher"], names["losing_pitcher"])
+        known = (starter != "") & (decision != "")
+        flags.append(np.where(known, (decision != starter).astype(float), np.nan))
+    return flags[0], flags[1]
+
+
+def team_form_table(games: pd.DataFrame, window: int = 10) -> pd.DataFrame:
+    """Each team's aggregates after each date it played, sorted by date.
+
+    Columns: team, date and ``FORM_COLUMNS``. ``games`` must be in date
+    order.
+    """
+    table = team_game_table(games)
+    home_bullpen, away_bullpen = _bullpen_decisions(games)
+    order = table["game_order"].to_numpy()
+    table["bullpen"] = np.where(
+        table["is_home"], home_bullpen[order], away_bullpen[order]
+    )
+
+    values = table[["runs_scored", "runs_allowed", "bullpen"]].astype(np.float64)
+    # Rows are sorted by team, then game order, so each (team, season) group
+    # is one contiguous run
+    seasons = season_numbers(games)[order]
+    group = table["team"].cat.codes.to_numpy() * (seasons.max(initial=0) + 1)
+    by_team = values.groupby(group + seasons, sort=False)
+    played = by_team.cumcount().to_numpy() + 1
+    season = by_team[["runs_scored", "runs_allowed"]].cumsum()
+    recent = (
+        by_team.rolling(window, min_periods=1)
+        .mean()
+        .reset_index(level=0, drop=True)
+        .reindex(table.index)
+    )
+
+    form = pd.DataFrame(
+        {
+            "team": table["team"],
+            "date": table["date"],
+            "season_runs_per_game": season["runs_scored"] / played,
+            "season_runs_allowed_per_game": season["runs_allowed"] / played,
+            "recent_runs_per_game": recent["runs_scored"],
+            "recent_runs_allowed_per_game": recent["runs_allowed"],
+            "bullpen_decision_pct": recent["bullpen"],
+        }
+    )
+    # After a doubleheader, the row for the date covers both games
+    form = form.drop_duplicates(["team", "date"], keep="last")
+    form[FORM_COLUMNS] = form[FORM_COLUMNS].astype(np.float32)
+    return form.sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def attach_team_form(games: pd.DataFrame, form: pd.DataFrame) -> pd.DataFrame:
+    """Add ``home_<c>`` and ``away_<c>`` for each of ``FORM_COLUMNS``.
+
+    Each side gets its team's latest ``form`` row dated before the game.
+    Teams with no earlier row in the game's season (opening day) get NaN.
+    """
+    new_cols = [f"{p}_{c}" for c in FORM_COLUMNS for p in ("home", "away")]
+    merged = games.drop(columns=new_cols, errors="ignore")
+    left = merged[["date", "home_team", "away_team"]].reset_index(drop=True)
+    left["row"] = np.arange(len(left))
+    seasons = season_numbers(games)
+    left["season_start"] = left["date"].groupby(seasons).transform("min")
+    left = left.sort_values("date", kind="stable")
+    right = form.astype({"team": games["home_team"].dtype})
+    right["form_date"] = right["date"]
+
+    for prefix in ("home", "away"):
+        side = pd.merge_asof(
+            left[["row", "date", "season_start", f"{prefix}_team"]],
+            right.rename(columns={c: f"{prefix}_{c}" for c in FORM_COLUMNS}),
+            on="date",
+            left_by=f"{prefix}_team",
+            right_by="team",
+            allow_exact_matches=False,
+        ).sort_values("row")
+        # Form carried over from an earlier season
+        stale = (side["form_date"] < side["season_start"]).to_numpy()
+        for c in FORM_COLUMNS:
+            values = side[f"{prefix}_{c}"].to_numpy()
+            merged[f"{prefix}_{c}"] = np.where(stale, np.nan, values)
+
+    # Keep home/away columns for the same aggregate next to each other
+    ordered = [c for c in merged.columns if c not in new_cols] + new_cols
+    return merged[ordered]
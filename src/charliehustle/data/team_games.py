@@ -0,0 +1,211 @@
+"""Long-format team-game table.
+
+The raw games table is wide: one row per game with home_* and away_* columns.
+Per-team features only depend on a team's own history, so they are computed
+on a long table with one row per team per game, stable-sorted by team and
+game order, using shifted groupby operations. Results are pivoted back onto
+the wide table by ``game_id``.
+"""
+
+import logging
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from charliehustle.data.rolling import rolling_features
+from charliehustle.data.schema import team_dtype
+
+logger = logging.getLogger(__name__)
+
+REST_DAYS_DEFAULT = 3  # Season opener
+REST_DAYS_CAP = 7  # All-Star break etc.
+
+
+def team_game_table(games: pd.DataFrame) -> pd.DataFrame:
+    """Reshape games into one row per team per game.
+
+    Columns: game_id, game_order, team, opponent, is_home, plus date and
+    runs_scored, runs_allowed, won when the games have them. ``game_order`` is
+    the game's position in ``games``, which is assumed to be in date order.
+    ``team`` and ``opponent`` are categoricals sharing the games' team dtype
+    (see ``charliehustle.data.schema``).
+    """
+    n = len(games)
+    order = np.arange(n)
+    dtype, home, away = _team_codes(games)
+    cols: dict[str, np.ndarray] = {
+        "game_id": np.tile(games["game_id"].to_numpy(), 2),
+        "game_order": np.tile(order, 2),
+        "team": np.concatenate([home, away]),
+        "opponent": np.concatenate([away, home]),
+        "is_home": np.repeat([True, False], n),
+    }
+    if "date" in games.columns:
+        cols["date"] = np.tile(games["date"].to_numpy(), 2)
+    if "home_score" in games.columns:
+        home_score = games["home_score"].to_numpy()
+        away_score = games["away_score"].to_numpy()
+        won = games["home_win"].to_numpy()
+        cols["runs_scored"] = np.concatenate([home_score, away_score])
+        cols["runs_allowed"] = np.concatenate([away_score, home_score])
+        cols["won"] = np.concatenate([won, 1 - won])
+
+    # Stable sort by (team, game order) on the category codes, which order
+    # like the names
+    key = cols["team"].astype(np.int64) * n + cols["game_order"]
+    sort_idx = np.argsort(key, kind="stable")
+    table = {name: col[sort_idx] for name, col in cols.items()}
+    for name in ("team", "opponent"):
+        table[name] = pd.Categorical.from_codes(table[name], dtype=dtype)
+    return pd.DataFrame(table)
+
+
+def _team_codes(
+    games: pd.DataFrame,
+) -> tuple[pd.CategoricalDtype, np.ndarray, np.ndarray]:
+    """A shared team dtype and the home and away teams' codes in it."""
+    home, away = games["home_team"], games["away_team"]
+    dtype = home.dtype
+    if not isinstance(dtype, pd.CategoricalDtype) or dtype != away.dtype:
+        dtype = team_dtype(pd.concat([home, away]).astype(object))
+        home, away = home.astype(dtype), away.astype(dtype)
+    return dtype, home.cat.codes.to_numpy(), away.cat.codes.to_numpy()
+
+
+def _prior(table: pd.DataFrame, values: pd.DataFrame | pd.Series):
+    """Shift per-team values down one game so each row sees only the past."""
+    return values.groupby(table["team"], sort=False).shift(1)
+
+
+def _carried(table: pd.DataFrame, per_team: pd.Series) -> pd.Series:
+    """Look up a per-team value (indexed by team) for every row of ``table``."""
+    return pd.Series(
+        per_team.reindex(table["team"]).to_numpy(), index=table.index
+    )
+
+
+def team_rolling_stats(
+    table: pd.DataFrame,
+    windows: Sequence[int],
+) -> pd.DataFrame:
+    """Pre-game rolling win%, run differential and Pythagorean win%.
+
+    Returns a frame aligned with ``table`` holding games_played plus
+    win_pct, run_diff and pyth_win_pct for the first window (unsuffixed) and
+    ``<stat>_<window>`` for the rest.
+    """
+    stats = ["runs_scored", "runs_allowed", "won"]
+    values = table[stats].astype(np.float64)
+    played = table.groupby("team", sort=False).cumcount().to_numpy()
+
+    out = pd.DataFrame(index=table.index)
+    for j, w in enumerate(windows):
+        suffix = "" if j == 0 else f"_{w}"
+        sums = (
+            values.groupby(table["team"], sort=False)
+            .rolling(w, min_periods=1)
+            .sum()
+            .reset_index(level=0, drop=True)
+            .reindex(table.index)
+        )
+        sums = _prior(table, sums).fillna(0.0).to_numpy()
+        for name, col in rolling_features(sums, played, w).items():
+            out[f"{name}{suffix}"] = col
+    out["games_played"] = played
+    return out
+
+
+def team_rest_days(
+    table: pd.DataFrame,
+    last_dates: pd.Series | None = None,
+) -> pd.Series:
+    """Days since each team's previous game, capped for long breaks.
+
+    ``last_dates`` (indexed by team) gives the date of each team's game
+    before the first one in ``table``, when resuming from a saved state.
+    """
+    prev = table["date"].groupby(table["team"], sort=False).shift(1)
+    if last_dates is not None:
+        prev = prev.fillna(_carried(table, last_dates))
+    delta = (table["date"] - prev).dt.days
+    return (
+        delta.clip(upper=REST_DAYS_CAP)
+        .fillna(REST_DAYS_DEFAULT)
+        .astype(np.int64)
+        .rename("rest_days")
+    )
+
+
+def _signed_runs(
+    table: pd.DataFrame,
+    initial: pd.Series | None = None,
+) -> pd.Series:
+    """Signed streak AFTER each game, continuing ``initial`` where it applies."""
+    won = table["won"].astype(bool)
+    team = table["team"]
+    first = team != team.shift()
+    run_id = (first | (won != won.shift())).cumsum()
+    length = won.groupby(run_id).cumcount() + 1
+
+    if initial is not None:
+        # A team's first run extends its carried-in streak if the sign matches
+        carry = _carried(table, initial).fillna(0)
+        first_run = run_id == run_id.where(first).ffill()
+        continues = first_run & (((carry > 0) & won) | ((carry < 0) & ~won))
+        length = length + carry.abs().where(continues, 0)
+
+    return length.where(won, -length)
+
+
+def team_streaks(
+    table: pd.DataFrame,
+    initial: pd.Series | None = None,
+) -> pd.Series:
+    """Signed streak entering each game: +n after n straight wins, -n losses.
+
+    ``initial`` (indexed by team) carries in each team's streak from before
+    the first game in ``table``, when resuming from a saved state.
+    """
+    prior = _prior(table, _signed_runs(table, initial))
+    if initial is not None:
+        prior = prior.fillna(_carried(table, initial))
+    return prior.fillna(0).astype(np.int64).rename("streak")
+
+
+def final_streaks(
+    table: pd.DataFrame,
+    initial: pd.Series | None = None,
+) -> pd.Series:
+    """Each team's signed streak after its last game in ``table``."""
+    runs = _signed_runs(table, initial)
+    return runs.groupby(table["team"], sort=False).last().astype(np.int64)
+
+
+def attach_team_features(
+    games: pd.DataFrame,
+    table: pd.DataFrame,
+    features: pd.DataFrame,
+) -> pd.DataFrame:
+    """Merge per-team features back onto the wide games table by game_id.
+
+    Each column ``c`` in ``features`` (aligned with ``table``) becomes
+    ``home_c`` and ``away_c``.
+    """
+    cols = list(features.columns)
+    new_cols = [f"{p}_{c}" for c in cols for p in ("home", "away")]
+    merged = games.drop(columns=new_cols, errors="ignore")
+    for prefix, is_home in [("home", True), ("away", False)]:
+        mask = (table["is_home"] == is_home).to_numpy()
+        side = features.loc[mask, cols].rename(
+            columns={c: f"{prefix}_{c}" for c in cols}
+        )
+        side.insert(0, "game_id", table.loc[mask, "game_id"].to_numpy())
+        merged = merged.merge(
+            side, on="game_id", how="left", validate="one_to_one"
+        )
+    merged.index = games.index
+
+    # Keep home/away columns for the same feature next to each other
+    ordered = [c for c in games.columns if c not in new_cols] + new_cols
+    return merged[ordered]
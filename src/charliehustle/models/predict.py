@@ -1,28 +1,92 @@
 """Model prediction."""
 
+import logging
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 from xgboost import XGBClassifier
 
 from charliehustle.data.features import FEATURE_COLUMNS
+from charliehustle.config import DEFAULT_CONFIG, Config
+from charliehustle.data.cache import artifact_cache, artifact_id, stage_key
+from charliehustle.data.storage import load_parquet
+from charliehustle.models.inference import TreeEnsemble
+from charliehustle.models.train import load_model
+
+logger = logging.getLogger(__name__)
 
 
 def predict_games(
-    model: XGBClassifier,
+    model: XGBClassifier | TreeEnsemble,
     games: pd.DataFrame,
 ) -> pd.DataFrame:
     """Generate predictions for a set of games.
 
+    ``model`` may be a ``compile_model`` ensemble, which is much faster on
+    small slates.
+
     Adds columns:
         model_home_prob: predicted probability of home win
         model_pick: predicted winner team name
     """
-    X = games[FEATURE_COLUMNS].values
-    probs = model.predict_proba(X)[:, 1]  # P(home_win)
+    # XGBoost predicts in float32, so a float64 copy would only be converted
+    X = games[FEATURE_COLUMNS].to_numpy(np.float32)
+    if isinstance(model, TreeEnsemble):
+        probs = model.predict_proba(X)
+    else:
+        probs = model.predict_proba(X)[:, 1]  # P(home_win)
+    return _with_predictions(games, probs)
+
 
+def _with_predictions(games: pd.DataFrame, probs: np.ndarray) -> pd.DataFrame:
     games = games.copy()
     games["model_home_prob"] = probs
     games["model_pick"] = np.where(
         probs >= 0.5, games["home_team"], games["away_team"]
     )
     return games
+
+
+def cached_predict_games(
+    model_path: Path,
+    features_path: Path,
+    config: Config = DEFAULT_CONFIG,
+) -> pd.DataFrame | None:
+    """Load a features file with predictions, reusing cached predictions.
+
+    Predictions (``model_home_prob`` per ``game_id``) are stored in the
+    artifact cache under a key hashed from the model and the features, so
+    the model is only loaded and run when either has changed.
+
+    Returns None if the features file does not exist.
+    """
+    features = load_parquet(features_path)
+    if features is None:
+        return None
+
+    cache = artifact_cache(config)
+    inputs = {
+        "model": artifact_id(model_path),
+        "features": artifact_id(features_path),
+    }
+    key = stage_key("predictions", {}, inputs)
+    cached_dir = cache.get(key)
+    if cached_dir is not None:
+        logger.info(f"Using cached predictions for {features_path}")
+        cached = load_parquet(cached_dir / "predictions.parquet")
+        probs = (
+            cached.set_index("game_id")["model_home_prob"]
+            .reindex(features["game_id"])
+            .to_numpy()
+        )
+        return _with_predictions(features, probs)
+
+    games = predict_games(load_model(model_path), features)
+    cache.put_frames(
+        key,
+        "predictions",
+        {"predictions.parquet": games[["game_id", "model_home_prob"]]},
+        inputs=inputs,
+    )
+    return games
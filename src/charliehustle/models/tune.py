@@ -0,0 +1,188 @@
+"""Hyperparameter search for the XGBoost model.
+
+Trials sample parameters from SEARCH_SPACE and are scored by validation log
+loss on the same ``TimeSeriesSplit`` folds ``train_model`` reports. Each fit
+boosts up to MAX_ESTIMATORS trees with early stopping on its validation
+fold, so the number of trees is tuned too.
+
+With successive halving, every trial is first scored on the earliest (and
+cheapest) fold only; after each fold the better 1/``eta`` of the surviving
+trials move on to the next, larger fold and the rest are pruned. Random
+search scores every trial on every fold. Either way, the fits within a
+round are independent and run in parallel worker processes.
+"""
+
+import logging
+import math
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import TimeSeriesSplit
+
+from charliehustle.data.features import FEATURE_COLUMNS, TARGET_COLUMN
+from charliehustle.models.train import build_model
+from charliehustle.parallel import worker_data, worker_pool, worker_threads
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("halving", "random")
+
+# (kind, low, high); "log" samples uniformly on a log scale
+SEARCH_SPACE: dict[str, tuple[str, float, float]] = {
+    "max_depth": ("int", 2, 8),
+    "learning_rate": ("log", 0.01, 0.3),
+    "subsample": ("uniform", 0.5, 1.0),
+    "colsample_bytree": ("uniform", 0.5, 1.0),
+    "min_child_weight": ("log", 0.5, 20.0),
+    "reg_alpha": ("log", 1e-3, 10.0),
+    "reg_lambda": ("log", 1e-2, 10.0),
+}
+
+MAX_ESTIMATORS = 2000
+EARLY_STOPPING_ROUNDS = 50
+
+def sample_params(rng: np.random.Generator) -> dict[str, Any]:
+    """Draw one set of parameters from SEARCH_SPACE."""
+    params: dict[str, Any] = {}
+    for name, (kind, low, high) in SEARCH_SPACE.items():
+        if kind == "int":
+            params[name] = int(rng.integers(low, high + 1))
+        elif kind == "log":
+            params[name] = float(
+                math.exp(rng.uniform(math.log(low), math.log(high)))
+            )
+        else:
+            params[name] = float(rng.uniform(low, high))
+    return params
+
+
+def _score_fold(
+    X: np.ndarray,
+    y: np.ndarray,
+    train_idx: np.ndarray,
+    val_idx: np.ndarray,
+    params: dict[str, Any],
+    n_jobs: int | None = None,
+) -> tuple[float, int]:
+    """Fit with early stopping; return (best validation log loss, trees)."""
+    model = build_model(
+        **params,
+        n_estimators=MAX_ESTIMATORS,
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        n_jobs=n_jobs,
+    )
+    model.fit(
+        X[train_idx],
+        y[train_idx],
+        eval_set=[(X[val_idx], y[val_idx])],
+        verbose=False,
+    )
+    return float(model.best_score), int(model.best_iteration) + 1
+
+
+def _worker_score(
+    train_idx: np.ndarray,
+    val_idx: np.ndarray,
+    params: dict[str, Any],
+    n_jobs: int,
+) -> tuple[float, int]:
+    return _score_fold(*worker_data(), train_idx, val_idx, params, n_jobs)
+
+
+def tune(
+    features: pd.DataFrame,
+    n_trials: int = 32,
+    method: str = "halving",
+    eta: int = 2,
+    n_splits: int = 5,
+    seed: int = 0,
+    jobs: int = 1,
+) -> tuple[dict[str, Any], pd.DataFrame]:
+    """Search for XGBoost parameters that minimize CV log loss.
+
+    Args:
+        features: Training features, in date order.
+        n_trials: Parameter sets to try.
+        method: ``halving`` (successive halving over the CV folds) or
+            ``random`` (every trial on every fold).
+        eta: Halving rate; 1/eta of the trials survive each fold.
+        n_splits: Number of ``TimeSeriesSplit`` folds.
+        seed: Seed for sampling parameters.
+        jobs: Fits to run concurrently.
+
+    Returns:
+        (best parameters, trials) where the best parameters include
+        ``n_estimators`` (the trial's mean early-stopped tree count) and are
+        ready to pass to ``train_model``, and ``trials`` has one row per
+        trial with its parameters, folds scored, mean log_loss, mean trees
+        and whether it was pruned, best first.
+    """
+    if method not in METHODS:
+        raise ValueError(
+            f"Unknown method {method!r}, expected one of {METHODS}"
+        )
+
+    X = features[FEATURE_COLUMNS].values
+    y = features[TARGET_COLUMN].values
+    splits = list(TimeSeriesSplit(n_splits=n_splits).split(X))
+    rng = np.random.default_rng(seed)
+    trials = [sample_params(rng) for _ in range(n_trials)]
+    scores: list[list[tuple[float, int]]] = [[] for _ in trials]
+
+    pool = worker_pool(jobs, (X, y)) if jobs > 1 else None
+    threads = worker_threads(jobs)
+
+    def run(tasks: list[tuple[int, int]]) -> None:
+        """Score (trial, fold) pairs, in parallel when there's a pool."""
+        args = [(*splits[fold], trials[trial]) for trial, fold in tasks]
+        if pool is not None:
+            results = pool.map(
+                _worker_score, *zip(*args), [threads] * len(args)
+            )
+        else:
+            results = (_score_fold(X, y, *a) for a in args)
+        for (trial, _), result in zip(tasks, results):
+            scores[trial].append(result)
+
+    def mean_loss(trial: int) -> float:
+        return float(np.mean([loss for loss, _ in scores[trial]]))
+
+    try:
+        alive = list(range(n_trials))
+        if method == "random":
+            run([(t, f) for t in alive for f in range(n_splits)])
+        else:
+            for fold in range(n_splits):
+                run([(t, fold) for t in alive])
+                if fold < n_splits - 1:
+                    keep = max(1, math.ceil(len(alive) / eta))
+                    alive = sorted(alive, key=mean_loss)[:keep]
+                logger.info(
+                    f"Fold {fold + 1}/{n_splits}: {len(alive)} trials remain"
+                    f" (best log loss {min(map(mean_loss, alive)):.4f})"
+                )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    results = pd.DataFrame(trials)
+    results.insert(0, "trial", range(n_trials))
+    results["folds"] = [len(s) for s in scores]
+    results["log_loss"] = [mean_loss(t) for t in range(n_trials)]
+    results["n_estimators"] = [
+        round(np.mean([n for _, n in s])) for s in scores
+    ]
+    results["pruned"] = results["folds"] < n_splits
+    results = results.sort_values(["pruned", "log_loss"], ignore_index=True)
+
+    best = results.iloc[0]
+    best_params = {
+        **trials[int(best["trial"])],
+        "n_estimators": int(best["n_estimators"]),
+    }
+    logger.info(
+        f"Best of {n_trials} trials: log loss {best['log_loss']:.4f}"
+        f" with {best_params}"
+    )
+    return best_params, results
@@ -0,0 +1,188 @@
+"""Walk-forward backtesting with rolling retraining.
+
+The season is split into blocks of ``step_days``. For each block a model is
+fit on every game before the block's first day and used to predict the
+block, so every prediction is out of sample and the model keeps learning
+through the season, as it would when betting live. The blocks are chained
+into one prediction series for ``backtest``.
+
+Two ways to refresh the model:
+
+- retrain: fit a fresh model per block. Blocks don't depend on each other,
+  so they run in parallel worker processes, each limited to a share of the
+  cores for XGBoost's own threads.
+- warm start: fit once before the first block, then continue boosting the
+  previous block's model with ``update_estimators`` more trees on the
+  enlarged history. Cheaper per block, but sequential.
+
+Either way the models use MODEL_PARAMS updated by ``params``, such as the
+parameters ``tune`` saved, so the backtest scores the model ``train`` fits.
+"""
+
+import logging
+from typing import Any
+
+import pandas as pd
+from xgboost import XGBClassifier
+
+from charliehustle.data.features import FEATURE_COLUMNS, TARGET_COLUMN
+from charliehustle.models.predict import predict_games
+from charliehustle.models.train import build_model
+from charliehustle.parallel import worker_data, worker_pool, worker_threads
+
+logger = logging.getLogger(__name__)
+
+# Trees added to the previous block's model when warm starting
+UPDATE_ESTIMATORS = 50
+
+
+def walk_forward_blocks(
+    dates: pd.Series,
+    start: pd.Timestamp,
+    step_days: int = 14,
+) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+    """(cutoff, end) day ranges of ``step_days`` covering games from ``start``.
+
+    Each block holds the games with ``cutoff <= date < end``; blocks without
+    games are skipped.
+    """
+    start = pd.Timestamp(start).normalize()
+    last = dates.max()
+    step = pd.Timedelta(days=step_days)
+    blocks = []
+    cutoff = start
+    while cutoff <= last:
+        end = cutoff + step
+        if ((dates >= cutoff) & (dates < end)).any():
+            blocks.append((cutoff, end))
+        cutoff = end
+    return blocks
+
+
+def _fit(
+    history: pd.DataFrame,
+    params: dict[str, Any] | None = None,
+    n_jobs: int | None = None,
+    init_model: XGBClassifier | None = None,
+    n_estimators: int | None = None,
+) -> XGBClassifier:
+    """Fit on ``history``, optionally continuing ``init_model``'s boosting."""
+    overrides = {**(params or {}), "n_jobs": n_jobs}
+    if n_estimators is not None:
+        overrides["n_estimators"] = n_estimators
+    model = build_model(**overrides)
+    model.fit(
+        history[FEATURE_COLUMNS].values,
+        history[TARGET_COLUMN].values,
+        xgb_model=None if init_model is None else init_model.get_booster(),
+        verbose=False,
+    )
+    return model
+
+
+def _predict_block(
+    features: pd.DataFrame,
+    model: XGBClassifier,
+    cutoff: pd.Timestamp,
+    end: pd.Timestamp,
+) -> pd.DataFrame:
+    block = features[(features["date"] >= cutoff) & (features["date"] < end)]
+    games = predict_games(model, block)
+    games["train_cutoff"] = cutoff
+    return games
+
+
+def _retrain_block(
+    features: pd.DataFrame,
+    cutoff: pd.Timestamp,
+    end: pd.Timestamp,
+    params: dict[str, Any] | None = None,
+    n_jobs: int | None = None,
+) -> pd.DataFrame:
+    """Fit a fresh model on games before ``cutoff`` and predict the block."""
+    model = _fit(features[features["date"] < cutoff], params, n_jobs)
+    logger.debug(f"Retrained on games before {cutoff.date()}")
+    return _predict_block(features, model, cutoff, end)
+
+
+def _worker_block(
+    block: tuple[pd.Timestamp, pd.Timestamp],
+    params: dict[str, Any] | None,
+    n_jobs: int,
+) -> pd.DataFrame:
+    return _retrain_block(worker_data(), *block, params, n_jobs)
+
+
+def walk_forward_predict(
+    features: pd.DataFrame,
+    start: pd.Timestamp,
+    step_days: int = 14,
+    warm_start: bool = False,
+    update_estimators: int = UPDATE_ESTIMATORS,
+    jobs: int = 1,
+    params: dict[str, Any] | None = None,
+) -> pd.DataFrame:
+    """Out-of-sample predictions for games from ``start``, retraining as it goes.
+
+    Args:
+        features: Feature matrices for the test period and the history
+            before it (e.g. several seasons' ``features.parquet``), with a
+            date column.
+        start: First day to predict; earlier games are only trained on.
+        step_days: Days per block between model refreshes.
+        warm_start: Continue boosting the previous model instead of
+            retraining from scratch each block.
+        update_estimators: Trees added per block when warm starting.
+        jobs: Blocks retrained concurrently (ignored when warm starting).
+        params: Overrides for MODEL_PARAMS, e.g. the output of ``tune``.
+
+    Returns:
+        The games from ``start`` onward with model_home_prob, model_pick and
+        train_cutoff (the first day not trained on), in date order.
+    """
+    features = features.sort_values("date", kind="stable", ignore_index=True)
+    blocks = walk_forward_blocks(features["date"], start, step_days)
+    if not blocks:
+        raise ValueError(f"No games on or after {pd.Timestamp(start).date()}")
+    if not (features["date"] < blocks[0][0]).any():
+        raise ValueError(f"No games before {blocks[0][0].date()} to train on")
+    logger.info(
+        f"Walk-forward over {len(blocks)} blocks of {step_days} days"
+        f" from {blocks[0][0].date()}"
+    )
+
+    if warm_start:
+        predicted = []
+        model = None
+        for cutoff, end in blocks:
+            history = features[features["date"] < cutoff]
+            if model is None:
+                model = _fit(history, params)
+            else:
+                model = _fit(
+                    history,
+                    params,
+                    init_model=model,
+                    n_estimators=update_estimators,
+                )
+            predicted.append(_predict_block(features, model, cutoff, end))
+    elif jobs > 1 and len(blocks) > 1:
+        threads = worker_threads(jobs)
+        with worker_pool(jobs, features) as pool:
+            predicted = list(
+                pool.map(
+                    _worker_block,
+                    blocks,
+                    [params] * len(blocks),
+                    [threads] * len(blocks),
+                )
+            )
+    else:
+        predicted = [
+            _retrain_block(features, cutoff, end, params)
+            for cutoff, end in blocks
+        ]
+
+    games = pd.concat(predicted, ignore_index=True)
+    logger.info(f"Predicted {len(games)} games out of sample")
+    return games
@@ -0,0 +1,50 @@
+"""Worker process pools sharing one read-only payload.
+
+Cross-validation folds, tuning trials, walk-forward blocks and staking
+configurations all run many tasks over the same training data or games.
+``worker_pool`` hands that payload to each worker once, through the pool's
+initializer, rather than pickling it with every task; tasks read it back
+with ``worker_data``. Each worker gets its own copy.
+"""
+
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+# Payload installed in this worker process by _init_worker
+_worker_data: Any = None
+
+
+def _init_worker(data: Any, setup: Callable[[Any], Any] | None) -> None:
+    global _worker_data
+    _worker_data = data if setup is None else setup(data)
+
+
+def worker_pool(
+    jobs: int,
+    data: Any,
+    setup: Callable[[Any], Any] | None = None,
+) -> ProcessPoolExecutor:
+    """A pool of ``jobs`` processes, each holding ``data``.
+
+    With ``setup``, each worker holds ``setup(data)`` instead, for state
+    that is built once per worker because it can't be pickled. ``setup``
+    must be a module-level function.
+    """
+    return ProcessPoolExecutor(
+        jobs, initializer=_init_worker, initargs=(data, setup)
+    )
+
+
+def worker_data() -> Any:
+    """The payload of the pool this worker process belongs to."""
+    return _worker_data
+
+
+def worker_threads(jobs: int) -> int:
+    """Threads for each of ``jobs`` concurrent tasks, sharing out the cores.
+
+    Keeps XGBoost's own threads from oversubscribing the machine.
+    """
+    return max(1, (os.cpu_count() or 1) // jobs)
@@ -0,0 +1,36 @@
+"""Fixtures shared across test modules."""
+
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _season_games(season: int, n_days: int = 40) -> pd.DataFrame:
+    """Two games a day between four teams."""
+    rng = np.random.default_rng(season)
+    teams = np.array(["A", "B", "C", "D"])
+    records = []
+    for day in range(n_days):
+        order = rng.permutation(len(teams))
+        for g in range(2):
+            home_score, away_score = rng.choice(10, size=2, replace=False)
+            records.append(
+                {
+                    "game_id": season * 1000 + day * 2 + g,
+                    "date": pd.Timestamp(f"{season}-04-01") + pd.Timedelta(days=day),
+                    "home_team": teams[order[2 * g]],
+                    "away_team": teams[order[2 * g + 1]],
+                    "home_score": home_score,
+                    "away_score": away_score,
+                    "home_win": int(home_score > away_score),
+                }
+            )
+    return pd.DataFrame(records)
+
+
+@pytest.fixture
+def season_games() -> Callable[..., pd.DataFrame]:
+    """Factory for ``_season_games``: a season of synthetic games."""
+    return _season_games
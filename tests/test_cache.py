@@ -0,0 +1,191 @@
+"""Tests for the content-addressed artifact cache."""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from charliehustle.config import Config
+from charliehustle.data import pipeline
+from charliehustle.data.cache import (
+    STAGE_VERSIONS,
+    ArtifactCache,
+    artifact_id,
+    frame_digest,
+    record_key,
+    recorded_key,
+    stage_key,
+)
+from charliehustle.data.pitchers import build_pitcher_index
+from charliehustle.data.storage import file_digest, load_parquet
+
+
+def test_stage_key():
+    key = stage_key("features", {"elo_k": 4.0}, {"games": "abc"})
+    assert key == stage_key("features", {"elo_k": 4.0}, {"games": "abc"})
+    assert key != stage_key("features", {"elo_k": 5.0}, {"games": "abc"})
+    assert key != stage_key("features", {"elo_k": 4.0}, {"games": "abd"})
+    assert key != stage_key("model", {"elo_k": 4.0}, {"games": "abc"})
+
+
+def test_stage_version_changes_key(monkeypatch):
+    key = stage_key("features", {"elo_k": 4.0}, {"games": "abc"})
+    monkeypatch.setitem(STAGE_VERSIONS, "features", 99)
+    assert key != stage_key("features", {"elo_k": 4.0}, {"games": "abc"})
+
+
+def test_frame_digest():
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    assert frame_digest(df) == frame_digest(df.copy())
+    assert frame_digest(df) == frame_digest(df.set_index(df.index + 10))
+    assert frame_digest(df) != frame_digest(df.assign(a=[1, 2, 4]))
+    assert frame_digest(df) != frame_digest(df.astype({"a": "float64"}))
+    assert frame_digest(df) != frame_digest(df.rename(columns={"a": "c"}))
+    assert frame_digest(None) is None
+
+    ratings = pd.Series([1500.0, 1510.0], index=["NYY", "BOS"])
+    assert frame_digest(ratings) != frame_digest(
+        ratings.set_axis(["BOS", "NYY"])
+    )
+    assert frame_digest(ratings) == frame_digest(ratings.iloc[::-1])
+
+
+def _file(path, size: int):
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+class TestArtifactCache:
+    def test_round_trip(self, tmp_path):
+        cache = ArtifactCache(tmp_path / "cache")
+        src = _file(tmp_path / "model.bin", 100)
+        assert cache.get("k1") is None
+        assert not cache.restore("k1", {"model": tmp_path / "out.bin"})
+
+        cache.put("k1", "model", {"model": src}, {"depth": 4}, {"f": "abc"})
+        assert cache.restore("k1", {"model": tmp_path / "out.bin"})
+        assert (tmp_path / "out.bin").read_bytes() == src.read_bytes()
+
+        manifest = cache.entries()
+        assert manifest["key"].tolist() == ["k1"]
+        assert manifest["stage"].tolist() == ["model"]
+        assert manifest["size"].tolist() == [100]
+        assert manifest["params"].tolist() == [{"depth": 4}]
+
+    def test_put_frames(self, tmp_path):
+        cache = ArtifactCache(tmp_path / "cache")
+        df = pd.DataFrame({"game_id": [1, 2], "p": [0.4, 0.6]})
+        cache.put_frames("k", "predictions", {"p.parquet": df})
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(cache.get("k") / "p.parquet"), df
+        )
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ArtifactCache(tmp_path / "cache")
+        for key in ["a", "b", "c"]:
+            cache.put(key, "s", {"f": _file(tmp_path / key, 100)})
+            time.sleep(0.01)
+        cache.get("a")  # Now the most recently used
+
+        assert cache.evict(max_bytes=250) == ["b"]
+        assert cache.evict(max_bytes=100) == ["c"]
+        assert cache.entries()["key"].tolist() == ["a"]
+
+    def test_size_budget(self, tmp_path):
+        cache = ArtifactCache(tmp_path / "cache", max_bytes=250)
+        for key in ["a", "b", "c"]:
+            cache.put(key, "s", {"f": _file(tmp_path / key, 100)})
+            time.sleep(0.01)
+        assert cache.entries()["key"].tolist() == ["b", "c"]
+
+
+    def test_new_entry_survives_eviction(self, tmp_path):
+        cache = ArtifactCache(tmp_path / "cache", max_bytes=0)
+        cache.put("old", "s", {"f": _file(tmp_path / "old", 100)})
+        path = cache.put("new", "s", {"f": _file(tmp_path / "new", 100)})
+        assert (path / "f").exists()
+        assert cache.entries()["key"].tolist() == ["new"]
+
+
+def test_recorded_key(tmp_path):
+    path = tmp_path / "features.parquet"
+    assert recorded_key(path) is None
+    path.write_bytes(b"x")
+    record_key(path, "abc")
+    record_key(tmp_path / "other.parquet", "def")
+    assert recorded_key(path) == "abc"
+
+
+def test_rewritten_file_ignores_recorded_key(tmp_path):
+    path = tmp_path / "model.ubj"
+    path.write_bytes(b"old model")
+    record_key(path, "abc")
+    assert artifact_id(path) == "abc"
+
+    path.write_bytes(b"new model, trained outside the cache")
+    assert recorded_key(path) is None
+    assert artifact_id(path) == file_digest(path)
+
+
+class TestBuildSeason:
+    def test_only_changes_recompute(self, tmp_path, monkeypatch, season_games):
+        games = season_games(2020)
+        config = Config(data_dir=tmp_path, rolling_window=10)
+        path = tmp_path / "2020" / "features.parquet"
+        pipeline.build_season(2020, games, config)
+        first = load_parquet(path)
+
+        calls = []
+        build = pipeline.build_feature_matrix
+        monkeypatch.setattr(
+            pipeline,
+            "build_feature_matrix",
+            lambda *a, **kw: calls.append(1) or build(*a, **kw),
+        )
+
+        # Unchanged inputs: nothing to do
+        pipeline.build_season(2020, games, config)
+        assert calls == []
+
+        # A feature setting changed: rebuilt
+        wider = config.model_copy(update={"rolling_window": 15})
+        pipeline.build_season(2020, games, wider)
+        assert calls == [1]
+        assert not load_parquet(path).equals(first)
+
+        # Changed back: restored from the cache, not rebuilt
+        pipeline.build_season(2020, games, config)
+        assert calls == [1]
+        pd.testing.assert_frame_equal(load_parquet(path), first)
+
+        # New preseason ratings: rebuilt rather than appended to
+        seed = pd.Series(np.linspace(1450, 1550, 4), index=list("ABCD"))
+        pipeline.build_season(2020, games, config, initial_elo=seed)
+        assert calls == [1, 1]
+
+    def test_new_pitcher_index_rebuilds(self, tmp_path, season_games):
+        games = season_games(2020)
+        games["home_probable_pitcher"] = games["home_team"] + " SP"
+        games["away_probable_pitcher"] = games["away_team"] + " SP"
+        config = Config(data_dir=tmp_path, rolling_window=10)
+        pipeline.build_season(2020, games.iloc[:40], config)
+
+        # Last season's pitching stats arrive along with new games
+        index = build_pitcher_index(
+            pd.DataFrame(
+                {
+                    "Name": [f"{t} SP" for t in "ABCD"],
+                    "IP": 100.0,
+                    "FIP": [3.0, 3.5, 4.0, 4.5],
+                    "WHIP": 1.2,
+                }
+            )
+        )
+        pipeline.build_season(2020, games, config, pitcher_index=index)
+        saved = load_parquet(tmp_path / "2020" / "features.parquet")
+        assert saved[["home_sp_fip", "away_sp_fip"]].notna().all().all()
+        expected = pipeline.build_feature_matrix(
+            games, config, pitcher_index=index
+        ).reset_index(drop=True)
+        pd.testing.assert_frame_equal(saved, expected)
@@ -0,0 +1,104 @@
+"""Tests for the multi-season feature dataset."""
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from charliehustle.config import Config
+from charliehustle.data.dataset import (
+    _filter,
+    features_dataset,
+    features_path,
+    load_feature_arrays,
+    load_features,
+    missing_seasons,
+    save_features,
+)
+from charliehustle.data.features import FEATURE_COLUMNS
+
+
+def _season_features(season: int, n_days: int = 90) -> pd.DataFrame:
+    """Three games a day from April, with random feature values."""
+    rng = np.random.default_rng(season)
+    n = n_days * 3
+    features = pd.DataFrame(
+        rng.normal(size=(n, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS
+    )
+    features.insert(0, "game_id", season * 1000 + np.arange(n))
+    features.insert(
+        1,
+        "date",
+        pd.Timestamp(f"{season}-04-01")
+        + pd.to_timedelta(np.arange(n) // 3, unit="D"),
+    )
+    features["home_win"] = rng.integers(0, 2, n)
+    return features
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = Config(data_dir=tmp_path)
+    for season in (2021, 2022, 2023):
+        save_features(_season_features(season), features_path(season, config))
+    return config
+
+
+def test_one_row_group_per_month(config):
+    metadata = pq.ParquetFile(features_path(2022, config)).metadata
+    # April, May, June
+    assert metadata.num_row_groups == 3
+    assert metadata.row_group(0).num_rows == 30 * 3
+
+
+def test_load_features_matches_concat(config):
+    seasons = [2021, 2022, 2023]
+    features = load_features(seasons, config)
+    expected = pd.concat(
+        [_season_features(s) for s in seasons], ignore_index=True
+    )
+    pd.testing.assert_frame_equal(features.drop(columns="season"), expected)
+    assert features["season"].tolist() == np.repeat(seasons, 270).tolist()
+
+
+def test_columns_and_dates_pushed_down(config):
+    features = load_features(
+        range(2021, 2024),
+        config,
+        columns=["date", "home_elo"],
+        start="2022-05-01",
+        end="2022-06-01",
+    )
+    assert list(features.columns) == ["date", "home_elo"]
+    assert len(features) == 31 * 3
+    assert features["date"].min() == pd.Timestamp("2022-05-01")
+    assert features["date"].max() == pd.Timestamp("2022-05-31")
+
+    # Only the one matching row group is read
+    expression = _filter("2022-05-01", "2022-06-01")
+    row_groups = [
+        row_group
+        for fragment in features_dataset(
+            [2021, 2022, 2023], config
+        ).get_fragments()
+        for row_group in fragment.split_by_row_group(expression)
+    ]
+    assert len(row_groups) == 1
+
+
+def test_feature_arrays(config):
+    X, y = load_feature_arrays(
+        [2022, 2023], FEATURE_COLUMNS, "home_win", config, start="2022-06-01"
+    )
+    expected = load_features([2022, 2023], config, start="2022-06-01")
+    assert X.dtype == np.float32 and X.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(
+        X, expected[FEATURE_COLUMNS].to_numpy(np.float32)
+    )
+    np.testing.assert_array_equal(y, expected["home_win"])
+
+
+def test_missing_seasons(config):
+    assert missing_seasons([2020, 2021, 2024], config) == [2020, 2024]
+    with pytest.raises(FileNotFoundError, match="2020"):
+        load_features([2020, 2021], config)
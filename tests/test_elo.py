@@ -0,0 +1,249 @@
+"""Tests for the array-based ELO engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.config import Config
+from charliehustle.data import elo
+from charliehustle.data.elo import (
+    encode_teams,
+    final_elo_ratings,
+    load_elo_ratings,
+    preseason_ratings,
+    regress_to_mean,
+    rename_carried_ratings,
+    run_elo,
+    save_elo_ratings,
+    sweep_elo,
+)
+from charliehustle.data.features import compute_elo_ratings
+
+
+def _make_games(n: int = 200, seed: int = 0) -> pd.DataFrame:
+    """Random games between a handful of teams."""
+    rng = np.random.default_rng(seed)
+    teams = np.array(["A", "B", "C", "D", "E", "F"])
+    home = rng.integers(0, len(teams), n)
+    away = (home + rng.integers(1, len(teams), n)) % len(teams)
+    return pd.DataFrame(
+        {
+            "game_id": np.arange(n),
+            "date": pd.Timestamp("2024-04-01") + pd.to_timedelta(np.arange(n), "D"),
+            "home_team": teams[home],
+            "away_team": teams[away],
+            "home_win": rng.integers(0, 2, n),
+        }
+    )
+
+
+def _reference_elo(games: pd.DataFrame, config: Config) -> np.ndarray:
+    """Row-by-row ELO, matching the original dict-based implementation."""
+    ratings: dict[str, float] = {}
+    rows = []
+    for home, away, home_win in zip(
+        games["home_team"], games["away_team"], games["home_win"]
+    ):
+        h_elo = ratings.get(home, config.elo_mean)
+        a_elo = ratings.get(away, config.elo_mean)
+        exp_home = 1 / (
+            1 + 10 ** ((a_elo - h_elo - config.elo_home_advantage) / 400)
+        )
+        rows.append((h_elo, a_elo, exp_home))
+        actual_home = float(home_win)
+        ratings[home] = h_elo + config.elo_k * (actual_home - exp_home)
+        ratings[away] = a_elo + config.elo_k * (
+            (1 - actual_home) - (1 - exp_home)
+        )
+    return np.array(rows)
+
+
+@pytest.fixture(params=["compiled", "python"])
+def engine(request, monkeypatch):
+    if request.param == "compiled":
+        if elo._elo_loop_compiled is None:
+            pytest.skip("numba not installed")
+    else:
+        monkeypatch.setattr(elo, "_elo_loop_compiled", None)
+        monkeypatch.setattr(elo, "_sweep_loop_compiled", None)
+    return request.param
+
+
+class TestEncodeTeams:
+    def test_round_trip(self):
+        games = _make_games(50)
+        home_idx, away_idx, teams = encode_teams(games)
+        assert list(teams[home_idx]) == list(games["home_team"])
+        assert list(teams[away_idx]) == list(games["away_team"])
+
+
+class TestRunElo:
+    @pytest.mark.parametrize(
+        "config",
+        [Config(), Config(elo_k=10.0, elo_home_advantage=0.0)],
+    )
+    def test_matches_reference(self, engine, config):
+        games = _make_games()
+        result = compute_elo_ratings(games, config)
+        expected = _reference_elo(games, config)
+        np.testing.assert_array_equal(
+            result[["home_elo", "away_elo", "elo_home_prob"]].values, expected
+        )
+
+    def test_does_not_modify_input_ratings(self, engine):
+        games = _make_games(20)
+        home_idx, away_idx, teams = encode_teams(games)
+        ratings = np.full(len(teams), 1500.0)
+        *_, final = run_elo(
+            home_idx, away_idx, games["home_win"].values, ratings, 4.0, 24.0
+        )
+        assert (ratings == 1500.0).all()
+        assert not (final == 1500.0).all()
+
+    def test_rating_sum_is_conserved(self, engine):
+        games = _make_games()
+        home_idx, away_idx, teams = encode_teams(games)
+        ratings = np.full(len(teams), 1500.0)
+        *_, final = run_elo(
+            home_idx, away_idx, games["home_win"].values, ratings, 4.0, 24.0
+        )
+        assert final.sum() == pytest.approx(ratings.sum())
+
+
+class TestSeasonCarryOver:
+    def test_initial_ratings_seed_first_game(self):
+        games = _make_games(10)
+        initial = pd.Series({"A": 1550.0, "B": 1450.0})
+        result = compute_elo_ratings(games, initial_ratings=initial)
+        first = {
+            games["home_team"].iloc[0]: result["home_elo"].iloc[0],
+            games["away_team"].iloc[0]: result["away_elo"].iloc[0],
+        }
+        for team, rating in first.items():
+            assert rating == initial.get(team, 1500.0)
+
+    def test_final_ratings_match_engine(self, engine):
+        config = Config()
+        games = _make_games()
+        home_idx, away_idx, teams = encode_teams(games)
+        *_, final = run_elo(
+            home_idx,
+            away_idx,
+            games["home_win"].values,
+            np.full(len(teams), config.elo_mean),
+            config.elo_k,
+            config.elo_home_advantage,
+        )
+        result = final_elo_ratings(compute_elo_ratings(games, config), config)
+        np.testing.assert_array_equal(result.reindex(teams).values, final)
+
+    def test_regress_to_mean(self):
+        config = Config(elo_reversion_factor=0.25)
+        ratings = pd.Series({"A": 1600.0, "B": 1400.0})
+        result = regress_to_mean(ratings, config)
+        assert result["A"] == 1575.0
+        assert result["B"] == 1425.0
+
+    def test_multi_season_matches_chained_seasons(self, engine):
+        config = Config()
+        first = _make_games(100, seed=1)
+        second = _make_games(100, seed=2)
+        second["date"] = second["date"] + pd.DateOffset(years=1)
+        combined = compute_elo_ratings(
+            pd.concat([first, second], ignore_index=True), config
+        )
+
+        seed = regress_to_mean(
+            final_elo_ratings(compute_elo_ratings(first, config), config),
+            config,
+        )
+        chained = compute_elo_ratings(second, config, initial_ratings=seed)
+        np.testing.assert_allclose(
+            combined["home_elo"].iloc[100:].values, chained["home_elo"].values
+        )
+
+    def test_undated_games_are_one_season(self):
+        games = _make_games(300)
+        assert games["date"].dt.year.nunique() == 2
+        undated = compute_elo_ratings(games.drop(columns="date"))
+        single = compute_elo_ratings(games.assign(season=2024))
+        pd.testing.assert_frame_equal(
+            undated, single.drop(columns=["date", "season"])
+        )
+
+    def test_ratings_follow_franchise_renames(self):
+        config = Config()
+        first = _make_games(100, seed=1).replace(
+            {"A": "Cleveland Indians", "B": "Oakland Athletics"}
+        )
+        second = _make_games(100, seed=2).replace(
+            {"A": "Cleveland Guardians", "B": "Athletics"}
+        )
+        seed = final_elo_ratings(compute_elo_ratings(first, config), config)
+        result = compute_elo_ratings(second, config, initial_ratings=seed)
+
+        renamed = seed.rename(
+            {
+                "Cleveland Indians": "Cleveland Guardians",
+                "Oakland Athletics": "Athletics",
+            }
+        )
+        expected = compute_elo_ratings(second, config, initial_ratings=renamed)
+        pd.testing.assert_frame_equal(result, expected)
+        guardians = result["home_team"] == "Cleveland Guardians"
+        assert result.loc[guardians, "home_elo"].iloc[0] != config.elo_mean
+
+    def test_current_name_wins_over_renamed(self):
+        ratings = pd.Series(
+            {"Cleveland Indians": 1450.0, "Cleveland Guardians": 1550.0}
+        )
+        result = rename_carried_ratings(ratings, ["Cleveland Guardians"])
+        assert result.to_dict() == {"Cleveland Guardians": 1550.0}
+
+    def test_preseason_ratings_round_trip(self, tmp_path):
+        config = Config(data_dir=tmp_path)
+        assert preseason_ratings(2024, config) is None
+
+        ratings = pd.Series({"A": 1520.0, "B": 1480.0})
+        save_elo_ratings(ratings, tmp_path / "2023" / "elo_ratings.parquet")
+        loaded = load_elo_ratings(tmp_path / "2023" / "elo_ratings.parquet")
+        pd.testing.assert_series_equal(loaded, ratings, check_names=False)
+
+        seeded = preseason_ratings(2024, config)
+        pd.testing.assert_series_equal(seeded, regress_to_mean(loaded, config))
+
+
+class TestSweepElo:
+    def test_matches_single_run(self, engine):
+        games = _make_games()
+        config = Config(elo_k=6.0, elo_home_advantage=20.0)
+        result = sweep_elo(games, [6.0], [20.0], [0.0])
+        probs = compute_elo_ratings(games, config)["elo_home_prob"]
+        expected = ((probs - games["home_win"]) ** 2).mean()
+        assert result["brier_score"].iloc[0] == pytest.approx(expected)
+
+    def test_grid_is_cartesian_and_sorted(self, engine):
+        games = _make_games()
+        result = sweep_elo(games, [2.0, 4.0, 8.0], [0.0, 24.0], [0.0, 0.5])
+        assert len(result) == 12
+        assert result["brier_score"].is_monotonic_increasing
+        assert (result["log_loss"] > 0).all()
+
+    def test_reversion_applies_at_season_boundary(self, engine):
+        games = pd.concat(
+            [_make_games(100, seed=1), _make_games(100, seed=2)],
+            ignore_index=True,
+        )
+        games["season"] = [2023] * 100 + [2024] * 100
+        first = sweep_elo(games.iloc[:100], [4.0], [24.0], [0.0, 1.0])
+        both = sweep_elo(games, [4.0], [24.0], [0.0, 1.0])
+        # Identical within one season, different once the boundary is crossed
+        assert first["brier_score"].nunique() == 1
+        assert both["brier_score"].nunique() == 2
+
+    def test_warmup_excludes_games(self, engine):
+        games = _make_games()
+        probs = compute_elo_ratings(games)["elo_home_prob"]
+        expected = ((probs - games["home_win"]) ** 2).iloc[50:].mean()
+        result = sweep_elo(games, [4.0], [24.0], [0.0], warmup=50)
+        assert result["brier_score"].iloc[0] == pytest.approx(expected)
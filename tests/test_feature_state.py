@@ -0,0 +1,171 @@
+"""Tests for incremental feature builds."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.config import Config
+from charliehustle.data import feature_state
+from charliehustle.data.feature_state import (
+    build_feature_state,
+    extend_feature_matrix,
+    feature_state_path,
+    load_feature_state,
+    save_feature_state,
+)
+from charliehustle.data.features import build_feature_matrix, min_history_games
+
+
+def _make_games(n_days: int = 60, seed: int = 0) -> pd.DataFrame:
+    """Three games a day between six teams, each team playing daily."""
+    rng = np.random.default_rng(seed)
+    teams = np.array(["A", "B", "C", "D", "E", "F"])
+    records = []
+    for day in range(n_days):
+        order = rng.permutation(len(teams))
+        for g in range(3):
+            home_score, away_score = rng.choice(10, size=2, replace=False)
+            home, away = teams[order[2 * g]], teams[order[2 * g + 1]]
+            # Five-man rotations
+            home_sp, away_sp = f"{home} SP{day % 5}", f"{away} SP{day % 5}"
+            winner, loser = (
+                (home_sp, away_sp) if home_score > away_score else (away_sp, home_sp)
+            )
+            records.append(
+                {
+                    "game_id": day * 3 + g,
+                    "date": pd.Timestamp("2024-04-01") + pd.Timedelta(days=day),
+                    "home_team": home,
+                    "away_team": away,
+                    "home_score": home_score,
+                    "away_score": away_score,
+                    "home_win": int(home_score > away_score),
+                    "winning_pitcher": winner,
+                    "losing_pitcher": loser,
+                    "home_probable_pitcher": home_sp,
+                    "away_probable_pitcher": away_sp,
+                }
+            )
+    # Leave a gap so rest days are exercised
+    games = pd.DataFrame(records)
+    games.loc[games["date"] > "2024-04-20", "date"] += pd.Timedelta(days=4)
+    return games
+
+
+def _incremental(games, cutoffs, config, initial_elo=None):
+    """Build through cutoffs[0], then extend one chunk at a time."""
+    min_games = min_history_games(config, initial_elo is not None)
+    first = games.iloc[: cutoffs[0]]
+    parts = [build_feature_matrix(first, config, initial_elo=initial_elo)]
+    state = build_feature_state(first, config, initial_elo, min_games)
+    for end in cutoffs[1:]:
+        new, state = extend_feature_matrix(games.iloc[:end], state, config)
+        parts.append(new)
+    return pd.concat(parts, ignore_index=True), state
+
+
+class TestExtendFeatureMatrix:
+    @pytest.mark.parametrize(
+        "initial_elo", [None, pd.Series({"A": 1530.0, "C": 1480.0})]
+    )
+    def test_matches_full_build(self, initial_elo):
+        config = Config(rolling_window=10, warm_start_min_games=3)
+        games = _make_games()
+        full = build_feature_matrix(games, config, initial_elo=initial_elo)
+        # Cutoffs split days (3 games/day) to exercise partial-day checkpoints
+        cutoffs = [50, 61, 100, 150, len(games)]
+        result, _ = _incremental(games, cutoffs, config, initial_elo)
+        pd.testing.assert_frame_equal(
+            result, full.reset_index(drop=True), check_exact=True
+        )
+
+    def test_seed_under_old_name(self):
+        config = Config(rolling_window=10, warm_start_min_games=3)
+        games = _make_games().replace({"A": "Cleveland Guardians"})
+        old = pd.Series({"Cleveland Indians": 1530.0, "C": 1480.0})
+        new = old.rename({"Cleveland Indians": "Cleveland Guardians"})
+        full = build_feature_matrix(games, config, initial_elo=new)
+        result, _ = _incremental(games, [50, 100, len(games)], config, old)
+        pd.testing.assert_frame_equal(
+            result, full.reset_index(drop=True), check_exact=True
+        )
+
+    def test_no_new_games_is_a_no_op(self):
+        config = Config(rolling_window=10)
+        games = _make_games()
+        state = build_feature_state(games, config)
+        new, after = extend_feature_matrix(games, state, config)
+        assert len(new) == 0
+        assert after == state
+
+    def test_state_skips_season_features(self, monkeypatch):
+        config = Config(rolling_window=10)
+        games = _make_games()
+        expected = build_feature_state(games, config)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("computed season features for state only")
+
+        monkeypatch.setattr(feature_state, "compute_pitcher_features", fail)
+        monkeypatch.setattr(feature_state, "compute_team_form", fail)
+        assert build_feature_state(games, config) == expected
+
+    def test_new_team_starts_fresh(self):
+        config = Config(rolling_window=10, warm_start_min_games=0)
+        games = _make_games(10)
+        state = build_feature_state(games, config, min_games=0)
+        extra = pd.DataFrame(
+            [
+                {
+                    "game_id": 999,
+                    "date": games["date"].max() + pd.Timedelta(days=1),
+                    "home_team": "Z",
+                    "away_team": "A",
+                    "home_score": 3,
+                    "away_score": 2,
+                    "home_win": 1,
+                }
+            ]
+        )
+        new, state = extend_feature_matrix(
+            pd.concat([games, extra], ignore_index=True), state, config
+        )
+        row = new.iloc[0]
+        assert row["home_elo"] == config.elo_mean
+        assert row["home_games_played"] == 0
+        assert row["home_rest_days"] == 3
+        assert "Z" in state.teams
+
+
+class TestFeatureStatePersistence:
+    def test_round_trip(self, tmp_path):
+        config = Config(data_dir=tmp_path, rolling_window=10)
+        games = _make_games(20)
+        state = build_feature_state(games, config)
+        path = feature_state_path(2024, config)
+        save_feature_state(state, path)
+        assert load_feature_state(path, config) == state
+
+    def test_missing_returns_none(self, tmp_path):
+        config = Config(data_dir=tmp_path)
+        assert load_feature_state(feature_state_path(2024, config), config) is None
+
+    def test_config_change_invalidates(self, tmp_path):
+        config = Config(data_dir=tmp_path, rolling_window=10)
+        path = feature_state_path(2024, config)
+        save_feature_state(build_feature_state(_make_games(20), config), path)
+        changed = Config(data_dir=tmp_path, rolling_window=10, elo_k=8.0)
+        assert load_feature_state(path, changed) is None
+
+    def test_resumes_after_round_trip(self, tmp_path):
+        config = Config(data_dir=tmp_path, rolling_window=10)
+        games = _make_games()
+        path = feature_state_path(2024, config)
+        save_feature_state(build_feature_state(games.iloc[:90], config), path)
+        state = load_feature_state(path, config)
+        new, _ = extend_feature_matrix(games, state, config)
+        full = build_feature_matrix(games, config)
+        expected = full[full["game_id"] >= 90].reset_index(drop=True)
+        pd.testing.assert_frame_equal(
+            new.reset_index(drop=True), expected, check_exact=True
+        )
@@ -0,0 +1,54 @@
+"""Tests for the memory-mapped feature store."""
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from charliehustle.data.feature_store import (
+    load_feature_store,
+    save_feature_store,
+)
+
+COLUMNS = ["a", "b", "c"]
+
+
+def _arrays(n: int = 1000) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(n, len(COLUMNS))), rng.integers(0, 2, n)
+
+
+def test_round_trip_is_zero_copy(tmp_path):
+    X, y = _arrays()
+    path = tmp_path / "features.arrow"
+    save_feature_store(X, y, COLUMNS, path)
+
+    allocated = pa.total_allocated_bytes()
+    stored_X, stored_y = load_feature_store(path, COLUMNS)
+    assert pa.total_allocated_bytes() == allocated
+
+    assert stored_X.dtype == np.float32
+    assert stored_X.flags["C_CONTIGUOUS"]
+    assert not stored_X.flags["WRITEABLE"]
+    np.testing.assert_array_equal(stored_X, X.astype(np.float32))
+    np.testing.assert_array_equal(stored_y, y)
+
+
+def test_empty(tmp_path):
+    path = tmp_path / "features.arrow"
+    save_feature_store(np.empty((0, 3)), np.empty(0, int), COLUMNS, path)
+    X, y = load_feature_store(path, COLUMNS)
+    assert X.shape == (0, 3) and len(y) == 0
+
+
+def test_rejects_other_columns(tmp_path):
+    X, y = _arrays()
+    path = tmp_path / "features.arrow"
+    save_feature_store(X, y, COLUMNS, path)
+    with pytest.raises(ValueError, match="expected"):
+        load_feature_store(path, ["a", "c", "b"])
+
+
+def test_rejects_mismatched_shapes(tmp_path):
+    X, y = _arrays()
+    with pytest.raises(ValueError, match="does not match"):
+        save_feature_store(X, y[:-1], COLUMNS, tmp_path / "features.arrow")
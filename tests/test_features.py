@@ -5,8 +5,11 @@ import pytest
 
 from charliehustle.config import Config
 from charliehustle.data.features import (
+    FEATURE_COLUMNS,
+    build_feature_matrix,
     compute_elo_ratings,
     compute_rest_days,
+    compute_streaks,
     compute_team_rolling_stats,
 )
 
@@ -119,3 +122,43 @@ class TestRestDays:
         games = pd.DataFrame(records)
         result = compute_rest_days(games)
         assert result["home_rest_days"].iloc[1] == 7
+
+
+class TestStreaks:
+    def test_first_game_is_zero(self):
+        result = compute_streaks(_make_games(1))
+        assert result["home_streak"].iloc[0] == 0
+        assert result["away_streak"].iloc[0] == 0
+
+    def test_alternating_results(self):
+        # Home team alternates L, W, L, W...
+        result = compute_streaks(_make_games(4))
+        assert list(result["home_streak"]) == [0, -1, 1, -1]
+        assert list(result["away_streak"]) == [0, 1, -1, 1]
+
+    def test_streak_accumulates(self):
+        games = _make_games(5)
+        games["home_win"] = 1
+        result = compute_streaks(games)
+        assert list(result["home_streak"]) == [0, 1, 2, 3, 4]
+        assert list(result["away_streak"]) == [0, -1, -2, -3, -4]
+
+
+class TestBuildFeatureMatrix:
+    def test_cold_start_drops_rolling_window(self):
+        games = _make_games(20)
+        config = Config(rolling_window=5)
+        result = build_feature_matrix(games, config)
+        assert len(result) == 15
+
+    def test_warm_start_drops_fewer_games(self):
+        games = _make_games(20)
+        config = Config(rolling_window=5, warm_start_min_games=2)
+        initial = pd.Series({"Team A": 1510.0, "Team B": 1490.0})
+        result = build_feature_matrix(games, config, initial_elo=initial)
+        assert len(result) == 18
+        assert result["home_elo"].iloc[0] != 1500.0
+
+    def test_has_all_feature_columns(self):
+        result = build_feature_matrix(_make_games(20), Config(rolling_window=5))
+        assert set(FEATURE_COLUMNS) <= set(result.columns)
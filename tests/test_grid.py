@@ -0,0 +1,64 @@
+"""Tests for the staking grid search."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.betting.grid import grid_search, staking_grid
+from charliehustle.betting.simulate import place_bets
+from charliehustle.config import Config
+
+
+@pytest.fixture
+def games() -> pd.DataFrame:
+    rng = np.random.default_rng(2)
+    n = 300
+    prob = rng.uniform(0.3, 0.7, n)
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2024-04-01", periods=n),
+            "home_team": "NYY",
+            "away_team": "BOS",
+            "model_home_prob": prob,
+            "home_line": np.full(n, -105.0),
+            "away_line": np.full(n, -105.0),
+            "home_win": (rng.random(n) < prob).astype(int),
+        }
+    )
+
+
+def test_staking_grid():
+    base = Config(initial_bankroll=500)
+    configs = staking_grid([0.25, 0.5], [0.0, 0.02, 0.04], [0.05], base)
+    assert len(configs) == 6
+    assert configs[1].kelly_fraction == 0.25
+    assert configs[1].min_edge == 0.02
+    assert all(c.initial_bankroll == 500 for c in configs)
+
+
+class TestGridSearch:
+    def test_matches_backtest(self, games):
+        configs = staking_grid([0.25, 1.0], [0.02, 0.5], [0.05, 0.2])
+        summary = grid_search(games, configs)
+        assert len(summary) == len(configs)
+
+        for config, row in zip(configs, summary.itertuples()):
+            results = place_bets(games, config)
+            assert row.kelly_fraction == config.kelly_fraction
+            assert row.n_bets == len(results)
+            if len(results):
+                assert row.final_bankroll == results["bankroll"].iloc[-1]
+                peak = max(config.initial_bankroll, results["bankroll"].max())
+                assert row.max_drawdown >= 0
+                assert row.max_drawdown <= 1 - results["bankroll"].min() / peak
+            else:
+                # 50% edge: no bets
+                assert row.final_bankroll == config.initial_bankroll
+                assert row.roi == 0
+                assert row.max_drawdown == 0
+
+    def test_parallel_matches_sequential(self, games):
+        configs = staking_grid([0.1, 0.25, 0.5], [0.0, 0.03], [0.02, 0.05])
+        pd.testing.assert_frame_equal(
+            grid_search(games, configs, jobs=2), grid_search(games, configs)
+        )
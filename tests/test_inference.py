@@ -0,0 +1,89 @@
+"""Tests for the flattened tree-ensemble inference path."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from xgboost import XGBClassifier, XGBRegressor
+
+from charliehustle.data.features import FEATURE_COLUMNS
+from charliehustle.models import inference
+from charliehustle.models.inference import compile_model
+from charliehustle.models.predict import predict_games
+from charliehustle.models.train import build_model
+
+
+def _training_set(
+    n: int = 600, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, len(FEATURE_COLUMNS)))
+    y = (X[:, 0] - X[:, 3] + rng.normal(size=n) > 0).astype(int)
+    X[rng.random(X.shape) < 0.05] = np.nan
+    return X, y
+
+
+@pytest.fixture(params=["compiled", "python"])
+def engine(request, monkeypatch):
+    if request.param == "compiled":
+        if inference._predict_loop_compiled is None:
+            pytest.skip("numba not installed")
+    else:
+        monkeypatch.setattr(inference, "_predict_loop_compiled", None)
+    return request.param
+
+
+class TestTreeEnsemble:
+    @pytest.mark.parametrize("max_depth", [1, 4, 7])
+    def test_matches_predict_proba(self, engine, max_depth):
+        X, y = _training_set()
+        model = build_model(n_estimators=50, max_depth=max_depth).fit(X, y)
+        ensemble = compile_model(model)
+        expected = model.predict_proba(X)[:, 1]
+        np.testing.assert_allclose(
+            ensemble.predict_proba(X), expected, rtol=0, atol=1e-6
+        )
+        # Single rows and small slates too
+        np.testing.assert_allclose(
+            ensemble.predict_proba(X[:1]), expected[:1], rtol=0, atol=1e-6
+        )
+
+    def test_early_stopped_model_uses_best_iteration(self, engine):
+        X, y = _training_set()
+        model = build_model(n_estimators=500, early_stopping_rounds=5)
+        model.fit(X[:400], y[:400], eval_set=[(X[400:], y[400:])])
+        ensemble = compile_model(model)
+        assert ensemble.n_trees == model.best_iteration + 1
+        np.testing.assert_allclose(
+            ensemble.predict_proba(X),
+            model.predict_proba(X)[:, 1],
+            rtol=0,
+            atol=1e-6,
+        )
+
+    def test_rejects_wrong_width(self):
+        X, y = _training_set()
+        ensemble = compile_model(build_model(n_estimators=5).fit(X, y))
+        with pytest.raises(ValueError, match="feature columns"):
+            ensemble.predict_proba(X[:, :-1])
+
+    def test_rejects_other_objectives(self):
+        X, y = _training_set()
+        with pytest.raises(ValueError, match="Unsupported objective"):
+            compile_model(XGBRegressor(n_estimators=5).fit(X, y))
+
+
+def test_predict_games_with_ensemble():
+    X, y = _training_set()
+    model = XGBClassifier(n_estimators=20, max_depth=3).fit(X, y)
+    games = pd.DataFrame(X[:15], columns=FEATURE_COLUMNS)
+    games["home_team"] = "NYY"
+    games["away_team"] = "BOS"
+
+    expected = predict_games(model, games)
+    result = predict_games(compile_model(model), games)
+    pd.testing.assert_series_equal(
+        result["model_pick"], expected["model_pick"]
+    )
+    np.testing.assert_allclose(
+        result["model_home_prob"], expected["model_home_prob"], atol=1e-6
+    )
@@ -0,0 +1,73 @@
+"""Tests for the Monte Carlo bankroll simulator."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.betting.monte_carlo import simulate_paths, summarize_paths
+from charliehustle.betting.simulate import backtest
+from charliehustle.config import Config
+
+
+@pytest.fixture
+def games() -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    n = 200
+    prob = rng.uniform(0.3, 0.7, n)
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2024-04-01", periods=n),
+            "home_team": "NYY",
+            "away_team": "BOS",
+            "model_home_prob": prob,
+            "home_line": np.full(n, 105.0),
+            "away_line": np.full(n, 105.0),
+            "home_win": (rng.random(n) < prob).astype(int),
+        }
+    )
+
+
+class TestSimulatePaths:
+    @pytest.mark.parametrize("method", ["model", "bootstrap"])
+    def test_seeded(self, games, method):
+        a = simulate_paths(games, n_paths=50, method=method, seed=3)
+        b = simulate_paths(games, n_paths=50, method=method, seed=3)
+        c = simulate_paths(games, n_paths=50, method=method, seed=4)
+        pd.testing.assert_frame_equal(a, b)
+        assert not a.equals(c)
+
+    def test_chunking(self, games):
+        paths = simulate_paths(games, n_paths=25, chunk_size=10)
+        assert len(paths) == 25
+        assert paths.index.tolist() == list(range(25))
+
+    def test_certain_outcomes_match_backtest(self, games):
+        # With every bet a sure thing, each path is the actual backtest
+        sure = games.assign(home_win=(games["model_home_prob"] >= 0.5))
+        sure["model_home_prob"] = np.where(
+            sure["home_win"], 1.0 - 1e-12, 1e-12
+        )
+        results = backtest(sure, Config())
+        paths = simulate_paths(sure, n_paths=5)
+        assert (paths["final_bankroll"] == results["bankroll"].iloc[-1]).all()
+        assert (paths["n_bets"] == len(results)).all()
+        assert (paths["max_drawdown"] == 0).all()
+        assert not paths["ruined"].any()
+
+    def test_ruin(self, games):
+        config = Config(kelly_fraction=1.0, max_bet_fraction=1.0)
+        paths = simulate_paths(
+            games, config, n_paths=200, method="bootstrap", ruin_fraction=0.9
+        )
+        assert paths["ruined"].mean() > 0
+        assert (paths.loc[paths["ruined"], "max_drawdown"] > 0.1).all()
+
+    def test_unknown_method(self, games):
+        with pytest.raises(ValueError):
+            simulate_paths(games, method="shuffle")
+
+
+def test_summarize_paths(games):
+    summary = summarize_paths(simulate_paths(games, n_paths=100))
+    assert summary.index.tolist() == ["p5", "p25", "p50", "p75", "p95"]
+    assert summary["roi"].is_monotonic_increasing
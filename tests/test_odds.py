@@ -1,5 +1,7 @@
 """Tests for odds conversion and Kelly criterion."""
 
+import numpy as np
+import pandas as pd
 import pytest
 
 from charliehustle.betting.kelly import fractional_kelly, kelly_criterion
@@ -80,3 +82,48 @@ class TestFractionalKelly:
 
     def test_no_edge_returns_zero(self):
         assert fractional_kelly(0.5, 2.0) == 0.0
+
+
+class TestArrayInputs:
+    AMERICAN = [-250.0, -150.0, -110.0, 100.0, 120.0, 300.0]
+
+    @pytest.mark.parametrize(
+        "fn, values",
+        [
+            (american_to_decimal, AMERICAN),
+            (american_to_implied_prob, AMERICAN),
+            (decimal_to_american, [1.2, 1.5, 1.91, 2.0, 2.5, 4.0]),
+            (implied_prob_to_american, [0.2, 0.4, 0.5, 0.55, 0.7, 0.9]),
+        ],
+    )
+    def test_matches_scalar(self, fn, values):
+        expected = [fn(v) for v in values]
+        assert all(isinstance(e, float) for e in expected)
+        assert fn(np.array(values)).tolist() == expected
+
+        series = pd.Series(values, index=list("abcdef"), name="line")
+        result = fn(series)
+        assert isinstance(result, pd.Series)
+        assert result.index.tolist() == list("abcdef")
+        assert result.name == "line"
+        assert result.tolist() == expected
+
+    def test_kelly_broadcasts(self):
+        probs = np.array([0.3, 0.5, 0.6, 0.8])
+        result = fractional_kelly(probs, 2.0, fraction=0.5, max_bet=0.1)
+        assert result.tolist() == [
+            fractional_kelly(p, 2.0, fraction=0.5, max_bet=0.1)
+            for p in probs.tolist()
+        ]
+        assert kelly_criterion(pd.Series(probs), 2.0).tolist() == [
+            0.0,
+            0.0,
+            pytest.approx(0.2),
+            pytest.approx(0.6),
+        ]
+
+    def test_kelly_grid(self):
+        fractions = np.array([[0.25], [0.5], [1.0]])
+        result = fractional_kelly(np.array([0.55, 0.6]), 2.0, fractions, 1.0)
+        assert result.shape == (3, 2)
+        assert result[2].tolist() == pytest.approx([0.1, 0.2])
@@ -0,0 +1,42 @@
+"""Tests for the shared-payload worker pools."""
+
+import os
+
+from charliehustle.parallel import worker_data, worker_pool, worker_threads
+
+
+def _read(offset: int) -> int:
+    return worker_data() + offset
+
+
+def _double(data: int) -> int:
+    return 2 * data
+
+
+def _setup_pid(data: int) -> tuple[int, int]:
+    return data, os.getpid()
+
+
+def _pid_of_setup(_) -> bool:
+    return worker_data()[1] == os.getpid()
+
+
+class TestWorkerPool:
+    def test_tasks_see_data(self):
+        with worker_pool(2, 10) as pool:
+            assert list(pool.map(_read, range(4))) == [10, 11, 12, 13]
+
+    def test_setup_runs_in_each_worker(self):
+        with worker_pool(2, 10, setup=_double) as pool:
+            assert list(pool.map(_read, [1])) == [21]
+        with worker_pool(2, 10, setup=_setup_pid) as pool:
+            assert all(pool.map(_pid_of_setup, range(4)))
+
+
+def test_worker_threads(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    assert worker_threads(1) == 8
+    assert worker_threads(3) == 2
+    assert worker_threads(16) == 1
+    monkeypatch.setattr(os, "cpu_count", lambda: None)
+    assert worker_threads(2) == 1
@@ -0,0 +1,86 @@
+"""Tests for the multi-season build pipeline."""
+
+import pandas as pd
+import pytest
+
+from charliehustle.config import Config
+from charliehustle.data import pipeline
+from charliehustle.data.elo import load_elo_ratings, regress_to_mean
+from charliehustle.data.storage import load_parquet
+from charliehustle.data.team_form import team_form_path, team_form_table
+
+
+@pytest.fixture
+def fake_fetch(monkeypatch, season_games):
+    def fetch(season, config, update=False):
+        if season == 2013:
+            raise ConnectionError("API unavailable")
+        return season_games(season)
+
+    monkeypatch.setattr(pipeline, "fetch_season_games", fetch)
+
+
+def _outputs(data_dir, seasons):
+    return {s: load_parquet(data_dir / f"{s}" / "features.parquet") for s in seasons}
+
+
+class TestBuildSeasons:
+    def test_parallel_matches_sequential(self, tmp_path, fake_fetch):
+        seasons = [2010, 2011, 2012]
+        for jobs in (1, 3):
+            config = Config(data_dir=tmp_path / f"jobs{jobs}", rolling_window=10)
+            failures = pipeline.build_seasons(seasons, config, jobs=jobs, echo=print)
+            assert failures == {}
+
+        sequential = _outputs(tmp_path / "jobs1", seasons)
+        parallel = _outputs(tmp_path / "jobs3", seasons)
+        for season in seasons:
+            pd.testing.assert_frame_equal(
+                parallel[season], sequential[season], check_exact=True
+            )
+
+    def test_seasons_are_chained(self, tmp_path, fake_fetch, season_games):
+        config = Config(data_dir=tmp_path, rolling_window=10)
+        pipeline.build_seasons([2011, 2010], config, jobs=2, echo=print)
+
+        end_2010 = load_elo_ratings(tmp_path / "2010" / "elo_ratings.parquet")
+        seed = regress_to_mean(end_2010, config)
+        games = season_games(2011)
+        first = games.iloc[0]
+        features = pipeline.build_feature_matrix(games, config, initial_elo=seed)
+        saved = load_parquet(tmp_path / "2011" / "features.parquet")
+        pd.testing.assert_frame_equal(saved, features.reset_index(drop=True))
+        assert seed[first["home_team"]] != config.elo_mean
+
+    def test_rebuilding_one_season_is_a_no_op(
+        self, tmp_path, fake_fetch, monkeypatch
+    ):
+        config = Config(data_dir=tmp_path, rolling_window=10)
+        pipeline.build_seasons([2010, 2011], config, echo=print)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("rebuilt 2011 from unchanged inputs")
+
+        # 2011 is now seeded from ratings saved on disk, in another order
+        monkeypatch.setattr(pipeline, "build_feature_matrix", fail)
+        assert pipeline.build_seasons([2011], config, echo=print) == {}
+
+    def test_saves_team_form(self, tmp_path, fake_fetch, season_games):
+        config = Config(data_dir=tmp_path, rolling_window=10)
+        pipeline.build_seasons([2010], config, echo=print)
+        expected = team_form_table(season_games(2010), config.form_window)
+        pd.testing.assert_frame_equal(
+            load_parquet(team_form_path(2010, config)), expected
+        )
+
+    def test_failed_season_does_not_stop_others(self, tmp_path, fake_fetch):
+        config = Config(data_dir=tmp_path, rolling_window=10)
+        lines: list[str] = []
+        failures = pipeline.build_seasons(
+            [2012, 2013, 2014], config, jobs=2, echo=lines.append
+        )
+        assert list(failures) == [2013]
+        assert isinstance(failures[2013], ConnectionError)
+        assert (tmp_path / "2012" / "features.parquet").exists()
+        assert (tmp_path / "2014" / "features.parquet").exists()
+        assert any("[2013] fetch failed" in line for line in lines)
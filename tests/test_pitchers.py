@@ -0,0 +1,174 @@
+"""Tests for starting-pitcher features."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.config import Config
+from charliehustle.data.features import FEATURE_COLUMNS, build_feature_matrix
+from charliehustle.data.pitchers import (
+    build_pitcher_index,
+    load_pitcher_index,
+    normalize_names,
+    pitcher_features,
+    pitcher_index_path,
+)
+from charliehustle.data.storage import save_parquet
+
+
+def _make_games(n: int = 400, seed: int = 0) -> pd.DataFrame:
+    """Random games between six teams with a few starters each."""
+    rng = np.random.default_rng(seed)
+    teams = np.array(["A", "B", "C", "D", "E", "F"])
+    home = rng.integers(0, 6, n)
+    away = (home + rng.integers(1, 6, n)) % 6
+    home_score = rng.integers(0, 10, n)
+    away_score = rng.integers(0, 10, n)
+    away_score[home_score == away_score] += 1
+    home_sp = pd.Series(teams[home]) + " SP" + rng.integers(0, 4, n).astype(str)
+    away_sp = pd.Series(teams[away]) + " SP" + rng.integers(0, 4, n).astype(str)
+    home_won = home_score > away_score
+    return pd.DataFrame(
+        {
+            "game_id": np.arange(n),
+            "date": pd.Timestamp("2024-04-01")
+            + pd.to_timedelta(np.arange(n) // 3, unit="D"),
+            "home_team": teams[home],
+            "away_team": teams[away],
+            "home_score": home_score,
+            "away_score": away_score,
+            "home_win": home_won.astype(np.int64),
+            # Relievers get some decisions
+            "winning_pitcher": np.where(
+                rng.random(n) < 0.2, "Closer", np.where(home_won, home_sp, away_sp)
+            ),
+            "losing_pitcher": np.where(home_won, away_sp, home_sp),
+            "home_probable_pitcher": home_sp,
+            "away_probable_pitcher": away_sp,
+        }
+    )
+
+
+def _reference(games: pd.DataFrame, window: int) -> pd.DataFrame:
+    """Game-by-game loop over per-pitcher histories."""
+    runs: dict[str, list[float]] = {}
+    decisions: dict[str, list[int]] = {}
+    rows = []
+    for g in games.itertuples():
+        row = {}
+        for side, sp in [
+            ("home", g.home_probable_pitcher),
+            ("away", g.away_probable_pitcher),
+        ]:
+            past = runs.get(sp, [])
+            record = decisions.get(sp, [])
+            row[f"{side}_sp_starts"] = len(past)
+            row[f"{side}_sp_runs_allowed"] = np.mean(past[-window:]) if past else np.nan
+            row[f"{side}_sp_decision_pct"] = np.mean(record) if record else np.nan
+        rows.append(row)
+        runs.setdefault(g.home_probable_pitcher, []).append(g.away_score)
+        runs.setdefault(g.away_probable_pitcher, []).append(g.home_score)
+        decisions.setdefault(g.winning_pitcher, []).append(1)
+        decisions.setdefault(g.losing_pitcher, []).append(0)
+    return pd.DataFrame(rows, index=games.index)
+
+
+def _stats() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "IDfg": [1, 2, 3, 4],
+            "Name": ["A SP0", "José Berríos", "B SP1", "B SP1"],
+            "IP": [180.0, 150.0, 20.0, 95.5],
+            "FIP": [3.5, 4.0, 6.0, 3.0],
+            "WHIP": [1.1, 1.2, 1.6, 1.0],
+        }
+    )
+
+
+class TestNormalizeNames:
+    def test_accents_case_and_punctuation(self):
+        names = pd.Series(["José Berríos", "  A.J. Minter", "Luis  Garcia Jr."])
+        assert list(normalize_names(names)) == [
+            "jose berrios",
+            "aj minter",
+            "luis garcia jr",
+        ]
+
+    def test_missing_is_empty(self):
+        names = pd.Series([None, "", "Max Fried"], dtype=object)
+        assert list(normalize_names(names)) == ["", "", "max fried"]
+
+
+class TestPitcherIndex:
+    def test_keyed_by_name_keeping_most_innings(self):
+        index = build_pitcher_index(_stats())
+        assert index.index.is_unique
+        assert index.loc["b sp1", "pitcher_id"] == 4
+        assert index.loc["jose berrios", "fip"] == pytest.approx(4.0)
+
+    def test_load_without_stats(self, tmp_path):
+        assert load_pitcher_index(2023, Config(data_dir=tmp_path)) is None
+
+    def test_load_builds_and_reuses(self, tmp_path):
+        config = Config(data_dir=tmp_path)
+        save_parquet(_stats(), tmp_path / "2023" / "pitching_stats.parquet")
+        built = load_pitcher_index(2023, config)
+        assert pitcher_index_path(2023, config).exists()
+        pd.testing.assert_frame_equal(load_pitcher_index(2023, config), built)
+
+
+class TestPitcherFeatures:
+    @pytest.mark.parametrize("window", [1, 3, 5])
+    def test_matches_reference(self, window):
+        games = _make_games()
+        result = pitcher_features(games, window=window)
+        expected = _reference(games, window)
+        pd.testing.assert_frame_equal(
+            result[expected.columns], expected, check_dtype=False
+        )
+
+    def test_no_leakage(self):
+        games = _make_games()
+        before = pitcher_features(games)
+        changed = games.copy()
+        changed.loc[200:, ["home_score", "away_score"]] = 0
+        changed.loc[200:, "winning_pitcher"] = "Nobody"
+        after = pitcher_features(changed)
+        pd.testing.assert_frame_equal(after.iloc[:201], before.iloc[:201])
+
+    def test_seasons_start_over(self):
+        first = _make_games()
+        second = _make_games(seed=1)
+        second["date"] += pd.DateOffset(years=1)
+        games = pd.concat([first, second], ignore_index=True)
+        expected = pd.concat(
+            [pitcher_features(g) for g in (first, second)], ignore_index=True
+        )
+        pd.testing.assert_frame_equal(pitcher_features(games), expected)
+
+    def test_unknown_starters(self):
+        games = _make_games(20).drop(
+            columns=["home_probable_pitcher", "away_probable_pitcher"]
+        )
+        result = pitcher_features(games, build_pitcher_index(_stats()))
+        assert (result["home_sp_starts"] == 0).all()
+        assert (
+            result.drop(columns=["home_sp_starts", "away_sp_starts"]).isna().all().all()
+        )
+
+    def test_previous_season_stats_joined_by_name(self):
+        games = _make_games(50)
+        index = build_pitcher_index(_stats())
+        result = pitcher_features(games, index)
+        is_a0 = games["home_probable_pitcher"] == "A SP0"
+        assert (result.loc[is_a0, "home_sp_fip"] == np.float32(3.5)).all()
+        assert result.loc[~is_a0, "home_sp_fip"].isna().sum() >= 1
+
+    def test_in_feature_matrix(self):
+        games = _make_games()
+        features = build_feature_matrix(
+            games, Config(rolling_window=5), pitcher_index=build_pitcher_index(_stats())
+        )
+        assert set(FEATURE_COLUMNS) <= set(features.columns)
+        assert features["home_sp_runs_allowed"].dtype == np.float32
+        assert features["home_sp_starts"].dtype == np.int16
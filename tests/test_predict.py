@@ -0,0 +1,113 @@
+"""Tests for model prediction and the prediction cache."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from xgboost import XGBClassifier
+
+from charliehustle.config import Config
+from charliehustle.data.cache import artifact_cache, record_key
+from charliehustle.data.features import FEATURE_COLUMNS
+from charliehustle.data.storage import save_parquet
+from charliehustle.models import predict
+from charliehustle.models.predict import cached_predict_games, predict_games
+from charliehustle.models.train import ModelMetadata, load_model, save_model
+
+
+def _features(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    features = pd.DataFrame(
+        rng.normal(size=(n, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS
+    )
+    features.insert(0, "game_id", np.arange(n))
+    features["home_team"] = "NYY"
+    features["away_team"] = "BOS"
+    features["home_win"] = rng.integers(0, 2, n)
+    return features
+
+
+def _save_model(path, seed: int = 0) -> XGBClassifier:
+    features = _features(200, seed)
+    params = {"n_estimators": 5, "max_depth": 2, "random_state": seed}
+    model = XGBClassifier(**params)
+    model.fit(features[FEATURE_COLUMNS].values, features["home_win"].values)
+    metadata = ModelMetadata(
+        feature_columns=FEATURE_COLUMNS,
+        target="home_win",
+        n_samples=len(features),
+        params=params,
+        cv_scores=[],
+        created=datetime.now(),
+    )
+    save_model(model, path, metadata)
+    return model
+
+
+@pytest.fixture
+def paths(tmp_path):
+    model_path = tmp_path / "models" / "xgb_model.ubj"
+    features_path = tmp_path / "2024" / "features.parquet"
+    _save_model(model_path)
+    save_parquet(_features(50), features_path)
+    return model_path, features_path
+
+
+class TestCachedPredictGames:
+    def test_hit_skips_model(self, paths, monkeypatch):
+        model_path, features_path = paths
+        config = Config(data_dir=features_path.parent.parent)
+        first = cached_predict_games(model_path, features_path, config)
+
+        def fail(path):
+            raise AssertionError("model loaded on a cache hit")
+
+        monkeypatch.setattr(predict, "load_model", fail)
+        second = cached_predict_games(model_path, features_path, config)
+        pd.testing.assert_frame_equal(first, second)
+
+        model = load_model(model_path)
+        expected = predict_games(model, pd.read_parquet(features_path))
+        pd.testing.assert_frame_equal(second, expected)
+
+    def test_invalidated_by_changes(self, paths):
+        model_path, features_path = paths
+        config = Config(data_dir=features_path.parent.parent)
+        first = cached_predict_games(model_path, features_path, config)
+
+        save_parquet(_features(50, seed=1), features_path)
+        second = cached_predict_games(model_path, features_path, config)
+        assert not np.array_equal(
+            first["model_home_prob"], second["model_home_prob"]
+        )
+
+        _save_model(model_path, seed=1)
+        third = cached_predict_games(model_path, features_path, config)
+        assert not np.array_equal(
+            second["model_home_prob"], third["model_home_prob"]
+        )
+
+        manifest = artifact_cache(config).entries()
+        assert manifest["stage"].tolist() == ["predictions"] * 3
+
+    def test_model_rewritten_after_record_key(self, paths):
+        model_path, features_path = paths
+        config = Config(data_dir=features_path.parent.parent)
+        record_key(model_path, "trained-by-train-command")
+        first = cached_predict_games(model_path, features_path, config)
+
+        _save_model(model_path, seed=1)
+        second = cached_predict_games(model_path, features_path, config)
+        expected = predict_games(load_model(model_path), _features(50))
+        np.testing.assert_array_equal(
+            second["model_home_prob"], expected["model_home_prob"]
+        )
+        assert not np.array_equal(
+            first["model_home_prob"], second["model_home_prob"]
+        )
+
+    def test_missing_features(self, paths, tmp_path):
+        model_path, _ = paths
+        missing = tmp_path / "2023" / "features.parquet"
+        assert cached_predict_games(model_path, missing) is None
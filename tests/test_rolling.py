@@ -0,0 +1,159 @@
+"""Tests for rolling team stats (long-table and ring-buffer paths)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.data import rolling
+from charliehustle.data.elo import encode_teams
+from charliehustle.data.features import compute_team_rolling_stats
+from charliehustle.data.rolling import rolling_features, run_rolling
+
+
+def _make_games(n: int = 300, seed: int = 0) -> pd.DataFrame:
+    """Random games between a handful of teams."""
+    rng = np.random.default_rng(seed)
+    teams = np.array(["A", "B", "C", "D", "E", "F"])
+    home = rng.integers(0, len(teams), n)
+    away = (home + rng.integers(1, len(teams), n)) % len(teams)
+    home_score = rng.integers(0, 12, n)
+    away_score = rng.integers(0, 12, n)
+    away_score[home_score == away_score] += 1
+    return pd.DataFrame(
+        {
+            "game_id": np.arange(n),
+            "home_team": teams[home],
+            "away_team": teams[away],
+            "home_score": home_score,
+            "away_score": away_score,
+            "home_win": (home_score > away_score).astype(int),
+        }
+    )
+
+
+def _reference_stats(games: pd.DataFrame, window: int) -> pd.DataFrame:
+    """Re-sum each team's last ``window`` games from scratch."""
+    history: dict[str, list[tuple[int, int, int]]] = {}
+    rows = []
+    for home, away, hs, aws, hw in zip(
+        games["home_team"],
+        games["away_team"],
+        games["home_score"],
+        games["away_score"],
+        games["home_win"],
+    ):
+        row = {}
+        for prefix, team in [("home", home), ("away", away)]:
+            recent = history.get(team, [])[-window:]
+            if not recent:
+                row.update(
+                    {
+                        f"{prefix}_win_pct": 0.5,
+                        f"{prefix}_run_diff": 0.0,
+                        f"{prefix}_pyth_win_pct": 0.5,
+                    }
+                )
+                continue
+            rs = sum(g[0] for g in recent)
+            ra = sum(g[1] for g in recent)
+            wins = sum(g[2] for g in recent)
+            row[f"{prefix}_win_pct"] = wins / len(recent)
+            row[f"{prefix}_run_diff"] = (rs - ra) / len(recent)
+            row[f"{prefix}_pyth_win_pct"] = (
+                rs**1.83 / (rs**1.83 + ra**1.83) if rs + ra > 0 else 0.5
+            )
+        rows.append(row)
+        history.setdefault(home, []).append((int(hs), int(aws), int(hw)))
+        history.setdefault(away, []).append((int(aws), int(hs), 1 - int(hw)))
+    return pd.DataFrame(rows)
+
+
+def _ring_buffer_stats(games: pd.DataFrame, windows: list[int]) -> pd.DataFrame:
+    """Run the ring-buffer kernel and lay its output out like the wide table."""
+    home_idx, away_idx, teams = encode_teams(games)
+    sums, played = run_rolling(
+        home_idx,
+        away_idx,
+        games["home_score"].to_numpy(),
+        games["away_score"].to_numpy(),
+        games["home_win"].to_numpy(),
+        n_teams=len(teams),
+        windows=windows,
+    )
+    out = {}
+    for j, w in enumerate(windows):
+        suffix = "" if j == 0 else f"_{w}"
+        for name, values in rolling_features(sums[:, :, j], played, w).items():
+            out[f"home_{name}{suffix}"] = values[:, 0]
+            out[f"away_{name}{suffix}"] = values[:, 1]
+    out["home_games_played"] = played[:, 0]
+    out["away_games_played"] = played[:, 1]
+    return pd.DataFrame(out)
+
+
+@pytest.fixture(params=["compiled", "python"])
+def engine(request, monkeypatch):
+    if request.param == "compiled":
+        if rolling._rolling_loop_compiled is None:
+            pytest.skip("numba not installed")
+    else:
+        monkeypatch.setattr(rolling, "_rolling_loop_compiled", None)
+    return request.param
+
+
+class TestTeamRollingStats:
+    @pytest.mark.parametrize("window", [1, 7, 30])
+    def test_matches_reference_exactly(self, window):
+        games = _make_games()
+        result = compute_team_rolling_stats(games, window=window)
+        expected = _reference_stats(games, window)
+        pd.testing.assert_frame_equal(
+            result[expected.columns], expected, check_exact=True
+        )
+
+    def test_extra_windows_match_single_window_runs(self):
+        games = _make_games()
+        result = compute_team_rolling_stats(
+            games, window=30, extra_windows=(10, 81)
+        )
+        for w in (10, 81):
+            single = compute_team_rolling_stats(games, window=w)
+            for col in ["win_pct", "run_diff", "pyth_win_pct"]:
+                for side in ["home", "away"]:
+                    np.testing.assert_array_equal(
+                        result[f"{side}_{col}_{w}"], single[f"{side}_{col}"]
+                    )
+
+    def test_games_played_counts_all_history(self):
+        games = _make_games()
+        result = compute_team_rolling_stats(games, window=5)
+        counts = pd.concat([games["home_team"], games["away_team"]])
+        assert result["home_games_played"].max() < counts.value_counts().max()
+        assert result["home_games_played"].max() > 5
+
+    def test_preserves_index(self):
+        games = _make_games(20)
+        games.index = games.index + 100
+        result = compute_team_rolling_stats(games, window=5)
+        assert list(result.index) == list(games.index)
+
+
+class TestRingBuffer:
+    @pytest.mark.parametrize("window", [1, 7, 30])
+    def test_matches_reference_exactly(self, engine, window):
+        games = _make_games()
+        result = _ring_buffer_stats(games, [window])
+        expected = _reference_stats(games, window)
+        pd.testing.assert_frame_equal(
+            result[expected.columns], expected, check_exact=True
+        )
+
+    def test_matches_long_table(self, engine):
+        games = _make_games()
+        result = _ring_buffer_stats(games, [30, 10, 81])
+        expected = compute_team_rolling_stats(
+            games, window=30, extra_windows=(10, 81)
+        )
+        pd.testing.assert_frame_equal(
+            result, expected[result.columns], check_exact=True
+        )
@@ -0,0 +1,127 @@
+"""Tests for the compact games and features column types."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.config import Config
+from charliehustle.data.features import FEATURE_COLUMNS, build_feature_matrix
+from charliehustle.data.schema import (
+    TEAMS,
+    compact_features,
+    compact_games,
+    team_dtype,
+)
+from charliehustle.data.team_games import team_game_table
+
+
+def _make_games(n: int = 300, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    names = TEAMS["name"].drop_duplicates().to_numpy()[:8]
+    home = rng.integers(0, len(names), n)
+    away = (home + rng.integers(1, len(names), n)) % len(names)
+    home_score = rng.integers(0, 10, n)
+    away_score = rng.integers(0, 10, n)
+    away_score[home_score == away_score] += 1
+    return pd.DataFrame(
+        {
+            "game_id": np.arange(n),
+            "date": pd.Timestamp("2024-04-01")
+            + pd.to_timedelta(np.arange(n) // 4, unit="D"),
+            "home_team": names[home],
+            "away_team": names[away],
+            "home_score": home_score,
+            "away_score": away_score,
+            "home_win": (home_score > away_score).astype(np.int64),
+        }
+    )
+
+
+class TestTeamDtype:
+    def test_covers_team_table(self):
+        dtype = team_dtype()
+        assert set(TEAMS["name"]) == set(dtype.categories)
+        assert list(dtype.categories) == sorted(dtype.categories)
+
+    def test_adds_unknown_names_in_order(self):
+        dtype = team_dtype(["Zephyrs", "Aardvarks", "Boston Red Sox"])
+        categories = list(dtype.categories)
+        assert categories == sorted(categories)
+        assert {"Zephyrs", "Aardvarks"} <= set(categories)
+        assert len(categories) == TEAMS["name"].nunique() + 2
+
+    def test_fits_in_one_byte(self):
+        assert len(team_dtype().categories) < np.iinfo(np.int8).max
+
+
+class TestCompactGames:
+    def test_dtypes(self):
+        games = compact_games(_make_games())
+        assert isinstance(games["home_team"].dtype, pd.CategoricalDtype)
+        assert games["home_team"].dtype == games["away_team"].dtype
+        assert games["home_score"].dtype == np.int16
+        assert games["home_win"].dtype == np.int8
+
+    def test_values_unchanged(self):
+        games = _make_games()
+        compact = compact_games(games)
+        pd.testing.assert_frame_equal(
+            compact.astype(games.dtypes.to_dict()), games
+        )
+
+    def test_smaller(self):
+        games = _make_games()
+        assert (
+            compact_games(games).memory_usage(deep=True).sum()
+            < games.memory_usage(deep=True).sum() / 2
+        )
+
+    def test_idempotent(self):
+        games = compact_games(_make_games())
+        pd.testing.assert_frame_equal(compact_games(games), games)
+
+
+class TestCompactFeatures:
+    def test_feature_dtypes(self):
+        features = build_feature_matrix(_make_games(), Config())
+        floats = [c for c in FEATURE_COLUMNS if c.endswith(("elo", "pct"))]
+        assert features[floats].dtypes.eq(np.float32).all()
+        assert features["home_rest_days"].dtype == np.int8
+        assert features["home_streak"].dtype == np.int16
+        assert features["home_games_played"].dtype == np.int16
+
+    def test_idempotent(self):
+        features = build_feature_matrix(_make_games(), Config())
+        pd.testing.assert_frame_equal(compact_features(features), features)
+
+    def test_rounds_floats_once(self):
+        values = pd.DataFrame({"home_elo": [1500.123456789]})
+        compact = compact_features(values)
+        assert compact["home_elo"].dtype == np.float32
+        assert compact["home_elo"].iloc[0] == np.float32(1500.123456789)
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_same_features_from_raw_or_compact_games(self, compact):
+        games = _make_games()
+        expected = build_feature_matrix(games, Config())
+        if compact:
+            games = compact_games(games)
+        pd.testing.assert_frame_equal(
+            build_feature_matrix(games, Config()), expected
+        )
+
+
+class TestTeamGameTable:
+    def test_uses_games_team_dtype(self):
+        games = compact_games(_make_games())
+        table = team_game_table(games)
+        assert table["team"].dtype == games["home_team"].dtype
+        assert table["opponent"].dtype == games["home_team"].dtype
+
+    def test_same_order_as_strings(self):
+        games = _make_games()
+        table = team_game_table(compact_games(games))
+        by_name = team_game_table(games)
+        assert list(table["team"].astype(str)) == list(
+            by_name["team"].astype(str)
+        )
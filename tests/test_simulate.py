@@ -0,0 +1,107 @@
+"""Tests for the backtest engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.betting.kelly import fractional_kelly
+from charliehustle.betting.odds import american_to_decimal
+from charliehustle.betting.simulate import backtest, price_bets, round_exact
+from charliehustle.config import Config
+
+
+def _games(**columns) -> pd.DataFrame:
+    n = len(columns["model_home_prob"])
+    base = {
+        "date": pd.date_range("2024-04-01", periods=n),
+        "home_team": ["NYY"] * n,
+        "away_team": ["BOS"] * n,
+    }
+    return pd.DataFrame({**base, **columns})
+
+
+class TestPriceBets:
+    def test_picks_favored_side(self):
+        games = _games(
+            model_home_prob=[0.6, 0.4, 0.5],
+            home_line=[-110, 120, 100],
+            away_line=[100, -140, -120],
+        )
+        priced = price_bets(games)
+        assert priced["is_home_pick"].tolist() == [True, False, True]
+        assert priced["pick_prob"].tolist() == pytest.approx([0.6, 0.6, 0.5])
+        assert priced["decimal_odds"].tolist() == pytest.approx(
+            [american_to_decimal(-110), american_to_decimal(-140), 2.0]
+        )
+
+    def test_matches_scalar_kelly(self):
+        probs = np.linspace(0.05, 0.95, 19)
+        games = _games(
+            model_home_prob=probs,
+            home_line=np.full(19, 105.0),
+            away_line=np.full(19, -125.0),
+        )
+        config = Config()
+        priced = price_bets(games, config)
+        for row in priced.itertuples():
+            assert row.bet_fraction == fractional_kelly(
+                row.pick_prob,
+                row.decimal_odds,
+                fraction=config.kelly_fraction,
+                max_bet=config.max_bet_fraction,
+            )
+            assert row.edge == row.pick_prob - 1 / row.decimal_odds
+
+
+class TestBacktest:
+    def test_compounds_bankroll(self):
+        # Even-money odds with a 60% model: 5% cap on a 20% quarter-Kelly
+        games = _games(
+            model_home_prob=[0.6, 0.6, 0.4],
+            home_line=[100, 100, 100],
+            away_line=[100, 100, 100],
+            home_win=[1, 0, 0],
+        )
+        results = backtest(games, Config(initial_bankroll=1000))
+        assert results["bet_amount"].tolist() == [50.0, 52.5, 49.87]
+        assert results["payout"].tolist() == [50.0, -52.5, 49.87]
+        assert results["bankroll"].tolist() == [1050.0, 997.5, 1047.37]
+        assert results["won"].tolist() == [True, False, True]
+        assert results["pick"].tolist() == ["NYY", "NYY", "BOS"]
+
+    def test_skips_small_edges_and_stakes(self):
+        games = _games(
+            model_home_prob=[0.51, 0.6, 0.6],
+            home_line=[100, 100, 100],
+            away_line=[100, 100, 100],
+            home_win=[1, 1, 1],
+        )
+        results = backtest(games, Config(initial_bankroll=1000))
+        assert results["date"].tolist() == list(games["date"][1:])
+
+        # 5% of $19 rounds below the $1 minimum stake
+        assert backtest(games, Config(initial_bankroll=19)).empty
+
+    def test_no_bets(self, capsys):
+        games = _games(
+            model_home_prob=[0.5],
+            home_line=[-110],
+            away_line=[-110],
+            home_win=[1],
+        )
+        assert backtest(games).empty
+        assert "No bets placed" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("digits", [2, 4])
+def test_round_exact_matches_python(digits):
+    rng = np.random.default_rng(0)
+    values = np.concatenate(
+        [
+            rng.uniform(0, 2000, 5000),
+            np.arange(0, 100, 0.005),  # Decimal ties like 49.875
+            [49.875, 1e12 + 0.125, 3e170, -2.675, 0.0],
+        ]
+    )
+    expected = [round(v, digits) for v in values.tolist()]
+    assert round_exact(values, digits).tolist() == expected
@@ -0,0 +1,171 @@
+"""Tests for schedule fetching with a local fake MLB Stats API client."""
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from charliehustle.config import Config
+from charliehustle.data.sources import GAME_COLUMNS, fetch_season_games
+
+
+def _game(game_id: int, day: date, status: str = "Final") -> dict:
+    return {
+        "game_id": game_id,
+        "game_date": day.isoformat(),
+        "game_type": "R",
+        "status": status,
+        "home_name": "Home",
+        "home_id": 1,
+        "away_name": "Away",
+        "away_id": 2,
+        "home_score": 5,
+        "away_score": 3,
+    }
+
+
+class FakeSchedule:
+    """Serves a fixed list of games, filtered by the requested date range."""
+
+    def __init__(self, games: list[dict]):
+        self.games = games
+        self.calls: list[tuple[date, date]] = []
+
+    def schedule(self, start_date: str, end_date: str, sportId: int) -> list[dict]:
+        start = datetime.strptime(start_date, "%m/%d/%Y").date()
+        end = datetime.strptime(end_date, "%m/%d/%Y").date()
+        self.calls.append((start, end))
+        return [
+            g for g in self.games if start <= date.fromisoformat(g["game_date"]) <= end
+        ]
+
+
+OPENING_DAY = date(2024, 4, 1)
+
+
+def _season(n_days: int) -> list[dict]:
+    return [_game(i, OPENING_DAY + timedelta(days=i)) for i in range(n_days)]
+
+
+class TestFetchSeasonGames:
+    def test_full_fetch_filters_and_caches(self, tmp_path):
+        config = Config(data_dir=tmp_path)
+        raw = _season(5) + [_game(99, OPENING_DAY, status="Postponed")]
+        client = FakeSchedule(raw)
+        games = fetch_season_games(2024, config, client=client, today=date(2025, 1, 1))
+        assert list(games["game_id"]) == [0, 1, 2, 3, 4]
+        assert (tmp_path / "2024" / "games.parquet").exists()
+
+        # Cached: no further API calls
+        again = fetch_season_games(2024, config, client=client)
+        assert len(client.calls) == 1
+        pd.testing.assert_frame_equal(again, games)
+
+    def test_update_fetches_only_missing_dates(self, tmp_path):
+        config = Config(data_dir=tmp_path)
+        client = FakeSchedule(_season(10))
+        today = OPENING_DAY + timedelta(days=5)
+        client.games[5] = _game(5, today, status="In Progress")
+        first = fetch_season_games(2024, config, client=client, today=today)
+        assert len(first) == 5
+
+        client.games[5] = _game(5, today)
+        today += timedelta(days=3)
+        games = fetch_season_games(
+            2024, config, update=True, client=client, today=today
+        )
+        assert list(games["game_id"]) == list(range(9))
+        # Resumes from the day that was still in progress
+        assert client.calls[-1] == (OPENING_DAY + timedelta(days=5), today)
+
+    def test_update_replaces_in_progress_games(self, tmp_path):
+        config = Config(data_dir=tmp_path)
+        today = OPENING_DAY + timedelta(days=2)
+        raw = _season(2) + [_game(2, today, status="In Progress")]
+        client = FakeSchedule(raw)
+        assert len(fetch_season_games(2024, config, client=client, today=today)) == 2
+
+        client.games[-1] = _game(2, today)
+        games = fetch_season_games(
+            2024, config, update=True, client=client, today=today + timedelta(days=1)
+        )
+        assert list(games["game_id"]) == [0, 1, 2]
+        assert games["game_id"].is_unique
+
+    def test_update_after_season_is_a_no_op(self, tmp_path):
+        config = Config(data_dir=tmp_path)
+        client = FakeSchedule(_season(3))
+        fetch_season_games(2024, config, client=client, today=date(2025, 1, 1))
+        fetch_season_games(
+            2024, config, update=True, client=client, today=date(2025, 1, 2)
+        )
+        assert len(client.calls) == 1
+
+    def test_keeps_probable_pitchers(self, tmp_path):
+        config = Config(data_dir=tmp_path)
+        raw = _season(2)
+        raw[0]["home_probable_pitcher"] = "Tarik Skubal"
+        games = fetch_season_games(
+            2024, config, client=FakeSchedule(raw), today=date(2025, 1, 1)
+        )
+        assert list(games["home_probable_pitcher"]) == ["Tarik Skubal", ""]
+        assert list(games["away_probable_pitcher"]) == ["", ""]
+
+    def test_preseason_returns_no_games(self, tmp_path):
+        config = Config(data_dir=tmp_path)
+        client = FakeSchedule(_season(3))
+        games = fetch_season_games(2024, config, client=client, today=date(2024, 2, 1))
+        assert list(games.columns) == GAME_COLUMNS
+        assert len(games) == 0
+        assert client.calls == []
+        assert not (tmp_path / "2024" / "games.parquet").exists()
+
+    def test_unfinished_earlier_games_are_refetched(self, tmp_path):
+        config = Config(data_dir=tmp_path)
+        today = OPENING_DAY + timedelta(days=3)
+        raw = _season(4)
+        raw[1] = _game(1, OPENING_DAY + timedelta(days=1), status="Suspended")
+        client = FakeSchedule(raw)
+        assert len(fetch_season_games(2024, config, client=client, today=today)) == 3
+
+        client.games[1] = _game(1, OPENING_DAY + timedelta(days=1))
+        games = fetch_season_games(
+            2024, config, update=True, client=client, today=today
+        )
+        assert list(games["game_id"]) == [0, 1, 2, 3]
+        assert client.calls[-1] == (OPENING_DAY + timedelta(days=1), today)
+
+    def test_made_up_postponement_is_settled(self, tmp_path):
+        config = Config(data_dir=tmp_path)
+        today = OPENING_DAY + timedelta(days=3)
+        raw = _season(4)
+        raw[1] = _game(1, OPENING_DAY + timedelta(days=1), status="Postponed")
+        raw.append(_game(1, today))
+        client = FakeSchedule(raw)
+        fetch_season_games(2024, config, client=client, today=today)
+        fetch_season_games(
+            2024, config, update=True, client=client, today=today + timedelta(days=1)
+        )
+        assert client.calls[-1] == (today + timedelta(days=1),) * 2
+
+    def test_interrupted_log_write_keeps_old_checkpoint(self, tmp_path, monkeypatch):
+        config = Config(data_dir=tmp_path)
+        client = FakeSchedule(_season(6))
+        today = OPENING_DAY + timedelta(days=2)
+        fetch_season_games(2024, config, client=client, today=today)
+        log_path = tmp_path / "2024" / "games_fetch.json"
+        before = log_path.read_text()
+
+        write_text = Path.write_text
+
+        def interrupted(path, text):
+            write_text(path, text[: len(text) // 2])
+            raise OSError("disk full")
+
+        monkeypatch.setattr(Path, "write_text", interrupted)
+        with pytest.raises(OSError):
+            fetch_season_games(
+                2024, config, update=True, client=client, today=today + timedelta(3)
+            )
+        assert log_path.read_text() == before
@@ -0,0 +1,147 @@
+"""Tests for the as-of team form table."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.config import Config
+from charliehustle.data.features import FEATURE_COLUMNS, build_feature_matrix
+from charliehustle.data.schema import compact_games
+from charliehustle.data.team_form import (
+    FORM_COLUMNS,
+    attach_team_form,
+    team_form_table,
+)
+
+
+def _make_games(n: int = 300, seed: int = 0) -> pd.DataFrame:
+    """Random games between six teams, some days with doubleheaders."""
+    rng = np.random.default_rng(seed)
+    teams = np.array(["A", "B", "C", "D", "E", "F"])
+    home = rng.integers(0, 6, n)
+    away = (home + rng.integers(1, 6, n)) % 6
+    home_score = rng.integers(0, 10, n)
+    away_score = rng.integers(0, 10, n)
+    away_score[home_score == away_score] += 1
+    home_won = home_score > away_score
+    home_sp = pd.Series(teams[home]) + " SP"
+    away_sp = pd.Series(teams[away]) + " SP"
+    reliever = rng.random(n) < 0.3
+    return pd.DataFrame(
+        {
+            "game_id": np.arange(n),
+            "date": pd.Timestamp("2024-04-01")
+            + pd.to_timedelta(np.sort(rng.integers(0, n // 3, n)), unit="D"),
+            "home_team": teams[home],
+            "away_team": teams[away],
+            "home_score": home_score,
+            "away_score": away_score,
+            "home_win": home_won.astype(np.int64),
+            "winning_pitcher": np.where(
+                reliever, "Closer", np.where(home_won, home_sp, away_sp)
+            ),
+            "losing_pitcher": np.where(home_won, away_sp, home_sp),
+            "home_probable_pitcher": home_sp,
+            "away_probable_pitcher": away_sp,
+        }
+    )
+
+
+def _reference(games: pd.DataFrame, window: int) -> pd.DataFrame:
+    """Per game, each team's games on earlier dates, summarized in a loop."""
+    rows = []
+    for g in games.itertuples():
+        row = {}
+        for side, team in [("home", g.home_team), ("away", g.away_team)]:
+            past = games[
+                (games["date"] < g.date)
+                & ((games["home_team"] == team) | (games["away_team"] == team))
+            ]
+            is_home = past["home_team"] == team
+            scored = np.where(is_home, past["home_score"], past["away_score"])
+            allowed = np.where(is_home, past["away_score"], past["home_score"])
+            won = np.where(is_home, past["home_win"], 1 - past["home_win"])
+            decision = np.where(won, past["winning_pitcher"], past["losing_pitcher"])
+            bullpen = decision != f"{team} SP"
+            stats = [
+                scored,
+                allowed,
+                scored[-window:],
+                allowed[-window:],
+                bullpen[-window:],
+            ]
+            for column, values in zip(FORM_COLUMNS, stats):
+                row[f"{side}_{column}"] = values.mean() if len(past) else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows, index=games.index)
+
+
+class TestTeamFormTable:
+    def test_one_row_per_team_date_sorted(self):
+        form = team_form_table(_make_games())
+        assert not form.duplicated(["team", "date"]).any()
+        assert form["date"].is_monotonic_increasing
+        assert form[FORM_COLUMNS].dtypes.eq(np.float32).all()
+
+    def test_unknown_starters_leave_bullpen_missing(self):
+        games = _make_games().drop(
+            columns=["home_probable_pitcher", "away_probable_pitcher"]
+        )
+        form = team_form_table(games)
+        assert form["bullpen_decision_pct"].isna().all()
+        assert form["season_runs_per_game"].notna().all()
+
+
+class TestAttachTeamForm:
+    @pytest.mark.parametrize("window", [1, 5])
+    def test_matches_reference(self, window):
+        games = _make_games()
+        result = attach_team_form(games, team_form_table(games, window))
+        expected = _reference(games, window)
+        pd.testing.assert_frame_equal(
+            result[expected.columns], expected, check_dtype=False, rtol=1e-6
+        )
+
+    def test_no_leakage(self):
+        games = _make_games()
+        cutoff = games["date"].iloc[150]
+        before = attach_team_form(games, team_form_table(games))
+        changed = games.copy()
+        later = changed["date"] >= cutoff
+        changed.loc[later, ["home_score", "away_score"]] = 0
+        after = attach_team_form(changed, team_form_table(changed))
+        through = games["date"] <= cutoff
+        new = [c for c in after.columns if c not in games.columns]
+        pd.testing.assert_frame_equal(after.loc[through, new], before.loc[through, new])
+
+    def test_compact_games(self):
+        games = _make_games()
+        compact = compact_games(games)
+        result = attach_team_form(compact, team_form_table(compact))
+        expected = attach_team_form(games, team_form_table(games))
+        new = [c for c in result.columns if c not in games.columns]
+        pd.testing.assert_frame_equal(result[new], expected[new])
+
+    def test_seasons_start_over(self):
+        first = _make_games()
+        second = _make_games(seed=1)
+        second["date"] += pd.DateOffset(years=1)
+        second["game_id"] += len(first)
+        games = pd.concat([first, second], ignore_index=True)
+        result = attach_team_form(games, team_form_table(games))
+        expected = pd.concat(
+            [attach_team_form(g, team_form_table(g)) for g in (first, second)],
+            ignore_index=True,
+        )
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_in_feature_matrix(self):
+        games = _make_games()
+        features = build_feature_matrix(games, Config(rolling_window=5))
+        assert set(FEATURE_COLUMNS) <= set(features.columns)
+        prebuilt = build_feature_matrix(
+            games,
+            Config(rolling_window=5),
+            team_form=team_form_table(games, Config().form_window),
+        )
+        pd.testing.assert_frame_equal(prebuilt, features)
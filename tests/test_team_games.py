@@ -0,0 +1,53 @@
+"""Tests for the long-format team-game table."""
+
+import pandas as pd
+
+from charliehustle.data.team_games import (
+    attach_team_features,
+    team_game_table,
+    team_rest_days,
+)
+
+
+def _make_games() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "game_id": [10, 11, 12],
+            "date": pd.to_datetime(["2024-04-01", "2024-04-01", "2024-04-03"]),
+            "home_team": ["A", "C", "B"],
+            "away_team": ["B", "D", "A"],
+            "home_score": [5, 2, 4],
+            "away_score": [3, 6, 1],
+            "home_win": [1, 0, 1],
+        }
+    )
+
+
+class TestTeamGameTable:
+    def test_one_row_per_team_per_game(self):
+        table = team_game_table(_make_games())
+        assert len(table) == 6
+        assert table.groupby("game_id").size().eq(2).all()
+
+    def test_sorted_by_team_then_game(self):
+        table = team_game_table(_make_games())
+        assert list(table["team"]) == ["A", "A", "B", "B", "C", "D"]
+        assert list(table["game_id"]) == [10, 12, 10, 12, 11, 11]
+
+    def test_sides_are_mirrored(self):
+        table = team_game_table(_make_games()).set_index(["game_id", "team"])
+        assert table.loc[(10, "A"), "runs_scored"] == 5
+        assert table.loc[(10, "B"), "runs_allowed"] == 5
+        assert table.loc[(10, "A"), "won"] == 1
+        assert table.loc[(10, "B"), "won"] == 0
+        assert not table.loc[(12, "A"), "is_home"]
+
+
+class TestAttachTeamFeatures:
+    def test_round_trips_by_game_id(self):
+        games = _make_games()
+        table = team_game_table(games)
+        result = attach_team_features(games, table, team_rest_days(table).to_frame())
+        assert list(result["home_rest_days"]) == [3, 3, 2]
+        assert list(result["away_rest_days"]) == [3, 3, 2]
+        assert list(result.columns[: len(games.columns)]) == list(games.columns)
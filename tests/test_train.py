@@ -0,0 +1,159 @@
+"""Tests for model training."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.config import Config
+from charliehustle.data.features import FEATURE_COLUMNS
+from charliehustle.data.storage import save_parquet
+from charliehustle.models import train
+from charliehustle.models.train import (
+    build_model,
+    cached_training_arrays,
+    cross_validate,
+    load_metadata,
+    load_model,
+    metadata_path,
+    model_key,
+    train_model,
+    training_arrays,
+)
+
+
+def _training_set(n: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    features = pd.DataFrame(
+        rng.normal(size=(n, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS
+    )
+    signal = features[FEATURE_COLUMNS[0]] + rng.normal(size=n)
+    features["home_win"] = (signal > 0).astype(int)
+    return features
+
+
+def test_parallel_folds_match_sequential():
+    features = _training_set()
+    X = features[FEATURE_COLUMNS].values
+    y = features["home_win"].values
+    sequential = cross_validate(X, y, n_splits=4)
+    assert len(sequential) == 4
+    assert cross_validate(X, y, n_splits=4, jobs=2) == sequential
+
+
+def test_quantile_sketch_runs_once(monkeypatch):
+    sketches = []
+    quantile_matrix = train.quantile_matrix
+
+    def counting(X, y, ref=None, **kwargs):
+        if ref is None:
+            sketches.append(len(X))
+        return quantile_matrix(X, y, ref=ref, **kwargs)
+
+    monkeypatch.setattr(train, "quantile_matrix", counting)
+    features = _training_set()
+    train_model(features, n_splits=4)
+    assert sketches == [len(features)]
+
+
+def test_train_model_saves(tmp_path):
+    path = tmp_path / "models" / "xgb_model.ubj"
+    model = train_model(_training_set(), model_path=path, n_splits=3, jobs=2)
+    assert path.exists()
+    assert model.n_estimators == 200
+
+
+def test_final_model_matches_sklearn_fit():
+    features = _training_set()
+    model = train_model(features, n_splits=2)
+    reference = build_model().fit(
+        features[FEATURE_COLUMNS].values, features["home_win"].values
+    )
+    X = features[FEATURE_COLUMNS].values
+    np.testing.assert_array_equal(
+        model.predict_proba(X), reference.predict_proba(X)
+    )
+
+
+def test_training_arrays_cached(tmp_path, monkeypatch):
+    config = Config(data_dir=tmp_path)
+    features = _training_set()
+    for season, part in [(2022, features[:200]), (2023, features[200:])]:
+        save_parquet(part, tmp_path / str(season) / "features.parquet")
+
+    X, y = cached_training_arrays([2022, 2023], config)
+    assert X.dtype == np.float32 and X.flags["C_CONTIGUOUS"]
+    expected_X, expected_y = training_arrays(features)
+    np.testing.assert_array_equal(X, expected_X)
+    np.testing.assert_array_equal(y, expected_y)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("read features despite a cache hit")
+
+    monkeypatch.setattr(train, "load_feature_arrays", fail)
+    cached_X, cached_y = cached_training_arrays([2022, 2023], config)
+    np.testing.assert_array_equal(cached_X, X)
+    np.testing.assert_array_equal(cached_y, y)
+    model = train_model((cached_X, cached_y), n_splits=2)
+    assert model.n_features_in_ == len(FEATURE_COLUMNS)
+
+
+def test_training_arrays_over_cache_budget(tmp_path):
+    config = Config(data_dir=tmp_path, cache_max_mb=0)
+    features = _training_set()
+    save_parquet(features, tmp_path / "2023" / "features.parquet")
+    X, y = cached_training_arrays([2023], config)
+    np.testing.assert_array_equal(X, training_arrays(features)[0])
+
+
+class TestSavedModel:
+    def test_round_trip(self, tmp_path):
+        features = _training_set()
+        path = tmp_path / "models" / "xgb_model.ubj"
+        model = train_model(
+            features, model_path=path, n_splits=2, seasons=[2022, 2023]
+        )
+
+        loaded = load_model(path)
+        X = features[FEATURE_COLUMNS].values
+        np.testing.assert_array_equal(
+            loaded.predict_proba(X), model.predict_proba(X)
+        )
+        assert loaded.n_estimators == model.n_estimators
+
+        metadata = load_metadata(path)
+        assert metadata.feature_columns == FEATURE_COLUMNS
+        assert metadata.training_seasons == [2022, 2023]
+        assert metadata.n_samples == len(features)
+        assert len(metadata.cv_scores) == 2
+        assert metadata.params["max_depth"] == model.max_depth
+
+    def test_json_format(self, tmp_path):
+        path = tmp_path / "xgb_model.json"
+        train_model(_training_set(), model_path=path, n_splits=2)
+        assert json.loads(path.read_text())["learner"]
+        assert (tmp_path / "xgb_model.meta.json").exists()
+        load_model(path)
+
+    def test_key_depends_on_format(self, tmp_path):
+        paths = [tmp_path / "2023" / "features.parquet"]
+        save_parquet(_training_set(), paths[0])
+        ubj = model_key(paths, tmp_path / "xgb_model.ubj")
+        assert model_key(paths, tmp_path / "other.ubj") == ubj
+        assert model_key(paths, tmp_path / "xgb_model.json") != ubj
+
+    def test_rejects_other_features(self, tmp_path):
+        path = tmp_path / "xgb_model.ubj"
+        train_model(_training_set(), model_path=path, n_splits=2)
+        metadata = load_metadata(path)
+        metadata.feature_columns = FEATURE_COLUMNS[:-1]
+        metadata_path(path).write_text(metadata.model_dump_json())
+        with pytest.raises(ValueError, match="trained on features"):
+            load_model(path)
+
+    def test_requires_metadata(self, tmp_path):
+        path = tmp_path / "xgb_model.pkl"
+        path.write_bytes(b"not a model")
+        with pytest.raises(ValueError, match="No model metadata"):
+            load_model(path)
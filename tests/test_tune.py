@@ -0,0 +1,75 @@
+"""Tests for hyperparameter search."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.data.features import FEATURE_COLUMNS
+from charliehustle.models.train import load_params, save_params, train_model
+from charliehustle.models.tune import SEARCH_SPACE, sample_params, tune
+
+
+def _training_set(n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    features = pd.DataFrame(
+        rng.normal(size=(n, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS
+    )
+    signal = features[FEATURE_COLUMNS[0]] + rng.normal(size=n)
+    features["home_win"] = (signal > 0).astype(int)
+    return features
+
+
+def test_sample_params_within_space():
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        params = sample_params(rng)
+        assert set(params) == set(SEARCH_SPACE)
+        for name, (kind, low, high) in SEARCH_SPACE.items():
+            assert low <= params[name] <= high
+        assert isinstance(params["max_depth"], int)
+
+
+def test_halving_prunes_trials():
+    best, trials = tune(_training_set(), n_trials=4, n_splits=3, eta=2)
+    assert len(trials) == 4
+    # 4 trials -> 2 -> 1 across the three folds
+    assert sorted(trials["folds"]) == [1, 1, 2, 3]
+    assert not trials.loc[0, "pruned"]
+    assert trials["pruned"].sum() == 3
+    assert set(best) == {*SEARCH_SPACE, "n_estimators"}
+    assert best["n_estimators"] == trials.loc[0, "n_estimators"]
+
+
+def test_random_search_scores_every_fold():
+    _, trials = tune(_training_set(), n_trials=3, method="random", n_splits=2)
+    assert (trials["folds"] == 2).all()
+    assert not trials["pruned"].any()
+    assert trials["log_loss"].is_monotonic_increasing
+
+
+def test_parallel_tune_matches_sequential():
+    features = _training_set()
+    best, trials = tune(features, n_trials=4, n_splits=2)
+    parallel_best, parallel_trials = tune(
+        features, n_trials=4, n_splits=2, jobs=2
+    )
+    assert parallel_best == best
+    pd.testing.assert_frame_equal(parallel_trials, trials)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError, match="Unknown method"):
+        tune(_training_set(), method="grid")
+
+
+def test_tuned_params_train(tmp_path):
+    features = _training_set()
+    best, _ = tune(features, n_trials=2, n_splits=2)
+    path = tmp_path / "models" / "best_params.json"
+    save_params(best, path)
+    assert load_params(path) == best
+    assert load_params(tmp_path / "missing.json") is None
+
+    model = train_model(features, n_splits=2, params=load_params(path))
+    assert model.n_estimators == best["n_estimators"]
+    assert model.max_depth == best["max_depth"]
@@ -0,0 +1,107 @@
+"""Tests for the walk-forward backtest."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charliehustle.data.features import FEATURE_COLUMNS
+from charliehustle.models.predict import predict_games
+from charliehustle.models.train import build_model
+from charliehustle.models.walk_forward import (
+    walk_forward_blocks,
+    walk_forward_predict,
+)
+
+
+@pytest.fixture(scope="module")
+def features() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 600
+    features = pd.DataFrame(
+        rng.normal(size=(n, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS
+    )
+    features.insert(0, "game_id", np.arange(n))
+    features.insert(
+        1,
+        "date",
+        pd.Timestamp("2024-04-01") + pd.to_timedelta(np.arange(n) // 6, "D"),
+    )
+    features["home_team"] = "NYY"
+    features["away_team"] = "BOS"
+    signal = features[FEATURE_COLUMNS[0]] - features[FEATURE_COLUMNS[1]]
+    features["home_win"] = (signal + rng.normal(size=n) > 0).astype(int)
+    return features
+
+
+def test_blocks():
+    dates = pd.Series(
+        pd.to_datetime(["2024-04-01", "2024-04-02", "2024-04-20"])
+    )
+    blocks = walk_forward_blocks(dates, pd.Timestamp("2024-04-02"), 7)
+    assert blocks == [
+        (pd.Timestamp("2024-04-02"), pd.Timestamp("2024-04-09")),
+        (pd.Timestamp("2024-04-16"), pd.Timestamp("2024-04-23")),
+    ]
+
+
+class TestWalkForwardPredict:
+    START = pd.Timestamp("2024-05-01")
+
+    def test_out_of_sample(self, features):
+        games = walk_forward_predict(
+            features, self.START, step_days=20, jobs=1
+        )
+        expected_ids = features.loc[features["date"] >= self.START, "game_id"]
+        assert games["game_id"].tolist() == expected_ids.tolist()
+        assert (games["date"] >= games["train_cutoff"]).all()
+        assert (
+            games["date"] < games["train_cutoff"] + pd.Timedelta(days=20)
+        ).all()
+
+        # Each block matches a model fit only on games before its cutoff
+        cutoff = games["train_cutoff"].iloc[-1]
+        model = build_model()
+        history = features[features["date"] < cutoff]
+        model.fit(history[FEATURE_COLUMNS].values, history["home_win"].values)
+        block = predict_games(model, features[features["date"] >= cutoff])
+        np.testing.assert_array_equal(
+            games.loc[games["train_cutoff"] == cutoff, "model_home_prob"],
+            block["model_home_prob"],
+        )
+
+    def test_parallel_matches_sequential(self, features):
+        sequential = walk_forward_predict(features, self.START, step_days=30)
+        parallel = walk_forward_predict(
+            features, self.START, step_days=30, jobs=2
+        )
+        pd.testing.assert_frame_equal(parallel, sequential)
+
+    def test_warm_start(self, features):
+        games = walk_forward_predict(
+            features,
+            self.START,
+            step_days=20,
+            warm_start=True,
+            update_estimators=10,
+        )
+        assert len(games) == (features["date"] >= self.START).sum()
+        assert games["model_home_prob"].between(0, 1).all()
+
+    def test_params(self, features):
+        params = {"n_estimators": 20, "max_depth": 2}
+        games = walk_forward_predict(
+            features, self.START, step_days=80, params=params
+        )
+        cutoff = games["train_cutoff"].iloc[0]
+        history = features[features["date"] < cutoff]
+        model = build_model(**params).fit(
+            history[FEATURE_COLUMNS].values, history["home_win"].values
+        )
+        block = predict_games(model, features[features["date"] >= cutoff])
+        np.testing.assert_array_equal(
+            games["model_home_prob"], block["model_home_prob"]
+        )
+
+    def test_needs_history(self, features):
+        with pytest.raises(ValueError):
+            walk_forward_predict(features, features["date"].min())